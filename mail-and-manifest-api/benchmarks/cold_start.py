@@ -0,0 +1,193 @@
+"""
+Cold-start cost of the Lambda package: import time and first-request latency.
+
+    python benchmarks/cold_start.py --runs 5 --top 15
+
+Each run imports `entrypoint` in a fresh interpreter, then calls `handler`
+with synthetic API Gateway (HTTP API) events: GET /health, which touches no
+AWS service, followed by GET /manifest against moto, which pays for the
+construction of the boto3 clients. Moto is started after the
+import so its own import cost isn't counted. One extra run under
+`-X importtime` lists the slowest modules by cumulative import time.
+
+With --warmup, a scheduled warm-up ping is handled before GET /manifest,
+as the EventBridge schedule does, and timed on its own.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+import local_aws
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def api_gateway_event(path: str, method: str = "GET") -> dict:
+    """
+    Build a minimal API Gateway HTTP API (payload v2.0) event.
+
+    Args:
+        path: Request path
+        method: HTTP method
+
+    Returns:
+        dict: Lambda event
+    """
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "cold-start.local", "accept": "application/json"},
+        "requestContext": {
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "cold-start"
+            },
+            "requestId": "cold-start",
+            "routeKey": "$default",
+            "stage": "$default"
+        },
+        "isBase64Encoded": False
+    }
+
+
+def child(warmup: bool) -> None:
+    # Runs inside the fresh interpreter, prints one JSON line of timings
+    start = time.perf_counter()
+    import entrypoint  # pylint: disable=import-outside-toplevel
+    imported = time.perf_counter()
+
+    health = entrypoint.handler(api_gateway_event("/health"), None)
+    health_done = time.perf_counter()
+
+    mock = local_aws.start()
+    warmup_start = time.perf_counter()
+    if warmup:
+        report = entrypoint.handler({"source": "aws.events", "detail-type": "Scheduled Event"}, None)
+        assert report["status"] == "warm", report
+    manifest_start = time.perf_counter()
+    manifest = entrypoint.handler(api_gateway_event("/manifest"), None)
+    manifest_done = time.perf_counter()
+    mock.stop()
+
+    assert health["statusCode"] == 200, health
+    assert manifest["statusCode"] == 200, manifest
+
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "health_ms": (health_done - imported) * 1000,
+        "warmup_ms": (manifest_start - warmup_start) * 1000,
+        "manifest_ms": (manifest_done - manifest_start) * 1000
+    }))
+
+
+def child_env() -> dict:
+    env = {
+        **os.environ,
+        "AWS_DEFAULT_REGION": local_aws.REGION,
+        "AWS_ACCESS_KEY_ID": "benchmark",
+        "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "DYNAMODB_TABLE_NAME": local_aws.TABLE_NAME,
+        "CATALOG_TABLE_NAME": local_aws.CATALOG_TABLE_NAME,
+        "S3_BUCKET_NAME": local_aws.BUCKET_NAME
+    }
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def run_child(extra_args: list[str], warmup: bool = False) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, os.path.abspath(__file__), "--child", *(["--warmup"] if warmup else [])],
+        cwd=APP_DIR,
+        env=child_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def slowest_imports(importtime_log: str, top: int) -> list[tuple[int, int, str]]:
+    """
+    Parse `-X importtime` output into the slowest modules.
+
+    Args:
+        importtime_log: stderr of an interpreter run with -X importtime
+        top: Number of modules to return
+
+    Returns:
+        list[tuple[int, int, str]]: (cumulative us, self us, module) slowest first
+    """
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+
+        # Children are listed before their parent: keep only the entrypoint
+        # subtree, not what the harness itself imports before or after it
+        if not module[1:].startswith(" "):
+            if module.strip() == "entrypoint":
+                break
+            rows.clear()
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--warmup", action="store_true", help="Handle a warm-up ping before GET /manifest")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.warmup)
+        return
+
+    # Warm the bytecode cache, Lambda ships .pyc files after the first deploy
+    run_child([])
+
+    runs = [json.loads(run_child([], args.warmup).stdout.splitlines()[-1]) for _ in range(args.runs)]
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key in ("import_ms", "health_ms", "warmup_ms", "manifest_ms")
+    }
+
+    print(f"median of {args.runs} fresh interpreters:")
+    print(f"  import entrypoint      {summary['import_ms']:8.1f} ms")
+    print(f"  first GET /health      {summary['health_ms']:8.1f} ms")
+    if args.warmup:
+        print(f"  warm-up ping           {summary['warmup_ms']:8.1f} ms  (moto, clients, connections and caches)")
+        print(f"  first GET /manifest    {summary['manifest_ms']:8.1f} ms  (after the warm-up ping)")
+    else:
+        print(f"  first GET /manifest    {summary['manifest_ms']:8.1f} ms  (moto, includes client construction)")
+
+    slowest = slowest_imports(run_child(["-X", "importtime"]).stderr, args.top)
+    print(f"\nslowest imports (cumulative / self, ms):")
+    for cumulative_us, self_us, module in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {module}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                **summary,
+                "runs": runs,
+                "slowest_imports": [
+                    {"module": module.strip(), "cumulative_ms": cumulative_us / 1000, "self_ms": self_us / 1000}
+                    for cumulative_us, self_us, module in slowest
+                ]
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Response compression of the manifest and image list at catalog scale.
+
+    python benchmarks/compression.py --images 5000
+
+Prints each body's size uncompressed, gzip and brotli (when installed),
+the time to compress it, and the time to serve a repeat request from the
+CachedBody, where the compressed bytes are kept per catalog version.
+No AWS calls are made.
+"""
+import os
+import argparse
+
+import local_aws
+
+os.environ.setdefault("CLOUDFRONT_DOMAIN", "bench.cloudfront.net")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--images", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    from routes.manifests import build_manifest
+    from routes._caching import CachedBody
+    from routes._serializers import image_payload, render_json
+    from shared.compression import ENCODINGS, compress
+    from shared.db.records import ImageRecord
+
+    records = [ImageRecord.from_item(item) for item in local_aws.synthetic_images(0, args.images)]
+    bodies = {
+        "manifest": render_json(build_manifest(records)),
+        "images": render_json({"images": [image_payload(record) for record in records]})
+    }
+
+    kb = 1024
+    print(f"{args.images} images, best of {args.repeat}, encodings: {', '.join(ENCODINGS)}")
+    for name, body in bodies.items():
+        print(f"  {name:<9} {len(body) / kb:9.1f} KB uncompressed")
+        for encoding in ENCODINGS:
+            size = len(compress(body, encoding))
+            per_request_ms = local_aws.timed(lambda: compress(body, encoding), args.repeat)
+            cached = CachedBody(body)
+            cached.encoded(encoding)
+            cached_ms = local_aws.timed(lambda: cached.encoded(encoding), args.repeat)
+            print(f"  {'':<9} {size / kb:9.1f} KB {encoding:<4} x{len(body) / size:5.1f}  "
+                  f"compress {per_request_ms:7.1f} ms -> cached {cached_ms:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Check that slow AWS calls from concurrent requests overlap instead of
+queueing on the event loop.
+
+    python benchmarks/concurrency.py --requests 8 --latency-ms 200
+
+Every DynamoDB and S3 call is delayed by --latency-ms. N concurrent
+GET /image/{id} requests should finish in about one delay, not N, and a
+/health request sent while N uploads are in flight should not wait for
+them. Exits non-zero if either check fails.
+"""
+import sys
+import time
+import asyncio
+import argparse
+
+import local_aws
+
+
+async def run(requests: int, latency_ms: float) -> bool:
+    # pylint: disable=import-outside-toplevel
+    import httpx
+    from entrypoint import server
+    from shared import aws
+    from shared.db.models import ImageItem, TABLE_NAME
+
+    image = ImageItem.create_image("images/bench.jpg", "bench", ["doors"])
+    # Reads go through the low-level client, writes through the table resource
+    local_aws.add_latency(aws.client("dynamodb"), latency_ms, "dynamodb")
+    local_aws.add_latency(aws.table(TABLE_NAME).meta.client, latency_ms, "dynamodb")
+    local_aws.add_latency(aws.client("s3"), latency_ms, "s3")
+
+    transport = httpx.ASGITransport(app=server)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.get(f"/image/{image.uuid}") for _ in range(requests)
+        ])
+        reads_ms = (time.perf_counter() - start) * 1000
+        assert all(r.status_code == 200 for r in responses)
+
+        uploads = [
+            asyncio.create_task(client.post(
+                "/image",
+                files={"file": ("bench.jpg", b"\xff\xd8\xff", "image/jpeg")},
+                data={"description": "bench", "tags": "doors"},
+                headers={"X-API-KEY": "benchmark"}
+            ))
+            for _ in range(requests)
+        ]
+        await asyncio.sleep(latency_ms / 4000)
+        start = time.perf_counter()
+        health = await client.get("/health")
+        health_ms = (time.perf_counter() - start) * 1000
+        await asyncio.gather(*uploads)
+        assert health.status_code == 200
+
+    serial_ms = requests * latency_ms
+    reads_ok = reads_ms < serial_ms / 2
+    health_ok = health_ms < latency_ms / 2
+
+    print(f"{requests} concurrent reads: {reads_ms:.0f} ms (serial would be {serial_ms:.0f} ms) "
+          f"{'OK' if reads_ok else 'FAIL'}")
+    print(f"/health during {requests} uploads: {health_ms:.0f} ms "
+          f"{'OK' if health_ok else 'FAIL'}")
+    return reads_ok and health_ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    mock = local_aws.start()
+    ok = asyncio.run(run(args.requests, args.latency_ms))
+    mock.stop()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Load test every public and admin route against local AWS stand-ins.
+
+    python benchmarks/load.py --sizes 100 1000 --concurrency 1 10 --requests 200 \\
+        --output load-results.json --baseline previous-results.json
+
+For each catalog size the images table is seeded with synthetic records
+and the manifest is published, then every scenario sends --requests
+requests through the ASGI app from --concurrency concurrent clients:
+
+    manifest   GET /manifest
+    images     GET /images
+    image      GET /image/{id} (random seeded image)
+    contact    POST /contact
+    upload     POST /image (small JPEG, so variants are rendered)
+
+Each scenario reports p50/p95/p99 latency, requests per second, error count
+and AWS calls per request (from shared.aws.pool_stats). Uploads run last since
+each one republishes the manifest and invalidates the read caches.
+--latency-ms adds a delay to every DynamoDB, S3 and SQS call. Results are
+written as JSON to --output; --baseline prints the change against an
+earlier results file.
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import itertools
+from datetime import datetime, timezone
+
+import local_aws
+
+SCENARIOS = ["manifest", "images", "image", "contact", "upload"]
+
+CONTACT_FORM = {
+    "full_name": "Load Test",
+    "email": "load@example.com",
+    "phone": "555-0100",
+    "service": "Door Installation",
+    "message": "Benchmark submission"
+}
+
+_contact_counter = itertools.count()
+_upload_counter = itertools.count()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: Value at that percentile (0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def sample_jpeg() -> bytes:
+    # pylint: disable=import-outside-toplevel
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 800), (120, 90, 60)).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def aws_calls() -> dict[str, int]:
+    # pylint: disable=import-outside-toplevel
+    from shared import aws
+
+    return {name: stats["requests"] for name, stats in aws.pool_stats().items()}
+
+
+def build_request(scenario: str, image_ids: list[str], jpeg: bytes) -> dict:
+    """
+    Build the httpx request arguments for one request of a scenario.
+
+    Args:
+        scenario: Scenario name from SCENARIOS
+        image_ids: Seeded image IDs for GET /image/{id}
+        jpeg: Upload body for POST /image
+
+    Returns:
+        dict: Keyword arguments for httpx.AsyncClient.request
+    """
+    if scenario == "manifest":
+        return {"method": "GET", "url": "/manifest"}
+    if scenario == "images":
+        return {"method": "GET", "url": "/images"}
+    if scenario == "image":
+        return {"method": "GET", "url": f"/image/{random.choice(image_ids)}"}
+    if scenario == "contact":
+        # A distinct sender and address per request, so admission control and
+        # de-duplication are exercised without refusing the load test itself
+        n = next(_contact_counter)
+        return {
+            "method": "POST",
+            "url": "/contact",
+            "json": {**CONTACT_FORM, "email": f"load+{n}@example.com"},
+            "headers": {"X-Forwarded-For": f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"}
+        }
+    # Distinct bytes after the JPEG end marker, so every upload is new content
+    # and is stored and resized rather than de-duplicated
+    body = jpeg + f"load-{next(_upload_counter)}".encode()
+    return {
+        "method": "POST",
+        "url": "/image",
+        "files": {"file": ("load.jpg", body, "image/jpeg")},
+        "data": {"description": "load test", "tags": "doors"},
+        "headers": {"X-API-KEY": "benchmark"}
+    }
+
+
+async def run_scenario(client, scenario: str, requests: int, concurrency: int,
+                       image_ids: list[str], jpeg: bytes) -> dict:
+    """
+    Send a scenario's requests from concurrent clients and summarize them.
+
+    Args:
+        client: httpx.AsyncClient bound to the app
+        scenario: Scenario name from SCENARIOS
+        requests: Total requests to send
+        concurrency: Requests in flight at once
+        image_ids: Seeded image IDs for GET /image/{id}
+        jpeg: Upload body for POST /image
+
+    Returns:
+        dict: Latency percentiles, throughput, errors and AWS calls for the scenario
+    """
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.request(**build_request(scenario, image_ids, jpeg))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    # Warm the caches and the executor threads so the first requests aren't outliers
+    for _ in range(min(concurrency, 5)):
+        await client.request(**build_request(scenario, image_ids, jpeg))
+
+    calls_before = aws_calls()
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    calls_after = aws_calls()
+
+    calls = {
+        name: count - calls_before.get(name, 0)
+        for name, count in calls_after.items()
+        if count - calls_before.get(name, 0)
+    }
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "aws_calls_per_request": round(sum(calls.values()) / requests, 3),
+        "aws_calls": calls
+    }
+
+
+def prepare_catalog(size: int, seeded: int) -> list[str]:
+    """
+    Grow the images table to size records and publish the manifest for it.
+
+    Args:
+        size: Catalog size to reach
+        seeded: Records already seeded for a smaller size
+
+    Returns:
+        list[str]: IDs of the seeded images
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    from routes.manifests import publish_manifest
+    from shared.db import models
+
+    local_aws.seed_images(size, start=seeded)
+    models._all_images_cache.invalidate()
+    publish_manifest()
+    return [item["uuid"] for item in local_aws.synthetic_images(0, size, 0)]
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    # pylint: disable=import-outside-toplevel
+    import httpx
+    from entrypoint import server
+    from shared import aws
+    from shared.db.models import TABLE_NAME
+
+    if args.latency_ms:
+        # Reads go through the low-level client, writes through the (shared) table resource client
+        local_aws.add_latency(aws.client("dynamodb"), args.latency_ms, "dynamodb")
+        local_aws.add_latency(aws.table(TABLE_NAME).meta.client, args.latency_ms, "dynamodb")
+        local_aws.add_latency(aws.client("s3"), args.latency_ms, "s3")
+        local_aws.add_latency(aws.client("sqs"), args.latency_ms, "sqs")
+
+    jpeg = sample_jpeg()
+    results = []
+    seeded = 0
+
+    transport = httpx.ASGITransport(app=server)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+        for size in sorted(args.sizes):
+            image_ids = prepare_catalog(size, seeded)
+            seeded = size
+
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    summary = await run_scenario(
+                        client, scenario, args.requests, concurrency, image_ids, jpeg
+                    )
+                    result = {"catalog_size": size, "scenario": scenario, "concurrency": concurrency, **summary}
+                    results.append(result)
+                    print(f"{size:>7} {scenario:<9} c={concurrency:<3} "
+                          f"p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  "
+                          f"p99 {result['p99_ms']:>8.1f} ms  {result['rps']:>8.1f} req/s  "
+                          f"{result['aws_calls_per_request']:>6.2f} AWS calls/req  "
+                          f"{result['errors']} errors")
+
+    return results
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """
+    Print p95 latency and throughput changes against an earlier results file.
+
+    Args:
+        results: Results of this run
+        baseline_path: Path of a results file written by an earlier run
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["catalog_size"], r["scenario"], r["concurrency"]): r
+            for r in json.load(f)["results"]
+        }
+
+    print(f"\nAgainst {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["catalog_size"], result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        p95_change = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0
+        rps_change = (result["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0
+        print(f"{result['catalog_size']:>7} {result['scenario']:<9} c={result['concurrency']:<3} "
+              f"p95 {p95_change:+6.1f}%  req/s {rps_change:+6.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", default="load-results.json")
+    parser.add_argument("--baseline", default=None)
+    args = parser.parse_args()
+
+    # One EMF line per request would drown the results (METRICS_ENABLED=true to include its cost)
+    os.environ.setdefault("METRICS_ENABLED", "false")
+
+    mock = local_aws.start()
+    started = datetime.now(timezone.utc).isoformat()
+    results = asyncio.run(run(args))
+    mock.stop()
+
+    report = {
+        "started": started,
+        "python": platform.python_version(),
+        "config": {
+            "sizes": args.sizes,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "scenarios": args.scenarios,
+            "latency_ms": args.latency_ms
+        },
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+    sys.exit(1 if any(result["errors"] for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
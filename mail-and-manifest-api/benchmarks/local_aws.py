@@ -0,0 +1,162 @@
+"""
+Local stand-ins for DynamoDB, S3, SES and SQS used by the benchmarks.
+
+start() must run before anything under shared/ is imported: those modules
+read the table and bucket names from the environment it sets. The boto3
+clients shared/aws.py creates on first use are then routed to moto.
+"""
+import os
+import sys
+import time
+from typing import Callable
+
+# Make the API modules importable when running `python benchmarks/<script>.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TABLE_NAME = "opgd-images-content"
+CATALOG_TABLE_NAME = "opgd-images-catalog"
+CONTACT_TABLE_NAME = "opgd-contact-submissions"
+BUCKET_NAME = "opgd-images-content-bench"
+SENDER_EMAIL = "noreply@onpointgaragedoors.com"
+CONTACT_QUEUE_NAME = "opgd-contact-outbox-bench"
+REGION = "us-west-1"
+
+
+def start():
+    """
+    Start moto and create the table, catalog table, contact submissions
+    table, bucket, SES identity and contact outbox queue.
+
+    Returns:
+        moto mock handle (call .stop() when done)
+    """
+    os.environ.setdefault("AWS_DEFAULT_REGION", REGION)
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    os.environ["DYNAMODB_TABLE_NAME"] = TABLE_NAME
+    os.environ["CATALOG_TABLE_NAME"] = CATALOG_TABLE_NAME
+    os.environ["CONTACT_TABLE_NAME"] = CONTACT_TABLE_NAME
+    os.environ["S3_BUCKET_NAME"] = BUCKET_NAME
+    os.environ["SES_SENDER_EMAIL"] = SENDER_EMAIL
+    os.environ["ADMIN_API_KEY"] = "benchmark"
+
+    # pylint: disable=import-outside-toplevel
+    import boto3
+    from moto import mock_aws
+
+    mock = mock_aws()
+    mock.start()
+
+    dynamodb = boto3.client("dynamodb")
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "uuid", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "uuid", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    dynamodb.create_table(
+        TableName=CATALOG_TABLE_NAME,
+        KeySchema=[
+            {"AttributeName": "pk", "KeyType": "HASH"},
+            {"AttributeName": "sk", "KeyType": "RANGE"}
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "S"}
+        ],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    dynamodb.create_table(
+        TableName=CONTACT_TABLE_NAME,
+        KeySchema=[{"AttributeName": "submission_key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "submission_key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    boto3.client("s3").create_bucket(
+        Bucket=BUCKET_NAME,
+        CreateBucketConfiguration={"LocationConstraint": REGION}
+    )
+    boto3.client("ses").verify_email_identity(EmailAddress=SENDER_EMAIL)
+
+    # /contact queues to SQS as it does on AWS, rather than the in-process outbox
+    queue = boto3.client("sqs").create_queue(QueueName=CONTACT_QUEUE_NAME)
+    os.environ["CONTACT_QUEUE_URL"] = queue["QueueUrl"]
+    return mock
+
+
+def synthetic_images(start: int, count: int, description_bytes: int = 200) -> list[dict]:
+    """
+    Build synthetic image records spread across the manifest categories.
+
+    Args:
+        start: Index of the first record
+        count: Index to stop before
+        description_bytes: Size of each description, to control scan page counts
+
+    Returns:
+        list[dict]: Image items
+    """
+    categories = ["featured", "doors", "openers", "gates", "custom"]
+    return [
+        {
+            "uuid": f"{i:08d}-0000-4000-8000-000000000000",
+            "s3_path": f"images/{i:08d}.jpg",
+            "description": "x" * description_bytes,
+            "tags": [categories[i % len(categories)], categories[(i // 5) % len(categories)]]
+        }
+        for i in range(start, count)
+    ]
+
+
+def seed_images(count: int, description_bytes: int = 200, start: int = 0) -> None:
+    """
+    Fill the images table with synthetic records.
+
+    Args:
+        count: Total number of images the table should hold
+        description_bytes: Size of each description, to control scan page counts
+        start: Number of images already seeded by an earlier call
+    """
+    # pylint: disable=import-outside-toplevel
+    from shared import aws
+    from shared.db.models import TABLE_NAME
+
+    with aws.table(TABLE_NAME).batch_writer() as batch:
+        for item in synthetic_images(start, count, description_bytes):
+            batch.put_item(Item=item)
+
+
+def add_latency(client, latency_ms: float, service: str = "dynamodb") -> None:
+    """
+    Sleep before every call a client makes, to stand in for the network
+    round-trip moto doesn't have.
+
+    Args:
+        client: boto3 client to slow down
+        latency_ms: Delay per call in milliseconds
+        service: Service name for the event hook
+    """
+    def sleep(**_kwargs):
+        time.sleep(latency_ms / 1000)
+
+    # On send, where the network time goes, so per-call timings include it
+    client.meta.events.register(f"before-send.{service}", sleep)
+
+
+def timed(func: Callable, repeat: int) -> float:
+    """
+    Best-of-N wall time of a call, in milliseconds.
+
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        float: Fastest run in milliseconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
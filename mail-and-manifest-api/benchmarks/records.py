@@ -0,0 +1,146 @@
+"""
+Memory and CPU cost of reading the catalog: resource-layer dicts vs ImageRecord.
+
+    python benchmarks/records.py --images 10000 --repeat 5
+
+The table is seeded with --images records (six variants each), then scanned
+once through the low-level client to capture the raw pages. Both paths are
+timed on the same pages, so moto's own cost isn't counted:
+
+    resource   boto3's TypeDeserializer on every attribute (what Table.scan does)
+    records    ImageRecord.from_attributes on the projected attributes
+
+Memory is what the converted catalog keeps allocated (tracemalloc), i.e.
+what the all-images cache holds per warm worker.
+"""
+import gc
+import time
+import argparse
+import tracemalloc
+from typing import Callable
+
+import local_aws
+
+
+def seed(count: int) -> None:
+    # pylint: disable=import-outside-toplevel
+    from shared import aws
+    from shared.db.models import TABLE_NAME
+
+    with aws.table(TABLE_NAME).batch_writer() as batch:
+        for item in local_aws.synthetic_images(0, count):
+            item["variants"] = [
+                {
+                    "width": width,
+                    "height": width * 2 // 3,
+                    "format": fmt,
+                    "s3_path": f"images/variants/{item['uuid']}/{width}w.{fmt}"
+                }
+                for width in (320, 640, 1024)
+                for fmt in ("webp", "jpeg")
+            ]
+            batch.put_item(Item=item)
+
+
+def raw_pages(projected: bool) -> list[list[dict]]:
+    # pylint: disable=import-outside-toplevel
+    from shared import aws
+    from shared.db.models import TABLE_NAME
+    from shared.db.records import projection
+
+    client = aws.client("dynamodb")
+    scan_kwargs = {"TableName": TABLE_NAME, **(projection() if projected else {})}
+    response = client.scan(**scan_kwargs)
+    pages = [response["Items"]]
+    while "LastEvaluatedKey" in response:
+        response = client.scan(**scan_kwargs, ExclusiveStartKey=response["LastEvaluatedKey"])
+        pages.append(response["Items"])
+    return pages
+
+
+def retained_bytes(build: Callable[[], list]) -> int:
+    """
+    Bytes still allocated by what build returns, once it has returned.
+
+    Args:
+        build: Function building the catalog
+
+    Returns:
+        int: Allocated bytes held by the result
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def cpu_ms(func: Callable, repeat: int) -> float:
+    """
+    Best-of-N CPU time of a call, in milliseconds.
+
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        float: Fastest run in milliseconds of process CPU time
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        func()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--images", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mock = local_aws.start()
+
+    # pylint: disable=import-outside-toplevel
+    from boto3.dynamodb.types import TypeDeserializer
+    from shared.db.records import ImageRecord
+
+    seed(args.images)
+    full_pages = raw_pages(projected=False)
+    projected_pages = raw_pages(projected=True)
+    deserializer = TypeDeserializer()
+
+    def resource_catalog() -> list[dict]:
+        return [
+            {key: deserializer.deserialize(value) for key, value in item.items()}
+            for page in full_pages
+            for item in page
+        ]
+
+    def record_catalog() -> list[ImageRecord]:
+        return [ImageRecord.from_attributes(item) for page in projected_pages for item in page]
+
+    assert [ImageRecord.from_item(item) for item in resource_catalog()] == record_catalog()
+
+    resource_cpu = cpu_ms(resource_catalog, args.repeat)
+    record_cpu = cpu_ms(record_catalog, args.repeat)
+    resource_mem = retained_bytes(resource_catalog)
+    record_mem = retained_bytes(record_catalog)
+
+    mb = 1024 * 1024
+    print(f"{args.images} images, best of {args.repeat}")
+    print(f"  convert CPU      {resource_cpu:8.1f} ms -> {record_cpu:8.1f} ms  x{resource_cpu / record_cpu:.1f}")
+    print(f"  retained memory  {resource_mem / mb:8.1f} MB -> {record_mem / mb:8.1f} MB  "
+          f"x{resource_mem / record_mem:.1f}")
+
+    mock.stop()
+
+
+if __name__ == "__main__":
+    main()
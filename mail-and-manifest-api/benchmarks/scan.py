@@ -0,0 +1,82 @@
+"""
+Sequential vs parallel segmented scan of the images table.
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/scan.py --sizes 1000 10000 100000 --segments 1 4 8 --latency-ms 20
+
+The default backend is the in-memory Scan stand-in (see scan_standin.py),
+which models each call as --latency-ms of network and server time. With
+--backend moto the same scans run against moto; its per-item CPU cost holds
+the GIL, so expect little speedup there and use it to check correctness.
+"""
+import json
+import argparse
+
+import local_aws
+from scan_standin import ScanStandIn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--backend", choices=["standin", "moto"], default="standin")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--description-bytes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    mock = local_aws.start()
+
+    # pylint: disable=import-outside-toplevel
+    from shared import aws
+    from shared.db.models import ImageItem
+
+    # Full-catalog scans go through the low-level client
+    client = aws.client("dynamodb")
+
+    if args.backend == "standin":
+        standin = ScanStandIn(args.latency_ms)
+        standin.attach(client)
+    else:
+        local_aws.add_latency(client, args.latency_ms)
+
+    results = []
+    seeded = 0
+    for size in sorted(args.sizes):
+        if args.backend == "standin":
+            standin.add_items(local_aws.synthetic_images(seeded, size, args.description_bytes))
+        else:
+            local_aws.seed_images(size, args.description_bytes, start=seeded)
+        seeded = size
+
+        baseline = None
+        for segments in args.segments:
+            count = len(ImageItem.scan_all_images(segments=segments))
+            assert count == size, f"expected {size} items, scanned {count}"
+
+            elapsed = local_aws.timed(
+                lambda segments=segments: ImageItem.scan_all_images(segments=segments),
+                args.repeat
+            )
+            baseline = baseline or elapsed
+            results.append({
+                "backend": args.backend,
+                "items": size,
+                "segments": segments,
+                "ms": round(elapsed, 1),
+                "speedup": round(baseline / elapsed, 2)
+            })
+            print(f"{size:>7} items  {segments:>2} segments  {elapsed:9.1f} ms  "
+                  f"x{baseline / elapsed:.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    mock.stop()
+
+
+if __name__ == "__main__":
+    main()
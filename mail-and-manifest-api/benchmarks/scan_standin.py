@@ -0,0 +1,88 @@
+"""
+In-memory stand-in for DynamoDB Scan with a per-call delay.
+
+moto spends most of a scan in Python CPU work, which holds the GIL and hides
+what a parallel scan saves against the real service: overlapping network
+and server time. This stand-in keeps the wire format, 1 MB paging and
+segment partitioning, and sleeps (releasing the GIL) for each call.
+"""
+import json
+import time
+import zlib
+from typing import Optional
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.awsrequest import AWSResponse
+
+PAGE_BYTES = 1024 * 1024
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def stream(self, **_kwargs):
+        yield self._data
+
+
+class ScanStandIn:
+    """botocore before-send handler that answers Scan from memory"""
+
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._items: list[dict] = []
+        self._sizes: list[int] = []
+        self._segments: dict[int, list[list[int]]] = {}
+
+    def add_items(self, items: list[dict]) -> None:
+        serializer = TypeSerializer()
+        for item in items:
+            wire = {k: serializer.serialize(v) for k, v in item.items()}
+            self._items.append(wire)
+            self._sizes.append(len(json.dumps(wire)))
+        self._segments.clear()
+
+    def attach(self, client) -> None:
+        client.meta.events.register_first("before-send.dynamodb", self)
+
+    def _partition(self, total: int) -> list[list[int]]:
+        if total not in self._segments:
+            segments: list[list[int]] = [[] for _ in range(total)]
+            for index, item in enumerate(self._items):
+                segments[zlib.crc32(item["uuid"]["S"].encode()) % total].append(index)
+            self._segments[total] = segments
+        return self._segments[total]
+
+    def __call__(self, request, **_kwargs) -> Optional[AWSResponse]:
+        if not request.headers.get("X-Amz-Target", b"").endswith(b".Scan"):
+            return None
+
+        self.calls += 1
+        params = json.loads(request.body)
+        indexes = self._partition(params.get("TotalSegments", 1))[params.get("Segment", 0)]
+
+        position = 0
+        if "ExclusiveStartKey" in params:
+            position = int(params["ExclusiveStartKey"]["uuid"]["S"].split("#")[1]) + 1
+
+        page, page_bytes = [], 0
+        while position < len(indexes) and page_bytes < PAGE_BYTES:
+            if params.get("Limit") and len(page) >= params["Limit"]:
+                break
+            page.append(self._items[indexes[position]])
+            page_bytes += self._sizes[indexes[position]]
+            position += 1
+
+        body = {"Items": page, "Count": len(page), "ScannedCount": len(page)}
+        if position < len(indexes):
+            # Encode our position in the key; clients treat it as opaque
+            body["LastEvaluatedKey"] = {"uuid": {"S": f"{page[-1]['uuid']['S']}#{position - 1}"}}
+
+        time.sleep(self.latency_ms / 1000)
+        return AWSResponse(
+            request.url,
+            200,
+            {"Content-Type": "application/x-amz-json-1.0"},
+            _Body(json.dumps(body).encode())
+        )
@@ -0,0 +1,99 @@
+"""
+Manifest and image list serialization at catalog scale.
+
+    python benchmarks/serialization.py --images 5000
+
+Compares the pydantic path (an Image model per record, Manifest.model_dump_json,
+json.dumps for /images) with the plain-dict path the API uses (image_payload
++ render_json, orjson when installed). No AWS calls are made.
+"""
+import os
+import json
+import argparse
+from decimal import Decimal
+
+import local_aws
+
+os.environ.setdefault("CLOUDFRONT_DOMAIN", "bench.cloudfront.net")
+
+
+def dynamodb_records(count: int) -> list[dict]:
+    """
+    Synthetic image records as the DynamoDB resource returns them
+    (variant sizes as Decimal).
+
+    Args:
+        count: Number of records
+
+    Returns:
+        list[dict]: Image items
+    """
+    records = local_aws.synthetic_images(0, count)
+    for record in records:
+        record["variants"] = [
+            {
+                "width": Decimal(width),
+                "height": Decimal(width * 2 // 3),
+                "format": fmt,
+                "s3_path": f"images/variants/{record['uuid']}/{width}w.{fmt}"
+            }
+            for width in (320, 640, 1024)
+            for fmt in ("webp", "jpg")
+        ]
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--images", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    from routes.manifests import build_manifest
+    from routes.models import Image, Manifest
+    from routes._serializers import _json_default, image_payload, orjson, render_json
+    from shared.db.records import ImageRecord
+    from shared.s3.models import S3Storage
+
+    items = dynamodb_records(args.images)
+    records = [ImageRecord.from_item(item) for item in items]
+
+    def pydantic_manifest() -> bytes:
+        images = [(Image(**S3Storage.add_public_urls(item)), item["tags"]) for item in items]
+        return Manifest({
+            "featured": [image for image, tags in images if "featured" in tags],
+            "doorInstall": [image for image, tags in images if "door" in tags or "doors" in tags],
+            "openers": [image for image, tags in images if "opener" in tags or "openers" in tags],
+            "gates": [image for image, tags in images if "gate" in tags or "gates" in tags],
+            "customWork": [image for image, tags in images if "custom" in tags]
+        }).model_dump_json().encode()
+
+    def stdlib_images() -> bytes:
+        return json.dumps(
+            {"images": [S3Storage.add_public_urls(item) for item in items]},
+            default=_json_default,
+            separators=(",", ":")
+        ).encode()
+
+    def plain_manifest() -> bytes:
+        return render_json(build_manifest(records))
+
+    def plain_images() -> bytes:
+        return render_json({"images": [image_payload(item) for item in records]})
+
+    assert json.loads(pydantic_manifest()) == json.loads(plain_manifest())
+    assert json.loads(stdlib_images()) == json.loads(plain_images())
+
+    print(f"{args.images} images, best of {args.repeat}, encoder: {'orjson' if orjson else 'json'}")
+    for name, before, after in (
+        ("manifest", pydantic_manifest, plain_manifest),
+        ("images", stdlib_images, plain_images)
+    ):
+        before_ms = local_aws.timed(before, args.repeat)
+        after_ms = local_aws.timed(after, args.repeat)
+        print(f"  {name:<9} {before_ms:8.1f} ms -> {after_ms:7.1f} ms  x{before_ms / after_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
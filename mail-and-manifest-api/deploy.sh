@@ -4,8 +4,9 @@ set -e
 echo "🚀 Deploying OPGD Mail & Manifest API to Lambda"
 echo ""
 
-# Check if function name is provided
+# Check if function names are provided
 FUNCTION_NAME="${1:-opgd-mail-manifest-api-prod}"
+WORKER_FUNCTION_NAME="${2:-opgd-contact-outbox-prod}"
 
 echo "📦 Creating deployment package..."
 
@@ -13,9 +14,13 @@ echo "📦 Creating deployment package..."
 rm -rf package deployment.zip
 mkdir -p package
 
-# Install dependencies
+# Install dependencies (Lambda wheels for the compiled ones: Pillow, orjson)
 echo "📥 Installing dependencies..."
-pip install -r requirements.txt -t package/ --quiet
+pip install -r requirements.txt -t package/ --quiet \
+  --platform manylinux2014_x86_64 \
+  --implementation cp \
+  --python-version 3.11 \
+  --only-binary=:all:
 
 # Copy application code
 echo "📋 Copying application code..."
@@ -34,8 +39,24 @@ echo "✅ Package created: deployment.zip ($SIZE)"
 # Deploy to Lambda
 echo ""
 echo "☁️  Uploading to Lambda function: $FUNCTION_NAME"
-aws lambda update-function-code \
+VERSION=$(aws lambda update-function-code \
+  --function-name "$FUNCTION_NAME" \
+  --zip-file fileb://deployment.zip \
+  --publish \
+  --output json | jq -r '.Version')
+echo "✅ Deployed version: $VERSION"
+
+# API Gateway and the warm-up schedule invoke the live alias
+aws lambda update-alias \
   --function-name "$FUNCTION_NAME" \
+  --name live \
+  --function-version "$VERSION" \
+  --output json | jq -r '"✅ Alias live -> version " + .FunctionVersion'
+
+# The contact outbox worker runs from the same package
+echo "☁️  Uploading to Lambda function: $WORKER_FUNCTION_NAME"
+aws lambda update-function-code \
+  --function-name "$WORKER_FUNCTION_NAME" \
   --zip-file fileb://deployment.zip \
   --output json | jq -r '"✅ Deployed version: " + .Version + " (updated: " + .LastModified + ")"'
 
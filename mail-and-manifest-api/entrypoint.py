@@ -1,11 +1,18 @@
+import os
 import logging
 
-from fastapi import FastAPI, Response
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from mangum import Mangum
-import uvicorn
 
 import routes 
+from security.api_key import verify_api_key
+from shared import aws
+from shared.outbox import process_sqs_event
+from shared.compression import CompressionMiddleware
+from shared.telemetry import ServerTimingMiddleware
+from shared.warmup import is_warmup_event, warm_up
 
 #
 # Configure logging
@@ -37,37 +44,84 @@ server.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Compresses every response not already compressed by its route
+server.add_middleware(CompressionMiddleware)
+
+# Added last so it is outermost: times the whole request, including CORS
+server.add_middleware(ServerTimingMiddleware)
+
 #
 # Create Mangum app wrapper (for lambda)
 #
-handler = Mangum(
+api_handler = Mangum(
     app=server,
     api_gateway_base_path='/',
     lifespan="off"
     )
 
+def handler(event: dict, context: object) -> dict:
+    """
+    API lambda entry point. Scheduled warm-up pings prime this worker's AWS
+    connections and catalog caches and return without going through FastAPI;
+    everything else is an API Gateway request for Mangum.
+
+    Returns:
+        dict: API Gateway response, or the warm-up report
+    """
+    if is_warmup_event(event):
+        return warm_up(routes.warm_caches)
+    return api_handler(event, context)
+
+#
+# Contact outbox worker (lambda, triggered by the contact SQS queue)
+#
+def outbox_worker(event: dict, context: object) -> dict:
+    """
+    Deliver queued contact submissions.
+
+    Returns:
+        dict: Batch item failures for SQS to redeliver
+    """
+    return process_sqs_event(event)
+
 #
 # Register Routes
 #
 logger.info('Registering routes...')
 server.include_router(routes.router)
 
-logger.info(server.routes)
+logger.info(f"Registered {len(routes.router.routes)} routes")
+
+# Provisioned instances initialize before any traffic, so warm them up right away
+if os.getenv("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+    warm_up(routes.warm_caches)
 
 @server.get("/health")
-def health() -> Response:
+def health() -> JSONResponse:
     """
     Health check endpoint.
 
     Returns:
         dict: Simple message confirming API is operational
     """
-    return Response({"status": "OK"}) 
+    return JSONResponse({"status": "OK"})
+
+@server.get("/health/aws", dependencies=[Depends(verify_api_key)])
+def health_aws() -> JSONResponse:
+    """
+    AWS client usage for this worker (requires admin authentication).
+
+    Returns:
+        dict: Request counts and connection pool usage per client
+    """
+    return JSONResponse({"status": "OK", "clients": aws.pool_stats()})
 
 #
 # Test Server Starting
 #
 if __name__ == "__main__":
+    import uvicorn
+
     logger.info('Starting uvicorn server on http://0.0.0.0:8000')
     uvicorn.run(
         server,
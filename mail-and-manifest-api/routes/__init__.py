@@ -5,4 +5,11 @@ import routes.contact
 import routes.content
 import routes.manifests
 
-__all__ = ["router"]
\ No newline at end of file
+
+def warm_caches() -> None:
+    """Load the catalog and manifest into this worker's caches, with their rendered bodies."""
+    routes.manifests.warm_manifest()
+    routes.content.warm_images()
+
+
+__all__ = ["router", "warm_caches"]
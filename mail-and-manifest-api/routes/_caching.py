@@ -0,0 +1,146 @@
+import os
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response, status
+
+from shared.compression import COMPRESSION_MIN_BYTES, ENCODINGS, compress, negotiate_encoding
+
+# Cache-Control sent with catalog responses (/manifest, /images, /image/{id})
+CATALOG_CACHE_CONTROL = os.getenv(
+    "CATALOG_CACHE_CONTROL",
+    "public, max-age=60, must-revalidate"
+)
+
+
+class CachedBody:
+    """
+    Rendered JSON body, its strong ETag and its compressed encodings.
+    Each encoding is compressed on first use and kept, so a cached body is
+    compressed once per catalog version rather than once per request.
+    """
+
+    __slots__ = ("body", "etag", "_encoded")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or make_etag(body)
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.body, encoding)
+        return body
+
+    def precompress(self) -> None:
+        # Compress every encoding now, before a request asks for one (see warm_caches)
+        if len(self.body) >= COMPRESSION_MIN_BYTES:
+            for encoding in ENCODINGS:
+                self.encoded(encoding)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Each encoding is its own representation and needs its own strong ETag
+        return f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+
+
+class SourceMemo:
+    """
+    Remembers a value derived from the most recent source object.
+    Sources come from the in-process caches, so the same object is handed
+    out until the next refresh and identity is enough to detect a change.
+    """
+
+    def __init__(self, derive: Callable[[Any], Any]):
+        self._derive = derive
+        self._source: Any = None
+        self._derived: Any = None
+
+    def get(self, source: Any) -> Any:
+        derived = self._derived
+        if derived is not None and self._source is source:
+            return derived
+
+        derived = self._derive(source)
+        self._source, self._derived = source, derived
+        return derived
+
+
+class RenderCache(SourceMemo):
+    """Remembers the rendered body (and its ETag) for the most recent source object"""
+
+    def __init__(self, render: Callable[[Any], bytes]):
+        super().__init__(lambda source: CachedBody(render(source)))
+
+    def get(self, source: Any) -> CachedBody:
+        return super().get(source)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from the body content.
+
+    Args:
+        body: Response body
+
+    Returns:
+        str: Quoted ETag value
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, RFC 9110).
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current quoted ETag
+
+    Returns:
+        bool: True if the client already holds the current representation
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(request: Request, cached: CachedBody) -> Response:
+    """
+    Return the body, or 304 Not Modified if the client's copy is current.
+    The body is sent brotli or gzip compressed when the client accepts it
+    and it is at least COMPRESSION_MIN_BYTES.
+
+    Args:
+        request: Incoming request
+        cached: Rendered body and ETag
+
+    Returns:
+        Response: 200 with the JSON body or an empty 304
+    """
+    encoding = None
+    if len(cached.body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+    etag = cached.etag_for(encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding is None:
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    headers["Content-Encoding"] = encoding
+    return Response(content=cached.encoded(encoding), media_type="application/json", headers=headers)
@@ -0,0 +1,71 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+from shared import telemetry
+from shared.db.records import ImageRecord
+from shared.s3.models import S3Storage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    # DynamoDB numbers come back as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def render_json(payload: Any) -> bytes:
+    """
+    Serialize a response payload to compact JSON bytes.
+    Uses orjson when it is installed, the standard library otherwise.
+
+    Args:
+        payload: Plain data, DynamoDB items or pydantic models
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    with telemetry.span("serialize"):
+        if orjson is not None:
+            return orjson.dumps(payload, default=_json_default)
+        return json.dumps(
+            payload, default=_json_default, separators=(",", ":"), ensure_ascii=False
+        ).encode()
+
+
+def image_payload(record: ImageRecord) -> dict:
+    """
+    Convert an image record to its public JSON shape (the Image model) in one pass.
+    Records are written by this API, so they are trusted and not re-validated:
+    only the public URLs are added.
+
+    Args:
+        record: Image record from DynamoDB
+
+    Returns:
+        dict: Plain image data with public URLs, field for field like Image
+    """
+    return {
+        "uuid": record.uuid,
+        "tags": record.tags,
+        "s3_path": record.s3_path,
+        "description": record.description,
+        "url": S3Storage.get_public_url(record.s3_path),
+        "variants": [
+            {
+                "width": variant["width"],
+                "height": variant["height"],
+                "format": variant["format"],
+                "s3_path": variant["s3_path"],
+                "url": S3Storage.get_public_url(variant["s3_path"])
+            }
+            for variant in record.variants
+        ]
+    }
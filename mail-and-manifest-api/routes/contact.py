@@ -1,36 +1,144 @@
+import os
+import math
 import logging
+from typing import Optional
 
-from fastapi import HTTPException, status
+from fastapi import Header, HTTPException, Request, status
 
 from ._router import router
-from shared.ses import send_contact_email
+from shared.admission import TokenBucketLimiter, admit
+from shared.db.submissions import ContactSubmission, submission_key
+from shared.outbox import ContactOutbox
+from shared.ses import send_contact_email_async
 from routes.models import ContactRequest
 
 logger = logging.getLogger(__name__)
 
-@router.post("/contact", status_code=status.HTTP_201_CREATED)
-async def contact(request: ContactRequest) -> dict:
+# Contact submissions one client IP can send in a burst, and seconds to earn another
+CONTACT_IP_BURST = int(os.getenv("CONTACT_IP_BURST", "10"))
+CONTACT_IP_REFILL_SECONDS = float(os.getenv("CONTACT_IP_REFILL_SECONDS", "30"))
+
+# The same per sender email address
+CONTACT_EMAIL_BURST = int(os.getenv("CONTACT_EMAIL_BURST", "5"))
+CONTACT_EMAIL_REFILL_SECONDS = float(os.getenv("CONTACT_EMAIL_REFILL_SECONDS", "120"))
+
+# Proxies in front of the API that add to X-Forwarded-For (1 = CloudFront)
+CLIENT_IP_PROXY_HOPS = int(os.getenv("CLIENT_IP_PROXY_HOPS", "1"))
+
+# Buckets live in each warm worker, so they shed floods before any AWS call is made
+_ip_limiter = TokenBucketLimiter(CONTACT_IP_BURST, CONTACT_IP_REFILL_SECONDS)
+_email_limiter = TokenBucketLimiter(CONTACT_EMAIL_BURST, CONTACT_EMAIL_REFILL_SECONDS)
+
+
+def client_ip(request: Request) -> str:
     """
-    Contact endpoint — sends a notification email to On Point Garage Doors.
+    Find the caller's address behind CLIENT_IP_PROXY_HOPS proxies.
+    Entries a client writes into X-Forwarded-For itself end up left of the
+    ones our proxies add, so they are never picked.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        str: Client IP address ("unknown" if there is none)
     """
+    chain = [
+        address.strip()
+        for address in request.headers.get("x-forwarded-for", "").split(",")
+        if address.strip()
+    ]
+    peer = request.client.host if request.client else None
+    if peer and (not chain or chain[-1] != peer):
+        chain.append(peer)
+    if not chain:
+        return "unknown"
+    return chain[max(0, len(chain) - 1 - CLIENT_IP_PROXY_HOPS)]
+
+
+def _accepted(message_id: Optional[str], duplicate: bool = False) -> dict:
+    body = {
+        "status": "success",
+        "message": "Contact form submitted successfully",
+        "message_id": message_id,
+    }
+    if duplicate:
+        body["duplicate"] = True
+    return body
+
+
+async def _queue_or_send(request: ContactRequest) -> str:
+    # Queue for the outbox worker; if the outbox is unavailable, don't lose the lead
     try:
-        response = send_contact_email(
-            full_name=request.full_name,
-            email=request.email,
-            phone=request.phone,
-            service=request.service,
-            message=request.message,
+        return await ContactOutbox.enqueue_async(request.model_dump())
+    except Exception:
+        logger.exception("Error queueing contact form, sending it directly")
+
+    response = await send_contact_email_async(
+        full_name=request.full_name,
+        email=request.email,
+        phone=request.phone,
+        service=request.service,
+        message=request.message,
+    )
+    return response["MessageId"]
+
+
+@router.post("/contact", status_code=status.HTTP_202_ACCEPTED)
+async def contact(
+    request: ContactRequest,
+    http_request: Request,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+) -> dict:
+    """
+    Contact endpoint — queues a notification email to On Point Garage Doors.
+    The email is sent by the outbox worker, so SES latency and throttling
+    never reach the visitor.
+
+    Submissions over the per-IP or per-email rate get 429 with Retry-After.
+    A repeat of a submission (same Idempotency-Key, or the same form content
+    without one) inside CONTACT_DEDUPE_WINDOW_SECONDS gets the original
+    message_id back and is not sent again.
+    """
+    retry_after = admit([
+        (_ip_limiter, client_ip(http_request)),
+        (_email_limiter, request.email.strip().lower()),
+    ])
+    if retry_after:
+        logger.warning("Contact submission over the rate limit")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many contact submissions, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
         )
 
-        return {
-            "status": "success",
-            "message": "Contact form submitted successfully",
-            "message_id": response["MessageId"],
-        }
+    key: Optional[str] = submission_key(request.model_dump(), idempotency_key)
+    try:
+        existing = await ContactSubmission.claim_async(key)
+        if existing is not None:
+            return _accepted(existing.get("message_id"), duplicate=True)
+    except Exception:
+        # A duplicate may get through, but the lead isn't lost
+        logger.exception("Error claiming contact submission, continuing without de-duplication")
+        key = None
 
-    except Exception as e:
+    try:
+        message_id = await _queue_or_send(request)
+    except Exception:
         logger.exception("Error processing contact form")
+        if key:
+            try:
+                await ContactSubmission.release_async(key)
+            except Exception:
+                logger.exception("Error releasing contact submission")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process contact form",
         )
+
+    if key:
+        try:
+            await ContactSubmission.record_message_async(key, message_id)
+        except Exception:
+            logger.exception("Error recording contact submission")
+
+    return _accepted(message_id)
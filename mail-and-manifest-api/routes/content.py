@@ -1,39 +1,168 @@
+import os
+import json
+import base64
+import asyncio
 import logging
-from typing import Optional
+import tempfile
+from typing import Iterator, Optional
+from uuid import uuid4
 
-from fastapi import HTTPException, UploadFile, File, Form, Depends, status
+from fastapi import (
+    HTTPException, UploadFile, File, Form, Depends, Query, Request, Response, status
+)
+from fastapi.responses import StreamingResponse
 
 from ._router import router
-from .models import Images, Image
-from shared.db.models import ImageItem
-from shared.s3.models import S3Storage
+from ._caching import CachedBody, RenderCache, conditional_response
+from ._serializers import image_payload, render_json
+from .models import UploadUrlRequest, FinalizeUploadRequest, DeleteImagesRequest
+from .manifests import publish_manifest_safely
+from shared.db.models import MAX_IMAGE_TAGS, AsyncImageItem, ImageExistsError, ImageItem, ImageNotFoundError
+from shared.db.records import ImageRecord
+from shared.executor import run_blocking
+from shared.s3.models import AsyncS3Storage, S3Storage, MAX_UPLOAD_BYTES
+from shared.storage import delete_released_files, discard_stored_image, store_image
 from security.api_key import verify_api_key
 
 logger = logging.getLogger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Most files accepted by one POST /images/batch request
+BATCH_UPLOAD_MAX_FILES = int(os.getenv("BATCH_UPLOAD_MAX_FILES", "50"))
+
+# Files of a batch that are uploaded and resized at the same time
+BATCH_UPLOAD_CONCURRENCY = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "8"))
+
+# Most image IDs accepted by one POST /images/delete request
+BULK_DELETE_MAX_IDS = int(os.getenv("BULK_DELETE_MAX_IDS", "1000"))
+
+# Content types accepted for direct uploads (served as is from the bucket, so no SVG)
+DIRECT_UPLOAD_CONTENT_TYPES = ("image/jpeg", "image/png", "image/webp", "image/gif", "image/avif")
+
+# Staged uploads larger than this are spooled to a temp file (/tmp on Lambda)
+# while they are hashed and resized, rather than held in memory
+FINALIZE_SPOOL_BYTES = 1024 * 1024
+
+# Attributes needed to find an image's files in S3
+FILE_FIELDS = ("uuid", "s3_path", "variants")
+
+
+def _with_urls(records: list[ImageRecord]) -> list[dict]:
+    # Public shape of each image, with URLs for it and its variants
+    return [image_payload(record) for record in records]
+
+
+def _render_images(records: list[ImageRecord]) -> bytes:
+    return render_json({
+        "images": _with_urls(records)
+    })
+
+
+def _encode_cursor(last_key: Optional[dict]) -> Optional[str]:
+    if not last_key:
+        return None
+    return base64.urlsafe_b64encode(render_json(last_key)).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        last_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        last_key = None
+
+    if not isinstance(last_key, dict) or not isinstance(last_key.get("uuid"), str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return {"uuid": last_key["uuid"]}
+
+
+def _stream_images(pages: Iterator[list[ImageRecord]]) -> Iterator[bytes]:
+    try:
+        for page in pages:
+            yield b"".join(render_json(image) + b"\n" for image in _with_urls(page))
+    except Exception as e:
+        # Headers are already sent, so the client sees a truncated stream
+        logger.error(f"Error streaming images: {str(e)}")
+
+
+# Rendered once per refresh of the cached image list
+_images_body = RenderCache(_render_images)
+
+
+def warm_images() -> None:
+    """
+    Load the full image list into this worker's cache and render (and
+    compress) its /images body, ahead of the first request.
+    """
+    _images_body.get(ImageItem.get_all_images()).precompress()
+
+
 @router.get("/images")
-async def get_images() -> dict:
+async def get_images(
+    request: Request,
+    tag: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None
+) -> Response:
     """
     Get all images endpoint with public URLs.
+    Responds 304 Not Modified when If-None-Match carries the current ETag.
+    With `Accept: application/x-ndjson` the images are streamed one per line
+    as the table scan proceeds; the stream has no pages, so limit and cursor
+    are rejected there.
+
+    Args:
+        tag: Only return images with this tag (optional, served from the tag index)
+        limit: Page size (optional, enables cursor pagination)
+        cursor: next_cursor from the previous page (optional)
 
     Returns:
-        dict: List of all images with their public S3 URLs
+        dict: List of all images with their public S3 URLs, plus next_cursor when paginating
     """
+    if tag is not None and (limit is not None or cursor is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="tag cannot be combined with limit or cursor"
+        )
+
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    if ndjson and (limit is not None or cursor is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit and cursor are not supported with application/x-ndjson"
+        )
+
     try:
-        items = ImageItem.get_all_images()
+        if ndjson:
+            if tag is not None:
+                pages = iter([await AsyncImageItem.get_images_by_tag(tag.strip().lower())])
+            else:
+                pages = ImageItem.iter_image_pages()
+            return StreamingResponse(_stream_images(pages), media_type=NDJSON_MEDIA_TYPE)
+
+        if tag is not None:
+            items = await AsyncImageItem.get_images_by_tag(tag.strip().lower())
+            return conditional_response(request, CachedBody(_render_images(items)))
+
+        if limit is not None or cursor is not None:
+            items, last_key = await AsyncImageItem.get_images_page(
+                limit=limit or 100,
+                start_key=_decode_cursor(cursor) if cursor else None
+            )
+            body = render_json({
+                "images": _with_urls(items),
+                "next_cursor": _encode_cursor(last_key)
+            })
+            return conditional_response(request, CachedBody(body))
 
-        # Add public URLs to each image
-        images_with_urls = []
-        for item in items:
-            image_data = {
-                **item,
-                "url": S3Storage.get_public_url(item["s3_path"])
-            }
-            images_with_urls.append(image_data)
+        items = await AsyncImageItem.get_all_images()
 
-        return {
-            "images": images_with_urls
-        }
+        return conditional_response(request, _images_body.get(items))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching images: {str(e)}")
         raise HTTPException(
@@ -42,9 +171,10 @@ async def get_images() -> dict:
         )
 
 @router.get("/image/{image_id}")
-async def get_image(image_id: str) -> dict:
+async def get_image(image_id: str, request: Request) -> Response:
     """
     Get a single image by ID.
+    Responds 304 Not Modified when If-None-Match carries the current ETag.
 
     Args:
         image_id: UUID of image to retrieve
@@ -53,7 +183,7 @@ async def get_image(image_id: str) -> dict:
         dict: Image record with presigned URL
     """
     try:
-        image_record = ImageItem.get_image(image_id)
+        image_record = await AsyncImageItem.get_image(image_id)
         if not image_record:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -61,13 +191,15 @@ async def get_image(image_id: str) -> dict:
             )
 
         # Generate public S3 URL
-        url = S3Storage.get_public_url(image_record["s3_path"])
+        url = S3Storage.get_public_url(image_record.s3_path)
 
-        return {
+        body = render_json({
             "status": "success",
-            "image": Image(**image_record),
+            "image": image_payload(image_record),
             "url": url
-        }
+        })
+
+        return conditional_response(request, CachedBody(body))
 
     except HTTPException:
         raise
@@ -112,22 +244,37 @@ async def upload_image(
                 detail="At least one tag is required"
             )
 
-        # Read file content
-        contents = await file.read()
+        if len(tag_list) > MAX_IMAGE_TAGS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_IMAGE_TAGS} tags per image"
+            )
 
-        # Upload to S3
-        s3_path = S3Storage.upload_image(
-            file_content=contents,
-            filename=file.filename or "image.jpg",
-            content_type=file.content_type
+        # Hash the spooled upload (its hash is the S3 key), resize it and stream
+        # it to S3, unless the same content is already stored
+        s3_path, variants = await store_image(
+            file.file,
+            file.filename or "image.jpg",
+            lambda s3_key: AsyncS3Storage.upload_image_stream(
+                fileobj=file.file,
+                filename=file.filename or "image.jpg",
+                content_type=file.content_type,
+                s3_key=s3_key
+            )
         )
 
-        # Create database record
-        image_record = ImageItem.create_image(
-            s3_path=s3_path,
-            description=description,
-            tags=tag_list
-        )
+        # Create database record, giving the stored file's reference back if that fails
+        try:
+            image_record = await AsyncImageItem.create_image(
+                s3_path=s3_path,
+                description=description,
+                tags=tag_list,
+                variants=variants
+            )
+        except Exception:
+            await _discard_stored_image(s3_path, variants)
+            raise
+        await run_blocking(publish_manifest_safely)
 
         # Generate public S3 URL for immediate access
         url = S3Storage.get_public_url(s3_path)
@@ -135,7 +282,7 @@ async def upload_image(
         return {
             "status": "success",
             "message": "Image uploaded successfully",
-            "image": Image(**image_record),
+            "image": image_payload(image_record),
             "url": url
         }
 
@@ -148,6 +295,297 @@ async def upload_image(
             detail="Failed to upload image"
         )
 
+async def _store_batch_file(
+    file: UploadFile,
+    description: str,
+    tags: str,
+    semaphore: asyncio.Semaphore
+) -> ImageRecord:
+    # Upload one file of a batch and build (but don't write) its record
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise ValueError("File must be an image")
+
+    tag_list = [tag.strip().lower() for tag in tags.split(",") if tag.strip()]
+    if not tag_list:
+        raise ValueError("At least one tag is required")
+    if len(tag_list) > MAX_IMAGE_TAGS:
+        raise ValueError(f"At most {MAX_IMAGE_TAGS} tags per image")
+
+    async with semaphore:
+        s3_path, variants = await store_image(
+            file.file,
+            file.filename or "image.jpg",
+            lambda s3_key: AsyncS3Storage.upload_image_stream(
+                fileobj=file.file,
+                filename=file.filename or "image.jpg",
+                content_type=file.content_type,
+                s3_key=s3_key
+            )
+        )
+
+    return ImageItem.new_item(s3_path, description, tag_list, variants=variants)
+
+
+async def _discard_stored_image(s3_path: str, variants: list[dict]) -> None:
+    # Best-effort cleanup of a stored file whose record couldn't be written
+    try:
+        await discard_stored_image(s3_path, variants)
+    except Exception as e:
+        logger.error(f"Error cleaning up {s3_path}: {str(e)}")
+
+
+async def _delete_released_files(records: list[ImageRecord]) -> None:
+    # Best-effort cleanup of deleted images' files, their records are already gone
+    try:
+        failed_ids = await delete_released_files(records)
+    except Exception as e:
+        logger.error(f"Error deleting files of {len(records)} deleted images: {str(e)}")
+        return
+    if failed_ids:
+        logger.error(f"Failed to delete files of deleted images: {', '.join(sorted(failed_ids))}")
+
+
+@router.post("/images/batch", status_code=status.HTTP_201_CREATED, dependencies=[Depends(verify_api_key)])
+async def upload_images_batch(
+    response: Response,
+    files: list[UploadFile] = File(...),
+    descriptions: list[str] = Form(...),
+    tags: list[str] = Form(...)
+) -> dict:
+    """
+    Upload many images in one request (requires admin authentication).
+    Files are uploaded concurrently (BATCH_UPLOAD_CONCURRENCY at a time) and
+    their records are written in shared transactions. Responds 207 Multi-Status
+    when some files failed.
+
+    Args:
+        files: Image files to upload
+        descriptions: One description per file, in the same order
+        tags: One comma-separated tag list per file, in the same order
+
+    Returns:
+        dict: Per-file results in upload order, each with the image record or an error
+    """
+    if len(files) > BATCH_UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_UPLOAD_MAX_FILES} files per batch"
+        )
+
+    if len(descriptions) != len(files) or len(tags) != len(files):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send one description and one tags field per file"
+        )
+
+    semaphore = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+    stored = await asyncio.gather(
+        *[
+            _store_batch_file(file, description, file_tags, semaphore)
+            for file, description, file_tags in zip(files, descriptions, tags)
+        ],
+        return_exceptions=True
+    )
+
+    records = [record for record in stored if isinstance(record, ImageRecord)]
+    try:
+        failed_ids = {record.uuid for record in await AsyncImageItem.create_images(records)}
+    except Exception as e:
+        logger.error(f"Error writing batch records: {str(e)}")
+        failed_ids = {record.uuid for record in records}
+
+    await asyncio.gather(*[
+        _discard_stored_image(record.s3_path, record.variants) for record in records if record.uuid in failed_ids
+    ])
+    if len(failed_ids) < len(records):
+        await run_blocking(publish_manifest_safely)
+
+    results = []
+    for file, outcome in zip(files, stored):
+        if isinstance(outcome, ValueError):
+            results.append({"filename": file.filename, "status": "error", "detail": str(outcome)})
+        elif isinstance(outcome, BaseException):
+            logger.error(f"Error uploading {file.filename}: {str(outcome)}")
+            results.append({"filename": file.filename, "status": "error", "detail": "Failed to upload image"})
+        elif outcome.uuid in failed_ids:
+            results.append({"filename": file.filename, "status": "error", "detail": "Failed to save image record"})
+        else:
+            results.append({
+                "filename": file.filename,
+                "status": "success",
+                "image": image_payload(outcome)
+            })
+
+    uploaded = sum(result["status"] == "success" for result in results)
+    if uploaded < len(results):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+
+    if uploaded == len(results):
+        outcome_status = "success"
+    else:
+        outcome_status = "partial" if uploaded else "error"
+
+    return {
+        "status": outcome_status,
+        "message": f"Uploaded {uploaded} of {len(results)} images",
+        "results": results
+    }
+
+@router.post("/image/upload-url", dependencies=[Depends(verify_api_key)])
+async def create_upload_url(request: UploadUrlRequest) -> dict:
+    """
+    Start a direct-to-S3 upload (requires admin authentication).
+    The client POSTs the file to the returned URL with the returned form
+    fields, then calls /image/{image_id}/finalize.
+
+    Args:
+        request: Filename, content type and (optionally) size of the upload
+
+    Returns:
+        dict: Reserved image ID, S3 path and presigned POST (url + fields)
+    """
+    if request.content_type not in DIRECT_UPLOAD_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File must be one of: {', '.join(DIRECT_UPLOAD_CONTENT_TYPES)}"
+        )
+
+    if request.size is not None and request.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File must be at most {MAX_UPLOAD_BYTES} bytes"
+        )
+
+    try:
+        image_id = str(uuid4())
+        s3_path = S3Storage.build_image_key(request.filename, image_id)
+
+        upload = await AsyncS3Storage.get_upload_url(
+            s3_path=s3_path,
+            content_type=request.content_type
+        )
+
+        return {
+            "status": "success",
+            "image_id": image_id,
+            "s3_path": s3_path,
+            "upload": upload
+        }
+
+    except Exception as e:
+        logger.error(f"Error creating upload URL: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create upload URL"
+        )
+
+@router.post(
+    "/image/{image_id}/finalize",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(verify_api_key)]
+)
+async def finalize_upload(image_id: str, request: FinalizeUploadRequest) -> dict:
+    """
+    Finish a direct-to-S3 upload by creating its image record
+    (requires admin authentication).
+
+    Args:
+        image_id: Image ID returned by /image/upload-url
+        request: S3 path returned by /image/upload-url, description and tags
+
+    Returns:
+        dict: Created image record with public URL
+    """
+    try:
+        if not request.s3_path.startswith(f"images/{image_id}."):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="s3_path does not belong to this image"
+            )
+
+        tag_list = [tag.strip().lower() for tag in request.tags if tag.strip()]
+        if not tag_list:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one tag is required"
+            )
+
+        if len(tag_list) > MAX_IMAGE_TAGS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_IMAGE_TAGS} tags per image"
+            )
+
+        if await AsyncImageItem.get_image(image_id, fields=("uuid",)):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Image already finalized"
+            )
+
+        # Verify the client actually uploaded the object
+        if not await AsyncS3Storage.image_exists(request.s3_path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload not found, POST the file to the upload URL first"
+            )
+
+        # Move the staged upload to its content-addressed key (unless that
+        # content is already stored), then drop the staged copy. It is hashed
+        # as it streams down, and resized from the spooled copy.
+        with tempfile.SpooledTemporaryFile(max_size=FINALIZE_SPOOL_BYTES) as staged:
+            digest, content_type = await AsyncS3Storage.download_to_file(request.s3_path, staged)
+            # The type the presigned POST policy pinned, not one guessed from the name
+            if content_type not in DIRECT_UPLOAD_CONTENT_TYPES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Uploaded file must be one of: {', '.join(DIRECT_UPLOAD_CONTENT_TYPES)}"
+                )
+            s3_path, variants = await store_image(
+                staged,
+                request.s3_path,
+                lambda s3_key: AsyncS3Storage.copy_object(request.s3_path, s3_key, content_type),
+                digest=digest
+            )
+        try:
+            await AsyncS3Storage.delete_image(request.s3_path)
+        except Exception as e:
+            logger.error(f"Error deleting staged upload {request.s3_path}: {str(e)}")
+
+        try:
+            image_record = await AsyncImageItem.create_image(
+                s3_path=s3_path,
+                description=request.description,
+                tags=tag_list,
+                image_id=image_id,
+                variants=variants
+            )
+        except Exception as e:
+            await _discard_stored_image(s3_path, variants)
+            if isinstance(e, ImageExistsError):
+                # Another finalize of the same upload got there first
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Image already finalized"
+                )
+            raise
+        await run_blocking(publish_manifest_safely)
+
+        return {
+            "status": "success",
+            "message": "Image uploaded successfully",
+            "image": image_payload(image_record),
+            "url": S3Storage.get_public_url(s3_path)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finalizing upload: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to finalize upload"
+        )
+
 @router.put("/image/{image_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(verify_api_key)])
 async def update_image(
     image_id: str,
@@ -167,7 +605,7 @@ async def update_image(
     """
     try:
         # Verify image exists
-        existing = ImageItem.get_image(image_id)
+        existing = await AsyncImageItem.get_image(image_id, fields=("uuid",))
         if not existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -183,18 +621,30 @@ async def update_image(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="If tags are provided, at least one tag is required"
                 )
+            if len(tag_list) > MAX_IMAGE_TAGS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"At most {MAX_IMAGE_TAGS} tags per image"
+                )
 
-        # Update image
-        updated_image = ImageItem.update_image(
-            image_id=image_id,
-            description=description,
-            tags=tag_list
-        )
+        # Update image (404 if it was deleted since the check above)
+        try:
+            updated_image = await AsyncImageItem.update_image(
+                image_id=image_id,
+                description=description,
+                tags=tag_list
+            )
+        except ImageNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Image not found"
+            )
+        await run_blocking(publish_manifest_safely)
 
         return {
             "status": "success",
             "message": "Image updated successfully",
-            "image": Image(**updated_image)
+            "image": image_payload(updated_image)
         }
 
     except HTTPException:
@@ -218,19 +668,19 @@ async def delete_image(image_id: str) -> dict:
         dict: Success response
     """
     try:
-        # Get image record to find S3 path
-        image_record = ImageItem.get_image(image_id)
-        if not image_record:
+        # Delete from database, dropping its reference to its files in the same
+        # transaction (404 if it doesn't exist or another request deleted it first)
+        try:
+            image_record = await AsyncImageItem.delete_image(image_id)
+        except ImageNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Image not found"
             )
+        await run_blocking(publish_manifest_safely)
 
-        # Delete from S3
-        S3Storage.delete_image(image_record["s3_path"])
-
-        # Delete from database
-        ImageItem.delete_image(image_id)
+        # Then delete original and variants from S3, unless other images share them
+        await _delete_released_files([image_record])
 
         return {
             "status": "success",
@@ -244,4 +694,76 @@ async def delete_image(image_id: str) -> dict:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete image"
-        )
\ No newline at end of file
+        )
+
+@router.post("/images/delete", dependencies=[Depends(verify_api_key)])
+async def delete_images(request: DeleteImagesRequest, response: Response) -> dict:
+    """
+    Delete many images at once (requires admin authentication).
+    Records are read with BatchGetItem and deleted in shared transactions,
+    then the files no image uses anymore are removed with S3 DeleteObjects.
+    Responds 207 Multi-Status when some IDs failed.
+
+    Args:
+        request: Image IDs to delete
+
+    Returns:
+        dict: Per-ID results in request order
+    """
+    image_ids = list(dict.fromkeys(request.image_ids))
+    if not image_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one image ID is required"
+        )
+
+    if len(image_ids) > BULK_DELETE_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BULK_DELETE_MAX_IDS} image IDs per request"
+        )
+
+    try:
+        # Tags too, so the deleted records can be dropped from the tag index
+        records = await AsyncImageItem.get_images(image_ids, fields=(*FILE_FIELDS, "tags", "version"))
+        found = {record.uuid for record in records}
+
+        # Delete the records, dropping their references to their files in the same transactions
+        records_failed = set(await AsyncImageItem.delete_images(records))
+        deleted_records = [record for record in records if record.uuid not in records_failed]
+        if deleted_records:
+            await run_blocking(publish_manifest_safely)
+
+    except Exception as e:
+        logger.error(f"Error deleting images: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete images"
+        )
+
+    # Then delete originals and variants from S3 (files other images share stay)
+    await _delete_released_files(deleted_records)
+
+    results = []
+    for image_id in image_ids:
+        if image_id not in found:
+            results.append({"image_id": image_id, "status": "not_found", "detail": "Image not found"})
+        elif image_id in records_failed:
+            results.append({"image_id": image_id, "status": "error", "detail": "Failed to delete image record"})
+        else:
+            results.append({"image_id": image_id, "status": "success"})
+
+    deleted = sum(result["status"] == "success" for result in results)
+    if deleted < len(results):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+
+    if deleted == len(results):
+        outcome_status = "success"
+    else:
+        outcome_status = "partial" if deleted else "error"
+
+    return {
+        "status": outcome_status,
+        "message": f"Deleted {deleted} of {len(results)} images",
+        "results": results
+    }
@@ -1,62 +1,373 @@
+import os
+import json
+import hashlib
 import logging
+from typing import Optional
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Query, Request, Response, status
 
 from ._router import router
-from .models import Manifest, Image
+from ._caching import CachedBody, RenderCache, SourceMemo, conditional_response
+from ._serializers import image_payload, render_json
+from .models import CategoryManifest, Manifest, ManifestChanges
+from shared.cache import TTLCache
 from shared.db.models import ImageItem
-from shared.s3.models import S3Storage
+from shared.db.catalog import CatalogVersion, ChangeLog, ManifestSnapshot
+from shared.db.records import VERSIONED_FIELDS, ImageRecord
+from shared.executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
+# How long a warm worker serves the manifest snapshot before re-reading it
+MANIFEST_CACHE_TTL_SECONDS = float(os.getenv("MANIFEST_CACHE_TTL_SECONDS", "60"))
+
+DEFAULT_MANIFEST_CATEGORIES = {
+    "featured": ["featured"],
+    "doorInstall": ["door", "doors"],
+    "openers": ["opener", "openers"],
+    "gates": ["gate", "gates"],
+    "customWork": ["custom"]
+}
+
+# Manifest categories and the tags that put an image in them (JSON: {"category": ["tag", ...]})
+MANIFEST_CATEGORIES: dict[str, list[str]] = json.loads(
+    os.getenv("MANIFEST_CATEGORIES") or json.dumps(DEFAULT_MANIFEST_CATEGORIES)
+)
+
+
+def category_lookup(categories: dict[str, list[str]]) -> dict[str, tuple[str, ...]]:
+    """
+    Invert the category map into tag -> categories.
+
+    Args:
+        categories: Category name -> tags that select it
+
+    Returns:
+        dict[str, tuple[str, ...]]: Tag -> every category it selects
+    """
+    lookup: dict[str, list[str]] = {}
+    for category, tags in categories.items():
+        for tag in tags:
+            selected = lookup.setdefault(tag.strip().lower(), [])
+            if category not in selected:
+                selected.append(category)
+    return {tag: tuple(selected) for tag, selected in lookup.items()}
+
+
+def category_aliases(categories: dict[str, list[str]]) -> dict[str, str]:
+    """
+    Map every name a client can use for a category to the category.
+    The category name itself is always an alias; a tag is one only if it
+    selects a single category.
+
+    Args:
+        categories: Category name -> tags that select it
+
+    Returns:
+        dict[str, str]: Lowercased alias -> category name
+    """
+    aliases = {
+        tag: selected[0]
+        for tag, selected in category_lookup(categories).items()
+        if len(selected) == 1
+    }
+    aliases.update({category.lower(): category for category in categories})
+    return aliases
+
+
+_CATEGORY_LOOKUP = category_lookup(MANIFEST_CATEGORIES)
+_CATEGORY_ALIASES = category_aliases(MANIFEST_CATEGORIES)
+
+# Snapshots built with a different category map are rebuilt on load
+MANIFEST_LAYOUT = hashlib.sha256(
+    json.dumps(MANIFEST_CATEGORIES, sort_keys=True).encode()
+).hexdigest()[:16]
+
+
+def build_manifest(records: list[ImageRecord]) -> dict:
+    """
+    Sort image records into the manifest categories in one pass,
+    using the precomputed tag -> categories lookup.
+
+    Args:
+        records: Image records from DynamoDB
+
+    Returns:
+        dict: Category name -> images, in MANIFEST_CATEGORIES order
+    """
+    manifest: dict[str, list[dict]] = {category: [] for category in MANIFEST_CATEGORIES}
+
+    for record in records:
+        selected = {
+            category
+            for tag in record.tags
+            for category in _CATEGORY_LOOKUP.get(tag, ())
+        }
+        if not selected:
+            continue
+
+        # Plain image data with public URLs, converted once and shared across categories
+        image = image_payload(record)
+        for category in selected:
+            manifest[category].append(image)
+
+    return manifest
+
+
+def patch_manifest(manifest: dict, records: list[ImageRecord], removed: list[str]) -> dict:
+    """
+    Apply changed and deleted images to a built manifest instead of rebuilding it.
+    Changed images move to the end of their categories.
+
+    Args:
+        manifest: Category name -> images, as built by build_manifest
+        records: Current records of images added or updated since
+        removed: UUIDs of images deleted since
+
+    Returns:
+        dict: Category name -> images, in MANIFEST_CATEGORIES order
+    """
+    changed = set(removed).union(record.uuid for record in records)
+    patched = {
+        category: [image for image in manifest.get(category, []) if image["uuid"] not in changed]
+        for category in MANIFEST_CATEGORIES
+    }
+    for category, images in build_manifest(records).items():
+        patched[category].extend(images)
+    return patched
+
+
+def _build_snapshot(version: int) -> dict:
+    # Full rebuild. The caller read the version before the scan: every write up
+    # to it committed with it, so the scan includes them.
+    records = ImageItem.scan_all_images(consistent_read=True)
+    return {"version": version, "body": render_json(build_manifest(records)), "layout": MANIFEST_LAYOUT}
+
+
+def publish_manifest() -> dict:
+    """
+    Bring the stored manifest snapshot up to the current catalog version.
+    Called by the admin write handlers after their change is committed.
+    Only the change log entries since the stored snapshot are applied, and
+    nothing is written when a concurrent publish already covered this write;
+    the table is scanned only without a usable snapshot (first publish,
+    changed categories, or a manifest too large to store).
+
+    Returns:
+        dict: {"version": int, "body": bytes} of the published snapshot
+    """
+    # Only read the counter: versioned writes condition on it, so moving it
+    # here would make publishes conflict with them
+    version = CatalogVersion.current()
+    stored = ManifestSnapshot.get()
+    usable = stored is not None and stored["body"] is not None and stored["layout"] == MANIFEST_LAYOUT
+
+    if usable and stored["version"] >= version:
+        logger.info(f"Manifest snapshot already at version {stored['version']}")
+        snapshot = stored
+    elif usable:
+        records, removed = ChangeLog.get_changes(stored["version"], version)
+        body = render_json(patch_manifest(json.loads(stored["body"]), records, removed))
+        snapshot = {"version": version, "body": body, "layout": MANIFEST_LAYOUT}
+        ManifestSnapshot.save(version, body, MANIFEST_LAYOUT)
+    else:
+        snapshot = _build_snapshot(version)
+        ManifestSnapshot.save(version, snapshot["body"], MANIFEST_LAYOUT)
+
+    _manifest_cache.invalidate()
+    return snapshot
+
+
+def publish_manifest_safely() -> None:
+    """
+    Publish the manifest without failing the caller.
+    The admin write has already been committed, so a failed rebuild is
+    logged rather than reported as a failed request.
+    """
+    try:
+        publish_manifest()
+    except Exception as e:
+        logger.error(f"Error publishing manifest snapshot: {str(e)}")
+
+
+def _load_manifest() -> dict:
+    # Read-only: public requests never write the snapshot or touch the version
+    snapshot = ManifestSnapshot.get()
+    if snapshot is not None and snapshot["body"] is not None and snapshot["layout"] == MANIFEST_LAYOUT:
+        return snapshot
+
+    if snapshot is None:
+        logger.info("No manifest snapshot published yet, building the manifest from the image cache")
+    elif snapshot["body"] is None:
+        logger.info("Manifest too large for the snapshot, building it from the image cache")
+    else:
+        logger.info("Manifest categories changed since the last publish, building the manifest from the image cache")
+    version = CatalogVersion.current()
+    records = ImageItem.get_all_images()
+    return {"version": version, "body": render_json(build_manifest(records)), "layout": MANIFEST_LAYOUT}
+
+
+_manifest_cache: TTLCache[dict] = TTLCache(
+    "manifest",
+    loader=_load_manifest,
+    ttl=MANIFEST_CACHE_TTL_SECONDS
+)
+
+# Snapshot bodies are already rendered, only the ETag is derived
+_manifest_body = RenderCache(lambda snapshot: snapshot["body"])
+
+
+def _split_categories(snapshot: dict) -> dict[str, CachedBody]:
+    manifest = json.loads(snapshot["body"])
+    return {
+        category: CachedBody(render_json({"category": category, "images": images}))
+        for category, images in manifest.items()
+    }
+
+
+# Per-category bodies, split once per snapshot
+_category_bodies = SourceMemo(_split_categories)
+
+
+def warm_manifest() -> None:
+    """
+    Load the manifest snapshot into this worker's cache and render (and
+    compress) the manifest and category bodies, ahead of the first request.
+    """
+    snapshot = _manifest_cache.get()
+    _manifest_body.get(snapshot).precompress()
+    for body in _category_bodies.get(snapshot).values():
+        body.precompress()
+
+
+def resolve_category(name: str) -> Optional[str]:
+    """
+    Find the category a client asked for by its name or one of its tags.
+
+    Args:
+        name: Category name or tag (case-insensitive)
+
+    Returns:
+        Optional[str]: Category name, or None if nothing matches
+    """
+    return _CATEGORY_ALIASES.get(name.strip().lower())
+
+
 @router.get("/manifest", response_model=Manifest)
-async def get_manifest() -> Manifest:
+async def get_manifest(request: Request) -> Response:
     """
     Get manifest endpoint - returns images grouped by category.
+    Served from the materialized snapshot updated on every admin write,
+    with 304 Not Modified when If-None-Match carries the current ETag.
 
     Returns:
-        Manifest: Images organized by category (featured, doors, openers, gates, custom)
+        Manifest: Images organized by category (see MANIFEST_CATEGORIES)
     """
     try:
-        # Get all images from database
-        items = ImageItem.get_all_images()
-
-        # Organize images by tags
-        featured = []
-        door_install = []
-        openers = []
-        gates = []
-        custom_work = []
-
-        for item in items:
-            # Add public URL to image
-            image_data = dict(item)
-            image_data["url"] = S3Storage.get_public_url(item["s3_path"])
-            image = Image(**image_data)
-            tags = item.get("tags", [])
-
-            if "featured" in tags:
-                featured.append(image)
-            if "door" in tags or "doors" in tags:
-                door_install.append(image)
-            if "opener" in tags or "openers" in tags:
-                openers.append(image)
-            if "gate" in tags or "gates" in tags:
-                gates.append(image)
-            if "custom" in tags:
-                custom_work.append(image)
-
-        return Manifest(
-            featured=featured,
-            doorInstall=door_install,
-            openers=openers,
-            gates=gates,
-            customWork=custom_work
-        )
+        snapshot = await run_blocking(_manifest_cache.get)
+
+        return conditional_response(request, _manifest_body.get(snapshot))
 
     except Exception as e:
         logger.error(f"Error fetching manifest: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch manifest"
-        )
\ No newline at end of file
+        )
+
+
+def catalog_changes(since: int) -> dict:
+    """
+    Collect the images added, updated and deleted after a catalog version.
+    Reads the version first: every change up to it was committed together
+    with it, so the change log can't be missing one.
+
+    Args:
+        since: Version the client last synced to (0 for a first sync)
+
+    Returns:
+        dict: ManifestChanges payload
+    """
+    version = CatalogVersion.current()
+
+    if 0 < since <= version:
+        records, removed = ChangeLog.get_changes(since, version)
+        full = False
+    else:
+        # First sync, or a version this catalog never reached: send everything
+        records = ImageItem.scan_all_images(consistent_read=True, fields=VERSIONED_FIELDS)
+        removed = []
+        full = True
+
+    return {
+        "since": since,
+        "version": version,
+        "full": full,
+        "upserts": [
+            {**image_payload(record), "version": record.version, "updated_at": record.updated_at}
+            for record in records
+        ],
+        "removed": removed
+    }
+
+
+@router.get("/manifest/changes", response_model=ManifestChanges)
+async def get_manifest_changes(request: Request, since: int = Query(0, ge=0)) -> Response:
+    """
+    Get the images changed since a catalog version, for clients that keep a
+    local copy of the catalog. Read from the change log, so the cost follows
+    the number of changes rather than the size of the catalog.
+
+    Args:
+        since: version from the previous response (0 or omitted: full sync)
+
+    Returns:
+        ManifestChanges: Upserted images, removed image UUIDs and the version to sync from next
+    """
+    try:
+        changes = await run_blocking(catalog_changes, since)
+
+        return conditional_response(request, CachedBody(render_json(changes)))
+
+    except Exception as e:
+        logger.error(f"Error fetching manifest changes: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch manifest changes"
+        )
+
+
+@router.get("/manifest/{category}", response_model=CategoryManifest)
+async def get_manifest_category(category: str, request: Request) -> Response:
+    """
+    Get one manifest category, e.g. /manifest/gates.
+    Split out of the same snapshot as /manifest, with its own ETag.
+
+    Args:
+        category: Category name or any tag that selects only that category
+
+    Returns:
+        CategoryManifest: The category name and its images
+    """
+    name = resolve_category(category)
+    if name is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown category, expected one of: {', '.join(MANIFEST_CATEGORIES)}"
+        )
+
+    try:
+        snapshot = await run_blocking(_manifest_cache.get)
+        cached = _category_bodies.get(snapshot).get(name)
+        if cached is None:
+            # Snapshot predates the category, publish hasn't caught up yet
+            cached = CachedBody(render_json({"category": name, "images": []}))
+
+        return conditional_response(request, cached)
+
+    except Exception as e:
+        logger.error(f"Error fetching manifest category: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch manifest"
+        )
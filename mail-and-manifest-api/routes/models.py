@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, RootModel
 
 #
 # Contact Request
@@ -19,19 +19,57 @@ class ImageUpload(BaseModel):
     image_file: str
     description: str
 
+class UploadUrlRequest(BaseModel):
+    filename: str
+    content_type: str
+    size: Optional[int] = None
+
+class FinalizeUploadRequest(BaseModel):
+    s3_path: str
+    description: str
+    tags: list[str]
+
+class DeleteImagesRequest(BaseModel):
+    image_ids: list[str]
+
+class ImageVariant(BaseModel):
+    width: int
+    height: int
+    format: str
+    s3_path: str
+    url: Optional[str] = None
+
 class Image(BaseModel):
     uuid: str
     tags: list[str]
     s3_path: str
     description: str
     url: Optional[str] = None
+    # Resized copies, smallest first; url + width make a srcset entry
+    variants: list[ImageVariant] = []
 
 class Images(BaseModel):
     images: list[Image]
 
-class Manifest(BaseModel):
-    featured: list[Image]
-    doorInstall: list[Image]
-    openers: list[Image]
-    gates: list[Image]
-    customWork: list[Image]
+class Manifest(RootModel[dict[str, list[Image]]]):
+    # Category name -> images, categories come from MANIFEST_CATEGORIES
+    root: dict[str, list[Image]]
+
+class CategoryManifest(BaseModel):
+    category: str
+    images: list[Image]
+
+class ImageChange(Image):
+    # Catalog version and time of the image's last write
+    version: int
+    updated_at: str
+
+class ManifestChanges(BaseModel):
+    since: int
+    # Pass as ?since= on the next sync
+    version: int
+    # Every image is listed: replace the local copy instead of merging
+    full: bool
+    upserts: list[ImageChange]
+    # UUIDs of deleted images
+    removed: list[str]
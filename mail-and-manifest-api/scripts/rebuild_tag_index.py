@@ -0,0 +1,30 @@
+"""
+Rebuild the tag index from the images table.
+
+Run once after deploying the tag index, or whenever the index is suspected
+to have drifted:
+
+    python -m scripts.rebuild_tag_index [--segments N]
+"""
+import logging
+import argparse
+
+from shared.db.models import ImageItem
+from shared.db.catalog import TagIndex
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=None, help="Parallel scan segments")
+    args = parser.parse_args()
+
+    records = ImageItem.scan_all_images(consistent_read=True, segments=args.segments)
+    TagIndex.add_images([record.to_item() for record in records])
+    logger.info(f"Indexed {len(records)} images")
+
+
+if __name__ == "__main__":
+    main()
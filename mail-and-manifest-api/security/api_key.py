@@ -1,11 +1,15 @@
 import os
+from typing import Optional
 
 from fastapi.security import APIKeyHeader
 from fastapi import Depends, HTTPException
 
 api_key_header = APIKeyHeader(name="X-API-KEY", auto_error=False)
 
+def is_admin_key(api_key: Optional[str]) -> bool:
+    return bool((api_key_env := os.getenv("ADMIN_API_KEY")) and api_key == api_key_env)
+
 def verify_api_key(api_key: str = Depends(api_key_header)):
-    if (api_key_env := os.getenv("ADMIN_API_KEY")) and api_key == api_key_env:
+    if is_admin_key(api_key):
         return
     raise HTTPException(status_code=403, detail="Invalid API Key")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import time
+import threading
+from collections import OrderedDict
+
+# One lock for every limiter, so a request can take from several buckets atomically
+_lock = threading.Lock()
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets keyed by caller (client IP, email address, ...).
+    Each bucket holds up to `burst` tokens and regains one every
+    `refill_seconds`. Only the `max_keys` most recently used keys are kept;
+    a forgotten key starts again with a full bucket.
+    """
+
+    def __init__(self, burst: int, refill_seconds: float, max_keys: int = 10000):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        # key -> (tokens, when they were counted)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def available(self, key: str, now: float) -> float:
+        if self.refill_seconds <= 0:
+            return float(self.burst)
+        tokens, counted_at = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - counted_at) / self.refill_seconds)
+
+    def take(self, key: str, available: float, now: float) -> None:
+        self._buckets[key] = (available - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+def admit(limits: list[tuple[TokenBucketLimiter, str]]) -> float:
+    """
+    Take one token from every bucket, or from none of them.
+    A request refused by one bucket doesn't drain the others.
+
+    Args:
+        limits: (limiter, key) pairs the request has to pass
+
+    Returns:
+        float: 0 if admitted, otherwise seconds until every bucket has a token again
+    """
+    now = time.monotonic()
+    with _lock:
+        available = [limiter.available(key, now) for limiter, key in limits]
+        wait = max(
+            ((1 - tokens) * limiter.refill_seconds
+             for (limiter, _), tokens in zip(limits, available) if tokens < 1),
+            default=0.0
+        )
+        if wait:
+            return wait
+
+        for (limiter, key), tokens in zip(limits, available):
+            limiter.take(key, tokens, now)
+        return 0.0
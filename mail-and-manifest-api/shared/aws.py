@@ -0,0 +1,208 @@
+import os
+import threading
+from typing import Any, Optional
+
+from shared import telemetry
+
+# boto3 is imported on first use: importing it and building clients is the
+# bulk of a cold start, and requests like /health never touch AWS.
+
+# Connections kept per client. Needs to cover every thread that can call AWS at
+# once: the AWS I/O executor, parallel scans and multipart upload threads.
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+
+# Socket timeouts per attempt. attempts x (connect + read) should stay well
+# inside the 30 s Lambda timeout.
+AWS_CONNECT_TIMEOUT_SECONDS = float(os.getenv("AWS_CONNECT_TIMEOUT_SECONDS", "2"))
+AWS_READ_TIMEOUT_SECONDS = float(os.getenv("AWS_READ_TIMEOUT_SECONDS", "5"))
+
+# Retry mode (adaptive adds client-side rate limiting on throttles) and total attempts
+AWS_RETRY_MODE = os.getenv("AWS_RETRY_MODE", "adaptive")
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+
+# Keep idle pooled connections alive between warm invocations
+AWS_TCP_KEEPALIVE = os.getenv("AWS_TCP_KEEPALIVE", "true").lower() == "true"
+
+_session: Optional[Any] = None
+_clients: dict[str, Any] = {}
+_resources: dict[str, Any] = {}
+_tables: dict[str, Any] = {}
+_stats: dict[str, "_ClientStats"] = {}
+_lock = threading.Lock()
+
+
+class _ClientStats:
+    """Per-client request counters, fed by botocore's send/receive events"""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.over_pool = 0
+        self._lock = threading.Lock()
+
+        events = client.meta.events
+        events.register("before-send", self._before_send)
+        events.register("response-received", self._response_received)
+
+    def _before_send(self, **_kwargs: Any) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.in_flight > AWS_MAX_POOL_CONNECTIONS:
+                # urllib3 opens a throwaway connection past the pool size
+                self.over_pool += 1
+
+    def _response_received(self, context: Optional[dict] = None, exception: Any = None, **_kwargs: Any) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if exception is not None:
+                self.errors += 1
+            if (context or {}).get("retries", {}).get("attempt", 1) > 1:
+                self.retries += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "over_pool": self.over_pool
+            }
+
+        # Connection pools live on the client's urllib3 PoolManager (one per host)
+        stats["pools"] = []
+        try:
+            pools = self.client._endpoint.http_session._manager.pools  # pylint: disable=protected-access
+        except AttributeError:
+            return stats
+
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats["pools"].append({
+                    "host": key.key_host,
+                    "max_size": pool.pool.maxsize,
+                    "idle": pool.pool.qsize(),
+                    "opened": pool.num_connections
+                })
+        return stats
+
+
+def _get_session() -> Any:
+    # Called with _lock held
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        # pylint: disable=import-outside-toplevel
+        import boto3
+        _session = boto3.session.Session()
+    return _session
+
+
+def client_config() -> Any:
+    """
+    Build the botocore Config shared by every client.
+
+    Returns:
+        botocore.config.Config
+    """
+    # pylint: disable=import-outside-toplevel
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        connect_timeout=AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=AWS_READ_TIMEOUT_SECONDS,
+        retries={"mode": AWS_RETRY_MODE, "total_max_attempts": AWS_MAX_ATTEMPTS},
+        tcp_keepalive=AWS_TCP_KEEPALIVE
+    )
+
+
+def client(service_name: str) -> Any:
+    """
+    Get the shared client for a service, creating it on first use.
+    All clients come from one session with the tuned client_config.
+    Clients are thread-safe, so one per service is shared by every caller.
+
+    Args:
+        service_name: AWS service name (e.g. "s3", "ses")
+
+    Returns:
+        botocore client
+    """
+    existing = _clients.get(service_name)
+    if existing is not None:
+        return existing
+
+    with _lock:
+        if service_name not in _clients:
+            created = _get_session().client(service_name, config=client_config())
+            _stats[service_name] = _ClientStats(created)
+            telemetry.instrument(created)
+            _clients[service_name] = created
+        return _clients[service_name]
+
+
+def resource(service_name: str) -> Any:
+    """
+    Get the shared boto3 resource for a service, creating it on first use.
+
+    Args:
+        service_name: AWS service name (e.g. "dynamodb")
+
+    Returns:
+        boto3 service resource
+    """
+    existing = _resources.get(service_name)
+    if existing is not None:
+        return existing
+
+    with _lock:
+        if service_name not in _resources:
+            created = _get_session().resource(service_name, config=client_config())
+            _stats[f"{service_name}-resource"] = _ClientStats(created.meta.client)
+            telemetry.instrument(created.meta.client)
+            _resources[service_name] = created
+        return _resources[service_name]
+
+
+def table(table_name: str) -> Any:
+    """
+    Get the shared DynamoDB Table resource for a table, creating it on first use.
+
+    Args:
+        table_name: DynamoDB table name
+
+    Returns:
+        DynamoDB Table resource
+    """
+    existing = _tables.get(table_name)
+    if existing is not None:
+        return existing
+
+    dynamodb = resource("dynamodb")
+    with _lock:
+        if table_name not in _tables:
+            _tables[table_name] = dynamodb.Table(table_name)
+        return _tables[table_name]
+
+
+def pool_stats() -> dict:
+    """
+    Report request and connection pool usage for every client created so far.
+    peak_in_flight close to max_size (or any over_pool) means callers were
+    queueing for connections and AWS_MAX_POOL_CONNECTIONS should go up.
+
+    Returns:
+        dict: {client name: {"requests", "retries", "errors", "in_flight",
+            "peak_in_flight", "over_pool", "pools": [{"host", "max_size", "idle", "opened"}]}}
+    """
+    with _lock:
+        stats = dict(_stats)
+    return {name: client_stats.snapshot() for name, client_stats in stats.items()}
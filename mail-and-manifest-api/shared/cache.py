@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """
+    In-process cache for a single value produced by a loader function.
+
+    Fresh values are served straight from memory. Once the TTL has passed,
+    the first caller refreshes the value while every other caller keeps
+    getting the stale copy, so only one request per worker pays for the
+    reload. Writers call invalidate() to drop the value immediately.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], T], ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._expires_at = 0.0
+        self._generation = 0
+        self._refreshing = False
+
+    def get(self) -> T:
+        """
+        Get the cached value, loading or refreshing it if needed.
+
+        Returns:
+            T: Cached (possibly stale) value
+        """
+        with self._lock:
+            if self._loaded and time.monotonic() < self._expires_at:
+                return self._value  # type: ignore[return-value]
+
+            if self._loaded and self._refreshing:
+                # Another caller is already refreshing, serve the stale copy
+                return self._value  # type: ignore[return-value]
+
+            if self._loaded:
+                self._refreshing = True
+                generation = self._generation
+                stale = True
+            else:
+                stale = False
+
+        if stale:
+            return self._refresh(generation)
+
+        # Nothing cached yet, so every caller has to wait for one load
+        with self._load_lock:
+            with self._lock:
+                if self._loaded:
+                    return self._value  # type: ignore[return-value]
+                generation = self._generation
+            return self._store(self._loader(), generation)
+
+    def invalidate(self) -> None:
+        """Drop the cached value so the next caller reloads it."""
+        with self._lock:
+            self._value = None
+            self._loaded = False
+            self._expires_at = 0.0
+            self._generation += 1
+            self._refreshing = False
+        logger.info(f"Invalidated cache: {self.name}")
+
+    def _refresh(self, generation: int) -> T:
+        try:
+            return self._store(self._loader(), generation)
+        except Exception:
+            with self._lock:
+                if generation == self._generation:
+                    self._refreshing = False
+                    if self._loaded:
+                        logger.exception(f"Error refreshing cache {self.name}, serving stale copy")
+                        return self._value  # type: ignore[return-value]
+            raise
+
+    def _store(self, value: T, generation: int) -> T:
+        with self._lock:
+            # A write invalidated the cache while we were loading, so the
+            # value we hold may predate it. Hand it back but don't keep it.
+            if generation != self._generation:
+                return value
+
+            self._value = value
+            self._loaded = True
+            self._expires_at = time.monotonic() + self.ttl
+            self._refreshing = False
+        return value
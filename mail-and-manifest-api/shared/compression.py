@@ -0,0 +1,172 @@
+import os
+import gzip
+import zlib
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from shared import telemetry
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only without it
+    brotli = None
+
+# Smallest response body (bytes) worth compressing
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# gzip compression level (1-9)
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+# Brotli quality (0-11)
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Encodings we can produce, most preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Content types worth compressing (images are already compressed)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header (RFC 9110).
+    Ties go to brotli, which is smaller for JSON.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        Optional[str]: "br" or "gzip", or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    chosen, chosen_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > chosen_weight:
+            chosen, chosen_weight = encoding, weight
+    return chosen
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Response body
+        encoding: "br" or "gzip" (from negotiate_encoding)
+
+    Returns:
+        bytes: Compressed body
+    """
+    with telemetry.span("compress"):
+        if encoding == "br":
+            return brotli.compress(body, quality=BROTLI_QUALITY)
+        # Fixed mtime, so the same body always compresses to the same bytes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    # Compresses a streamed body chunk by chunk
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._gzip = None
+        else:
+            self._brotli = None
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, chunk: bytes, last: bool) -> bytes:
+        # Every chunk is flushed, so it reaches the client now rather than with the last one
+        with telemetry.span("compress"):
+            if self._brotli is not None:
+                return self._brotli.process(chunk) + (self._brotli.finish() if last else self._brotli.flush())
+            return self._gzip.compress(chunk) + self._gzip.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses JSON and text responses with brotli or
+    gzip, negotiated on Accept-Encoding. Bodies under COMPRESSION_MIN_BYTES
+    and responses that already carry a Content-Encoding (the pre-compressed
+    catalog bodies, see routes._caching) are sent as they are.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The start message is held back until the first body chunk shows
+        # whether the response is worth compressing
+        start: Optional[dict] = None
+        stream: Optional[_StreamCompressor] = None
+
+        async def send_compressed(message: dict) -> None:
+            nonlocal start, stream
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                if stream is not None and message["type"] == "http.response.body":
+                    last = not message.get("more_body", False)
+                    message = {**message, "body": stream.process(message.get("body", b""), last)}
+                await send(message)
+                return
+
+            held, start = start, None
+            headers = MutableHeaders(raw=list(held["headers"]))
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not _compressible(headers) or (not more_body and len(body) < COMPRESSION_MIN_BYTES):
+                await send(held)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                # Streamed: the compressed length isn't known up front
+                if "content-length" in headers:
+                    del headers["content-length"]
+                stream = _StreamCompressor(encoding)
+                body = stream.process(body, last=False)
+            else:
+                body = compress(body, encoding)
+                headers["Content-Length"] = str(len(body))
+
+            await send({**held, "headers": headers.raw})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,599 @@
+import os
+import gzip
+import time
+import logging
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from shared import aws
+from shared.db.records import VERSIONED_FIELDS, ImageRecord, plain_variant, projection
+
+logger = logging.getLogger(__name__)
+
+# Catalog Table Name from environment (manifest snapshot, version counter, tag index, change log, blob refs)
+CATALOG_TABLE_NAME = os.getenv("CATALOG_TABLE_NAME", "opgd-images-catalog")
+
+# After this long, a blob whose delete never finished can be stored again
+BLOB_DELETE_TIMEOUT_SECONDS = int(os.getenv("BLOB_DELETE_TIMEOUT_SECONDS", "300"))
+
+# Largest compressed manifest kept in the snapshot item: DynamoDB caps items at
+# 400 KB, the rest is headroom for the other attributes
+MANIFEST_SNAPSHOT_MAX_BYTES = 380 * 1024
+
+VERSION_KEY = {"pk": "CATALOG", "sk": "VERSION"}
+MANIFEST_KEY = {"pk": "MANIFEST", "sk": "CURRENT"}
+CHANGE_PK = "CHANGE"
+
+
+class CatalogVersion:
+    """DynamoDB interface for the catalog version counter"""
+
+    @staticmethod
+    def current() -> int:
+        """
+        Read the catalog version with a strongly consistent read.
+
+        Returns:
+            int: Current catalog version (0 before the first write)
+        """
+        try:
+            response = aws.table(CATALOG_TABLE_NAME).get_item(Key=VERSION_KEY, ConsistentRead=True)
+            return int(response.get("Item", {}).get("version", 0))
+        except ClientError as e:
+            logger.error(f"Error reading catalog version: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def advance(current: int, count: int = 1) -> dict:
+        """
+        Build the TransactWriteItems action that reserves the next versions.
+        The action only succeeds while the counter still reads current, so
+        the writes in the same transaction get versions nobody else holds.
+
+        Args:
+            current: Version read with current()
+            count: Number of versions to reserve
+
+        Returns:
+            dict: Update action for a resource-layer transact_write_items call
+        """
+        condition = "#v = :current" if current else "attribute_not_exists(#v)"
+        values = {":next": current + count}
+        if current:
+            values[":current"] = current
+        return {
+            "Update": {
+                "TableName": CATALOG_TABLE_NAME,
+                "Key": VERSION_KEY,
+                "UpdateExpression": "SET #v = :next",
+                "ConditionExpression": condition,
+                "ExpressionAttributeNames": {"#v": "version"},
+                "ExpressionAttributeValues": values
+            }
+        }
+
+
+class ManifestSnapshot:
+    """
+    DynamoDB interface for the materialized manifest document.
+    The rendered JSON is stored gzip-compressed in a single item so reads
+    are one GetItem. DynamoDB caps items at 400 KB, which holds several
+    thousand compressed manifest entries; a manifest that outgrows it is
+    stored without its body, and readers build it from the image table.
+    """
+
+    @staticmethod
+    def get() -> Optional[dict]:
+        """
+        Get the current manifest snapshot.
+
+        Returns:
+            Optional[dict]: {"version": int, "body": bytes, "layout": str} or None if never published.
+            body is None when the manifest was too large to store.
+        """
+        try:
+            response = aws.table(CATALOG_TABLE_NAME).get_item(Key=MANIFEST_KEY)
+            item = response.get("Item")
+            if not item:
+                return None
+
+            return {
+                "version": int(item["version"]),
+                "body": gzip.decompress(item["body"].value) if "body" in item else None,
+                "layout": item.get("layout")
+            }
+        except ClientError as e:
+            logger.error(f"Error getting manifest snapshot: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def save(version: int, body: bytes, layout: Optional[str] = None) -> bool:
+        """
+        Store a manifest snapshot unless a newer version is already stored.
+        A snapshot of the same version is only replaced when it was built with
+        a different category layout.
+
+        Args:
+            version: Catalog version the snapshot was built at
+            body: Rendered manifest JSON
+            layout: Fingerprint of the category configuration the body was built with
+
+        Returns:
+            bool: True if stored, False if a newer snapshot won the race
+        """
+        item = {**MANIFEST_KEY, "version": version, "layout": layout}
+        compressed = gzip.compress(body)
+        if len(compressed) <= MANIFEST_SNAPSHOT_MAX_BYTES:
+            item["body"] = compressed
+        else:
+            logger.warning(
+                f"Manifest version {version} is {len(compressed) // 1024} KB compressed, "
+                f"too large for the snapshot item; storing it without a body"
+            )
+
+        try:
+            aws.table(CATALOG_TABLE_NAME).put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(#v) OR #v < :v OR (#v = :v AND #l <> :l)",
+                ExpressionAttributeNames={"#v": "version", "#l": "layout"},
+                ExpressionAttributeValues={":v": version, ":l": layout}
+            )
+            logger.info(f"Saved manifest snapshot version {version}")
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                logger.info(f"Skipped manifest snapshot version {version}, it is already stored")
+                return False
+            logger.error(f"Error saving manifest snapshot: {e.response['Error']['Message']}")
+            raise
+
+
+class TagIndex:
+    """
+    DynamoDB interface for the tag inverted index.
+    Each (tag, image) pair is stored as pk=TAG#<tag>, sk=<image uuid> with a
+    copy of the image attributes, so a tag lookup is a single Query that
+    returns complete records.
+    """
+
+    @staticmethod
+    def _key(tag: str, image_id: str) -> dict:
+        return {"pk": f"TAG#{tag}", "sk": image_id}
+
+    @staticmethod
+    def put_actions(item: dict) -> list[dict]:
+        """
+        Build the actions that index an image under each of its tags.
+        They go in the same transaction as the image write, so the index
+        never disagrees with the images table.
+
+        Args:
+            item: Image item
+
+        Returns:
+            list[dict]: Put actions for a resource-layer transact_write_items call
+        """
+        return [
+            {"Put": {"TableName": CATALOG_TABLE_NAME, "Item": {**TagIndex._key(tag, item["uuid"]), **item}}}
+            for tag in dict.fromkeys(item.get("tags", []))
+        ]
+
+    @staticmethod
+    def delete_actions(image_id: str, tags: list[str]) -> list[dict]:
+        """
+        Build the actions that drop an image's index entries.
+
+        Args:
+            image_id: Image UUID
+            tags: Tags the image was indexed under
+
+        Returns:
+            list[dict]: Delete actions for a resource-layer transact_write_items call
+        """
+        return [
+            {"Delete": {"TableName": CATALOG_TABLE_NAME, "Key": TagIndex._key(tag, image_id)}}
+            for tag in dict.fromkeys(tags)
+        ]
+
+    @staticmethod
+    def update_actions(old_item: dict, new_item: dict) -> list[dict]:
+        """
+        Build the actions that bring the index in line with an updated image.
+        Entries for dropped tags are deleted; entries for the remaining tags
+        are rewritten so their copied attributes stay current.
+
+        Args:
+            old_item: Image item before the update
+            new_item: Image item after the update
+
+        Returns:
+            list[dict]: Put and Delete actions for a resource-layer transact_write_items call
+        """
+        dropped = [tag for tag in old_item.get("tags", []) if tag not in new_item.get("tags", [])]
+        return [*TagIndex.delete_actions(old_item["uuid"], dropped), *TagIndex.put_actions(new_item)]
+
+    @staticmethod
+    def add_images(items: list[dict]) -> None:
+        """
+        Write index entries for every tag on many images in shared batches
+        (outside a transaction: for rebuilding the index).
+
+        Args:
+            items: Image items
+        """
+        try:
+            with aws.table(CATALOG_TABLE_NAME).batch_writer(overwrite_by_pkeys=["pk", "sk"]) as batch:
+                for item in items:
+                    for tag in item.get("tags", []):
+                        batch.put_item(Item={**TagIndex._key(tag, item["uuid"]), **item})
+            logger.info(f"Indexed tags for {len(items)} images")
+        except ClientError as e:
+            logger.error(f"Error indexing tags: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def get_images(tag: str) -> list[ImageRecord]:
+        """
+        Get the images indexed under a tag.
+
+        Args:
+            tag: Tag to look up
+
+        Returns:
+            list[ImageRecord]: Image records with the tag
+        """
+        client = aws.client("dynamodb")
+        fields = projection()
+        query = {
+            "TableName": CATALOG_TABLE_NAME,
+            "KeyConditionExpression": "#pk = :pk",
+            "ExpressionAttributeValues": {":pk": {"S": f"TAG#{tag}"}},
+            "ProjectionExpression": fields["ProjectionExpression"],
+            "ExpressionAttributeNames": {**fields["ExpressionAttributeNames"], "#pk": "pk"}
+        }
+
+        try:
+            response = client.query(**query)
+            records = [ImageRecord.from_attributes(entry) for entry in response.get("Items", [])]
+
+            # Handle pagination
+            while "LastEvaluatedKey" in response:
+                response = client.query(
+                    **query,
+                    ExclusiveStartKey=response["LastEvaluatedKey"]
+                )
+                records.extend(ImageRecord.from_attributes(entry) for entry in response.get("Items", []))
+
+            return records
+        except ClientError as e:
+            logger.error(f"Error querying tag index: {e.response['Error']['Message']}")
+            raise
+
+
+class ChangeLog:
+    """
+    DynamoDB interface for the image change log, indexed by catalog version.
+    Every image write stores pk=CHANGE, sk=<zero-padded version> with a copy
+    of the image (or a tombstone for a delete) and drops the image's previous
+    entry, so the log holds one entry per image ever written. Entries are
+    written in the same transaction as the image and the version counter,
+    so once a version is readable, every change up to it is too.
+    """
+
+    @staticmethod
+    def _key(version: int) -> dict:
+        return {"pk": CHANGE_PK, "sk": f"{version:020d}"}
+
+    @staticmethod
+    def put_action(item: dict) -> dict:
+        """
+        Build the action that logs an image write.
+
+        Args:
+            item: Image item, stamped with its version and updated_at
+
+        Returns:
+            dict: Put action for a resource-layer transact_write_items call
+        """
+        return {"Put": {"TableName": CATALOG_TABLE_NAME, "Item": {**ChangeLog._key(item["version"]), **item}}}
+
+    @staticmethod
+    def tombstone_action(image_id: str, version: int, updated_at: str) -> dict:
+        """
+        Build the action that logs an image delete.
+
+        Args:
+            image_id: Deleted image UUID
+            version: Version reserved for the delete
+            updated_at: Time of the delete (ISO 8601)
+
+        Returns:
+            dict: Put action for a resource-layer transact_write_items call
+        """
+        return {
+            "Put": {
+                "TableName": CATALOG_TABLE_NAME,
+                "Item": {
+                    **ChangeLog._key(version),
+                    "uuid": image_id,
+                    "version": version,
+                    "updated_at": updated_at,
+                    "deleted": True
+                }
+            }
+        }
+
+    @staticmethod
+    def delete_action(version: int) -> dict:
+        """
+        Build the action that drops the entry of an image's previous write.
+
+        Args:
+            version: Version of the previous write
+
+        Returns:
+            dict: Delete action for a resource-layer transact_write_items call
+        """
+        return {"Delete": {"TableName": CATALOG_TABLE_NAME, "Key": ChangeLog._key(version)}}
+
+    @staticmethod
+    def get_changes(since: int, until: int) -> tuple[list[ImageRecord], list[str]]:
+        """
+        Get the images written and deleted after one version, up to another.
+
+        Args:
+            since: Version the caller is already in sync with
+            until: Last version to include (read with CatalogVersion.current)
+
+        Returns:
+            tuple[list[ImageRecord], list[str]]: Current records of images added or
+            updated, and UUIDs of images deleted, in version order
+        """
+        client = aws.client("dynamodb")
+        fields = projection((*VERSIONED_FIELDS, "deleted"))
+        query = {
+            "TableName": CATALOG_TABLE_NAME,
+            "KeyConditionExpression": "#pk = :pk AND #sk BETWEEN :from AND :to",
+            "ExpressionAttributeValues": {
+                ":pk": {"S": CHANGE_PK},
+                ":from": {"S": ChangeLog._key(since + 1)["sk"]},
+                ":to": {"S": ChangeLog._key(until)["sk"]}
+            },
+            "ProjectionExpression": fields["ProjectionExpression"],
+            "ExpressionAttributeNames": {**fields["ExpressionAttributeNames"], "#pk": "pk", "#sk": "sk"},
+            "ConsistentRead": True
+        }
+
+        # Image UUID -> latest record, None once deleted. A write that raced an
+        # update can leave an older entry behind; the later entry wins.
+        latest: dict[str, Optional[ImageRecord]] = {}
+
+        try:
+            response = client.query(**query)
+            while True:
+                for entry in response.get("Items", []):
+                    image_id = entry["uuid"]["S"]
+                    latest.pop(image_id, None)
+                    latest[image_id] = None if "deleted" in entry else ImageRecord.from_attributes(entry)
+
+                # Handle pagination
+                if "LastEvaluatedKey" not in response:
+                    break
+                response = client.query(**query, ExclusiveStartKey=response["LastEvaluatedKey"])
+        except ClientError as e:
+            logger.error(f"Error querying change log: {e.response['Error']['Message']}")
+            raise
+
+        upserts = [record for record in latest.values() if record is not None]
+        removed = [image_id for image_id, record in latest.items() if record is None]
+        logger.info(f"Read {len(upserts)} changed and {len(removed)} deleted images after version {since}")
+        return upserts, removed
+
+
+class BlobIndex:
+    """
+    DynamoDB interface for the content-addressed image files.
+    pk=BLOB#<sha256>, sk=REF counts the images that use one original (and
+    its variants), so identical uploads share a single copy in S3 and the
+    files are only deleted along with their last image. A blob whose files
+    are being deleted carries deleting_since and can't be acquired or
+    claimed until the delete is done.
+    """
+
+    @staticmethod
+    def _key(digest: str) -> dict:
+        return {"pk": f"BLOB#{digest}", "sk": "REF"}
+
+    @staticmethod
+    def acquire(digest: str) -> Optional[dict]:
+        """
+        Add a reference to stored content, if it is stored.
+
+        Args:
+            digest: Hex SHA-256 of the content
+
+        Returns:
+            Optional[dict]: {"s3_path": str, "variants": list[dict], "ready": bool} or None
+            if the content isn't stored (or is being deleted). Files of a blob that
+            isn't ready yet are still being uploaded by another request.
+        """
+        try:
+            response = aws.table(CATALOG_TABLE_NAME).update_item(
+                Key=BlobIndex._key(digest),
+                UpdateExpression="ADD #r :one",
+                ConditionExpression="attribute_exists(#pk) AND attribute_not_exists(#d)",
+                ExpressionAttributeNames={"#r": "refs", "#pk": "pk", "#d": "deleting_since"},
+                ExpressionAttributeValues={":one": 1},
+                ReturnValues="ALL_NEW"
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            logger.error(f"Error acquiring blob: {e.response['Error']['Message']}")
+            raise
+
+        blob = response["Attributes"]
+        logger.info(f"Reusing stored content {digest[:12]} ({int(blob['refs'])} references)")
+        return {
+            "s3_path": blob["s3_path"],
+            "variants": [plain_variant(variant) for variant in blob.get("variants", [])],
+            "ready": bool(blob.get("ready"))
+        }
+
+    @staticmethod
+    def claim(digest: str, s3_path: str) -> bool:
+        """
+        Register new content with one reference, before its files are uploaded.
+
+        Args:
+            digest: Hex SHA-256 of the content
+            s3_path: Content-addressed S3 key of the original
+
+        Returns:
+            bool: True if claimed, False if the content is stored or still being deleted
+        """
+        now = int(time.time())
+        try:
+            aws.table(CATALOG_TABLE_NAME).put_item(
+                Item={**BlobIndex._key(digest), "refs": 1, "s3_path": s3_path, "ready": False},
+                ConditionExpression="attribute_not_exists(#pk) OR #d < :stale",
+                ExpressionAttributeNames={"#pk": "pk", "#d": "deleting_since"},
+                ExpressionAttributeValues={":stale": now - BLOB_DELETE_TIMEOUT_SECONDS}
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            logger.error(f"Error claiming blob: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def mark_ready(digest: str, variants: list[dict]) -> None:
+        """
+        Record that a claimed blob's files are uploaded, with its variants.
+
+        Args:
+            digest: Hex SHA-256 of the content
+            variants: Variants stored for the original
+        """
+        try:
+            aws.table(CATALOG_TABLE_NAME).update_item(
+                Key=BlobIndex._key(digest),
+                UpdateExpression="SET #ready = :true, #v = :v",
+                ConditionExpression="attribute_exists(#pk)",
+                ExpressionAttributeNames={"#ready": "ready", "#v": "variants", "#pk": "pk"},
+                ExpressionAttributeValues={":true": True, ":v": variants}
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                # Every reference was released while we were uploading
+                return
+            logger.error(f"Error marking blob ready: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def release(digest: str) -> bool:
+        """
+        Drop a reference to stored content that no image record holds
+        (e.g. an upload whose record couldn't be written).
+
+        Args:
+            digest: Hex SHA-256 of the content
+
+        Returns:
+            bool: True if that was the last reference: the caller now owns the
+            delete, removes the files and then calls forget
+        """
+        try:
+            response = aws.table(CATALOG_TABLE_NAME).update_item(
+                Key=BlobIndex._key(digest),
+                UpdateExpression="ADD #r :minus_one",
+                ConditionExpression="attribute_exists(#pk)",
+                ExpressionAttributeNames={"#r": "refs", "#pk": "pk"},
+                ExpressionAttributeValues={":minus_one": -1},
+                ReturnValues="UPDATED_NEW"
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                # Untracked content, nothing else can be using it
+                return True
+            logger.error(f"Error releasing blob: {e.response['Error']['Message']}")
+            raise
+
+        if int(response["Attributes"]["refs"]) > 0:
+            return False
+        return BlobIndex.begin_delete(digest)
+
+    @staticmethod
+    def release_action(digest: str, count: int = 1) -> dict:
+        """
+        Build the action that drops the references of deleted images.
+        It goes in the same transaction as the image deletes, so a reference
+        is dropped exactly once however often the delete is retried; whoever
+        then wins begin_delete removes the files.
+
+        Args:
+            digest: Hex SHA-256 of the content
+            count: References dropped (a transaction can update the blob only once)
+
+        Returns:
+            dict: Update action for a resource-layer transact_write_items call
+        """
+        return {
+            "Update": {
+                "TableName": CATALOG_TABLE_NAME,
+                "Key": BlobIndex._key(digest),
+                "UpdateExpression": "ADD #r :released",
+                "ExpressionAttributeNames": {"#r": "refs"},
+                "ExpressionAttributeValues": {":released": -count}
+            }
+        }
+
+    @staticmethod
+    def begin_delete(digest: str) -> bool:
+        """
+        Block new references to content nothing references anymore, so its files can be deleted.
+
+        Args:
+            digest: Hex SHA-256 of the content
+
+        Returns:
+            bool: True if the caller now owns the delete: it removes the files and
+            then calls forget. False if the content was acquired again, or another
+            caller is already deleting it.
+        """
+        try:
+            aws.table(CATALOG_TABLE_NAME).update_item(
+                Key=BlobIndex._key(digest),
+                UpdateExpression="SET #d = :now",
+                ConditionExpression="#r <= :zero AND attribute_not_exists(#d)",
+                ExpressionAttributeNames={"#r": "refs", "#d": "deleting_since"},
+                ExpressionAttributeValues={":zero": 0, ":now": int(time.time())}
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            logger.error(f"Error marking blob for deletion: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def forget(digest: str) -> None:
+        """
+        Remove a blob whose files were deleted.
+
+        Args:
+            digest: Hex SHA-256 of the content
+        """
+        try:
+            aws.table(CATALOG_TABLE_NAME).delete_item(
+                Key=BlobIndex._key(digest),
+                ConditionExpression="attribute_exists(#d)",
+                ExpressionAttributeNames={"#d": "deleting_since"}
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return
+            logger.error(f"Error forgetting blob: {e.response['Error']['Message']}")
+            raise
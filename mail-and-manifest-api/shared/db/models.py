@@ -1,20 +1,207 @@
 import os
+import time
+import random
 import logging
-from typing import Optional
+import contextvars
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from typing import Callable, Iterator, Optional, TypeVar
 from uuid import uuid4
 
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
+from shared import aws
+from shared.cache import TTLCache
+from shared.executor import run_blocking
+from shared.db.catalog import BlobIndex, CatalogVersion, ChangeLog, TagIndex
+from shared.db.records import IMAGE_FIELDS, ImageRecord, projection
+from shared.s3.models import S3Storage
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # DynamoDB Table Name from environment
 TABLE_NAME = os.getenv("DYNAMODB_TABLE_NAME", "opgd-images-content")
 
-# Initialize DynamoDB resource
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME) # type: ignore
+# How long a warm worker serves the image list before rescanning the table
+IMAGE_CACHE_TTL_SECONDS = float(os.getenv("IMAGE_CACHE_TTL_SECONDS", "60"))
+
+# Number of parallel scan segments for full-catalog reads (1 = sequential scan)
+IMAGE_SCAN_SEGMENTS = int(os.getenv("IMAGE_SCAN_SEGMENTS", "1"))
+
+# Upper bound on threads used by a parallel scan
+IMAGE_SCAN_MAX_WORKERS = int(os.getenv("IMAGE_SCAN_MAX_WORKERS", "8"))
+
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_SIZE = 100
+
+# Attempts at a BatchGetItem call's unprocessed keys before giving up on them
+# (batch writes go through versioned transactions instead, see VERSIONED_WRITE_MAX_ATTEMPTS)
+BATCH_GET_MAX_ATTEMPTS = int(os.getenv("BATCH_GET_MAX_ATTEMPTS", "5"))
+
+# Actions per TransactWriteItems call (DynamoDB's limit), the version counter included
+TRANSACT_MAX_ACTIONS = 100
+
+# Most tags per image: an update's image, change log and tag index actions
+# (for the dropped and the current tags) have to fit one transaction
+MAX_IMAGE_TAGS = 30
+
+# Attempts at a versioned write that lost the version counter to another writer
+VERSIONED_WRITE_MAX_ATTEMPTS = int(os.getenv("VERSIONED_WRITE_MAX_ATTEMPTS", "8"))
+
+
+def _retry_batch(call: Callable[[T], Optional[T]], pending: T) -> Optional[T]:
+    # Call a batch operation until nothing is left unprocessed, backing off in between.
+    # `call` takes the pending work and returns the unprocessed remainder.
+    # Throttled calls are retried like unprocessed work. Returns what never got through.
+    for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(0.05 * 2 ** attempt)
+        try:
+            remainder = call(pending)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ProvisionedThroughputExceededException":
+                raise
+            logger.warning(f"Batch call throttled: {e.response['Error']['Message']}")
+            continue
+        if not remainder:
+            return None
+        pending = remainder
+    return pending
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _conflicted(error: ClientError) -> bool:
+    # Cancelled because another writer moved the version counter (or the image) first
+    if error.response["Error"]["Code"] != "TransactionCanceledException":
+        return False
+    return any(
+        reason.get("Code") in ("ConditionalCheckFailed", "TransactionConflict")
+        for reason in error.response.get("CancellationReasons", [])
+    )
+
+
+def _transact_versioned(build: Callable[[int], list[dict]], count: int = 1) -> int:
+    # Reserve `count` catalog versions and commit the writes built for them in one
+    # transaction with the counter. `build` gets the first reserved version and is
+    # called again after a conflict, so it should do its reads itself.
+    # The resource's client still converts Python types to attribute values.
+    client = aws.table(TABLE_NAME).meta.client
+    for attempt in range(VERSIONED_WRITE_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(0, 0.02 * 2 ** attempt))
+        current = CatalogVersion.current()
+        try:
+            client.transact_write_items(
+                TransactItems=[CatalogVersion.advance(current, count), *build(current + 1)]
+            )
+            return current + 1
+        except ClientError as e:
+            if not _conflicted(e) or attempt == VERSIONED_WRITE_MAX_ATTEMPTS - 1:
+                raise
+            logger.warning(f"Versioned write conflicted, retrying: {e.response['Error']['Message']}")
+    raise RuntimeError("VERSIONED_WRITE_MAX_ATTEMPTS must be at least 1")
+
+
+def _transaction_chunks(
+    records: list[ImageRecord],
+    actions: Callable[[ImageRecord], int]
+) -> Iterator[list[ImageRecord]]:
+    # Group records so each group's actions, plus the version counter, fit one transaction
+    chunk: list[ImageRecord] = []
+    used = 1
+    for record in records:
+        needed = actions(record)
+        if chunk and used + needed > TRANSACT_MAX_ACTIONS:
+            yield chunk
+            chunk, used = [], 1
+        chunk.append(record)
+        used += needed
+    if chunk:
+        yield chunk
+
+
+def _read_for_write(image_id: str) -> Optional[dict]:
+    # Strongly consistent read of the item a versioned write is about to replace
+    response = aws.table(TABLE_NAME).get_item(Key={"uuid": image_id}, ConsistentRead=True)
+    return response.get("Item")
+
+
+def _unchanged_since(old_item: dict) -> tuple[str, dict, dict]:
+    # Condition that the image still exists and is the one read: same version,
+    # or still unversioned (written before the change log)
+    if "version" not in old_item:
+        return "attribute_exists(#id) AND attribute_not_exists(#ver)", {"#id": "uuid", "#ver": "version"}, {}
+    return "#ver = :old_ver", {"#ver": "version"}, {":old_ver": old_item["version"]}
+
+
+def _create_action(item: dict) -> dict:
+    # Put of a new image that never replaces one with the same UUID
+    return {
+        "Put": {
+            "TableName": TABLE_NAME,
+            "Item": item,
+            "ConditionExpression": "attribute_not_exists(#id)",
+            "ExpressionAttributeNames": {"#id": "uuid"}
+        }
+    }
+
+
+def _read_many_for_write(image_ids: list[str]) -> dict[str, dict]:
+    # Strongly consistent BatchGetItem of the items a versioned write is about to
+    # replace, by UUID. Missing items (and keys never processed) are left out.
+    client = aws.table(TABLE_NAME).meta.client
+    items: dict[str, dict] = {}
+
+    def read(keys: dict) -> Optional[dict]:
+        response = client.batch_get_item(RequestItems={TABLE_NAME: keys})
+        items.update((item["uuid"], item) for item in response.get("Responses", {}).get(TABLE_NAME, []))
+        return response.get("UnprocessedKeys", {}).get(TABLE_NAME)
+
+    for start in range(0, len(image_ids), BATCH_GET_SIZE):
+        keys = [{"uuid": image_id} for image_id in image_ids[start:start + BATCH_GET_SIZE]]
+        _retry_batch(read, {"Keys": keys, "ConsistentRead": True})
+    return items
+
+
+def _delete_actions(old_item: dict, version: int, updated_at: str) -> list[dict]:
+    # Delete of an image that still is the one read, its tombstone, tag index
+    # entries and previous change log entry
+    image_id = old_item["uuid"]
+    condition, names, values = _unchanged_since(old_item)
+    delete = {"TableName": TABLE_NAME, "Key": {"uuid": image_id}, "ConditionExpression": condition,
+              "ExpressionAttributeNames": names}
+    if values:
+        delete["ExpressionAttributeValues"] = values
+
+    actions = [
+        {"Delete": delete},
+        ChangeLog.tombstone_action(image_id, version, updated_at),
+        *TagIndex.delete_actions(image_id, old_item.get("tags", []))
+    ]
+    if "version" in old_item:
+        actions.append(ChangeLog.delete_action(int(old_item["version"])))
+    return actions
+
+
+def _release_actions(s3_paths: list[str]) -> list[dict]:
+    # Drop the deleted images' references to their content-addressed files,
+    # one action per blob (files stored before content addressing aren't counted)
+    digests = Counter(S3Storage.content_digest(s3_path) for s3_path in s3_paths)
+    return [BlobIndex.release_action(digest, count) for digest, count in digests.items() if digest]
+
+
+class ImageNotFoundError(Exception):
+    """The image an update or delete targets doesn't exist (or was deleted meanwhile)"""
+
+
+class ImageExistsError(Exception):
+    """An image with the UUID a create reserved was already created"""
 
 
 class ImageItem:
@@ -24,8 +211,10 @@ class ImageItem:
     def create_image(
         s3_path: str,
         description: str,
-        tags: list[str]
-    ) -> dict:
+        tags: list[str],
+        image_id: Optional[str] = None,
+        variants: Optional[list[dict]] = None
+    ) -> ImageRecord:
         """
         Create a new image record in DynamoDB.
 
@@ -33,106 +222,376 @@ class ImageItem:
             s3_path: S3 object path
             description: Image description
             tags: List of tags for categorization
+            image_id: UUID reserved for the image (default: new UUID)
+            variants: Resized variants ({"width", "height", "format", "s3_path"}) (optional)
 
         Returns:
-            dict: Created image item
-        """
-        image_id = str(uuid4())
+            ImageRecord: Created image
 
-        item = {
-            "uuid": image_id,
-            "s3_path": s3_path,
-            "description": description,
-            "tags": tags
-        }
+        Raises:
+            ImageExistsError: An image with image_id already exists
+        """
+        record = ImageItem.new_item(s3_path, description, tags, image_id, variants)
+
+        def build(version: int) -> list[dict]:
+            # A reserved UUID can be finalized twice, the second create must not overwrite the first
+            if image_id is not None and _read_for_write(image_id) is not None:
+                raise ImageExistsError(image_id)
+            record.version = version
+            record.updated_at = _now()
+            item = record.to_item()
+            return [
+                _create_action(item),
+                ChangeLog.put_action(item),
+                *TagIndex.put_actions(item)
+            ]
 
         try:
-            table.put_item(Item=item)
-            logger.info(f"Created image record: {image_id}")
-            return item
+            _transact_versioned(build)
+            logger.info(f"Created image record: {record.uuid} (version {record.version})")
+            _all_images_cache.invalidate()
+            return record
         except ClientError as e:
             logger.error(f"Error creating image: {e.response['Error']['Message']}")
             raise
 
     @staticmethod
-    def get_image(image_id: str) -> Optional[dict]:
+    def new_item(
+        s3_path: str,
+        description: str,
+        tags: list[str],
+        image_id: Optional[str] = None,
+        variants: Optional[list[dict]] = None
+    ) -> ImageRecord:
+        """
+        Build an image record without writing it.
+
+        Args:
+            s3_path: S3 object path
+            description: Image description
+            tags: List of tags for categorization
+            image_id: UUID reserved for the image (default: new UUID)
+            variants: Resized variants (optional)
+
+        Returns:
+            ImageRecord: Image record
+        """
+        return ImageRecord(
+            uuid=image_id or str(uuid4()),
+            s3_path=s3_path,
+            description=description,
+            tags=tags,
+            variants=variants or []
+        )
+
+    @staticmethod
+    def create_images(records: list[ImageRecord]) -> list[ImageRecord]:
+        """
+        Create many image records, as many per transaction as its action limit allows.
+        Each transaction is retried when it loses the version counter to
+        another writer; a transaction that fails fails all of its records.
+
+        Args:
+            records: Image records built with new_item
+
+        Returns:
+            list[ImageRecord]: Records that could not be written
+        """
+        written: list[ImageRecord] = []
+        failed: list[ImageRecord] = []
+
+        # Image, change log entry and one tag index entry per tag
+        for chunk in _transaction_chunks(records, lambda record: 2 + len(set(record.tags))):
+
+            def build(first_version: int, chunk: list[ImageRecord] = chunk) -> list[dict]:
+                updated_at = _now()
+                actions = []
+                for offset, record in enumerate(chunk):
+                    record.version = first_version + offset
+                    record.updated_at = updated_at
+                    item = record.to_item()
+                    actions.append(_create_action(item))
+                    actions.append(ChangeLog.put_action(item))
+                    actions.extend(TagIndex.put_actions(item))
+                return actions
+
+            try:
+                _transact_versioned(build, len(chunk))
+                written.extend(chunk)
+            except ClientError as e:
+                logger.error(f"Error creating images: {e.response['Error']['Message']}")
+                failed.extend(chunk)
+
+        logger.info(f"Created {len(written)} image records, {len(failed)} failed")
+
+        if written:
+            _all_images_cache.invalidate()
+        return failed
+
+    @staticmethod
+    def get_image(image_id: str, fields: tuple[str, ...] = IMAGE_FIELDS) -> Optional[ImageRecord]:
         """
         Get an image record by UUID.
 
         Args:
             image_id: Image UUID
+            fields: Attributes to read (default: all image fields)
 
         Returns:
-            Optional[dict]: Image item or None if not found
+            Optional[ImageRecord]: Image record or None if not found
         """
         try:
-            response = table.get_item(Key={"uuid": image_id})
-            return response.get("Item")
+            response = aws.client("dynamodb").get_item(
+                TableName=TABLE_NAME,
+                Key={"uuid": {"S": image_id}},
+                **projection(fields)
+            )
+            item = response.get("Item")
+            return ImageRecord.from_attributes(item) if item else None
         except ClientError as e:
             logger.error(f"Error getting image: {e.response['Error']['Message']}")
             raise
 
     @staticmethod
-    def get_all_images() -> list[dict]:
+    def get_images(image_ids: list[str], fields: tuple[str, ...] = IMAGE_FIELDS) -> list[ImageRecord]:
+        """
+        Get many image records by UUID with BatchGetItem.
+        Unprocessed keys are retried with exponential backoff.
+
+        Args:
+            image_ids: Image UUIDs
+            fields: Attributes to read (default: all image fields)
+
+        Returns:
+            list[ImageRecord]: Image records that exist, in no particular order
+        """
+        client = aws.client("dynamodb")
+        unique_ids = list(dict.fromkeys(image_ids))
+        records = []
+
+        def read(keys: dict) -> Optional[dict]:
+            response = client.batch_get_item(RequestItems={TABLE_NAME: keys})
+            records.extend(
+                ImageRecord.from_attributes(item)
+                for item in response.get("Responses", {}).get(TABLE_NAME, [])
+            )
+            # Unprocessed keys come back with the projection attached
+            return response.get("UnprocessedKeys", {}).get(TABLE_NAME)
+
+        try:
+            for start in range(0, len(unique_ids), BATCH_GET_SIZE):
+                keys = [{"uuid": {"S": image_id}} for image_id in unique_ids[start:start + BATCH_GET_SIZE]]
+                if _retry_batch(read, {"Keys": keys, **projection(fields)}):
+                    raise RuntimeError("BatchGetItem left keys unprocessed")
+
+            logger.info(f"Retrieved {len(records)} of {len(unique_ids)} requested images")
+            return records
+        except ClientError as e:
+            logger.error(f"Error batch getting images: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def get_all_images() -> list[ImageRecord]:
         """
-        Get all image records.
+        Get all image records from the in-process cache.
+        The cache is refreshed after IMAGE_CACHE_TTL_SECONDS and dropped on every write.
+        Callers must not mutate the returned records.
 
         Returns:
-            list[dict]: List of all image items
+            list[ImageRecord]: List of all image records
         """
+        return _all_images_cache.get()
+
+    @staticmethod
+    def scan_all_images(
+        consistent_read: bool = False,
+        segments: Optional[int] = None,
+        fields: tuple[str, ...] = IMAGE_FIELDS
+    ) -> list[ImageRecord]:
+        """
+        Get all image records straight from DynamoDB, bypassing the cache.
+        Reads only the image fields through the low-level client, so items are
+        never built as resource-layer dicts full of Decimals.
+
+        Args:
+            consistent_read: Use a strongly consistent scan (default: False)
+            segments: Parallel scan segments (default: IMAGE_SCAN_SEGMENTS)
+            fields: Attributes to read (default: every image field)
+
+        Returns:
+            list[ImageRecord]: List of all image records
+        """
+        segments = segments or IMAGE_SCAN_SEGMENTS
+        if segments > 1:
+            return ImageItem.parallel_scan_all_images(segments, consistent_read, fields)
+
+        client = aws.client("dynamodb")
+        scan_kwargs = {"TableName": TABLE_NAME, "ConsistentRead": consistent_read, **projection(fields)}
+
         try:
-            response = table.scan()
-            items = response.get("Items", [])
+            response = client.scan(**scan_kwargs)
+            records = [ImageRecord.from_attributes(item) for item in response.get("Items", [])]
 
             # Handle pagination
             while "LastEvaluatedKey" in response:
-                response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-                items.extend(response.get("Items", []))
+                response = client.scan(**scan_kwargs, ExclusiveStartKey=response["LastEvaluatedKey"])
+                records.extend(ImageRecord.from_attributes(item) for item in response.get("Items", []))
 
-            logger.info(f"Retrieved {len(items)} images")
-            return items
+            logger.info(f"Retrieved {len(records)} images")
+            return records
         except ClientError as e:
             logger.error(f"Error scanning images: {e.response['Error']['Message']}")
             raise
 
     @staticmethod
-    def get_images_by_tag(tag: str) -> list[dict]:
+    def parallel_scan_all_images(
+        segments: int,
+        consistent_read: bool = False,
+        fields: tuple[str, ...] = IMAGE_FIELDS
+    ) -> list[ImageRecord]:
         """
-        Get images by a specific tag.
+        Get all image records with a parallel segmented scan.
+        Segments are read concurrently on a bounded thread pool and merged in
+        segment order, so the result order is deterministic for a given table.
 
         Args:
-            tag: Tag to filter by
+            segments: Number of scan segments (TotalSegments)
+            consistent_read: Use a strongly consistent scan (default: False)
+            fields: Attributes to read (default: every image field)
 
         Returns:
-            list[dict]: List of image items with the specified tag
+            list[ImageRecord]: List of all image records
         """
-        try:
-            response = table.scan(
-                FilterExpression=Attr("tags").contains(tag)
-            )
-            items = response.get("Items", [])
+        # Clients are thread-safe, resources aren't
+        client = aws.client("dynamodb")
+
+        def scan_segment(segment: int) -> list[ImageRecord]:
+            scan_kwargs = {
+                "TableName": TABLE_NAME,
+                "Segment": segment,
+                "TotalSegments": segments,
+                "ConsistentRead": consistent_read,
+                **projection(fields)
+            }
+            response = client.scan(**scan_kwargs)
+            segment_records = [ImageRecord.from_attributes(item) for item in response.get("Items", [])]
 
             # Handle pagination
             while "LastEvaluatedKey" in response:
-                response = table.scan(
-                    ExclusiveStartKey=response["LastEvaluatedKey"],
-                    FilterExpression=Attr("tags").contains(tag)
+                response = client.scan(
+                    **scan_kwargs,
+                    ExclusiveStartKey=response["LastEvaluatedKey"]
                 )
-                items.extend(response.get("Items", []))
+                segment_records.extend(ImageRecord.from_attributes(item) for item in response.get("Items", []))
+            return segment_records
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(segments, IMAGE_SCAN_MAX_WORKERS),
+                thread_name_prefix="image-scan"
+            ) as executor:
+                # Each segment thread gets a copy of the caller's context, so its
+                # calls are still attributed to the request being timed
+                contexts = [contextvars.copy_context() for _ in range(segments)]
+                records = [
+                    record
+                    for segment_records in executor.map(
+                        lambda segment: contexts[segment].run(scan_segment, segment),
+                        range(segments)
+                    )
+                    for record in segment_records
+                ]
+
+            logger.info(f"Retrieved {len(records)} images across {segments} scan segments")
+            return records
+        except ClientError as e:
+            logger.error(f"Error scanning images: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def get_images_page(
+        limit: int,
+        start_key: Optional[dict] = None
+    ) -> tuple[list[ImageRecord], Optional[dict]]:
+        """
+        Get one page of image records.
+
+        Args:
+            limit: Maximum number of items to read
+            start_key: Key to resume from, {"uuid": str} (optional)
+
+        Returns:
+            tuple[list[ImageRecord], Optional[dict]]: Image records and the key to resume from, if any
+        """
+        scan_kwargs: dict = {"TableName": TABLE_NAME, "Limit": limit, **projection()}
+        if start_key:
+            scan_kwargs["ExclusiveStartKey"] = {"uuid": {"S": start_key["uuid"]}}
 
-            logger.info(f"Retrieved {len(items)} images with tag '{tag}'")
-            return items
+        try:
+            response = aws.client("dynamodb").scan(**scan_kwargs)
+            records = [ImageRecord.from_attributes(item) for item in response.get("Items", [])]
+            logger.info(f"Retrieved page of {len(records)} images")
+
+            last_key = response.get("LastEvaluatedKey")
+            return records, {"uuid": last_key["uuid"]["S"]} if last_key else None
         except ClientError as e:
-            logger.error(f"Error querying images by tag: {e.response['Error']['Message']}")
+            logger.error(f"Error scanning images: {e.response['Error']['Message']}")
             raise
 
+    @staticmethod
+    def iter_image_pages(page_size: Optional[int] = None) -> Iterator[list[ImageRecord]]:
+        """
+        Yield image records page by page as the scan proceeds.
+
+        Args:
+            page_size: Items per scan page (optional, DynamoDB's 1 MB page by default)
+
+        Yields:
+            list[ImageRecord]: One page of image records
+        """
+        client = aws.client("dynamodb")
+        scan_kwargs: dict = {"TableName": TABLE_NAME, **projection()}
+        if page_size:
+            scan_kwargs["Limit"] = page_size
+
+        try:
+            response = client.scan(**scan_kwargs)
+            yield [ImageRecord.from_attributes(item) for item in response.get("Items", [])]
+
+            # Handle pagination
+            while "LastEvaluatedKey" in response:
+                response = client.scan(
+                    **scan_kwargs,
+                    ExclusiveStartKey=response["LastEvaluatedKey"]
+                )
+                yield [ImageRecord.from_attributes(item) for item in response.get("Items", [])]
+        except ClientError as e:
+            logger.error(f"Error scanning images: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def get_images_by_tag(tag: str) -> list[ImageRecord]:
+        """
+        Get images by a specific tag.
+        Reads the tag index with a Query, so the cost scales with the result, not the table.
+
+        Args:
+            tag: Tag to filter by
+
+        Returns:
+            list[ImageRecord]: List of image records with the specified tag
+        """
+        records = TagIndex.get_images(tag)
+        logger.info(f"Retrieved {len(records)} images with tag '{tag}'")
+        return records
+
     @staticmethod
     def update_image(
         image_id: str,
         s3_path: Optional[str] = None,
         description: Optional[str] = None,
         tags: Optional[list[str]] = None
-    ) -> dict:
+    ) -> ImageRecord:
         """
         Update an image record.
 
@@ -143,60 +602,257 @@ class ImageItem:
             tags: New tags list (optional)
 
         Returns:
-            dict: Updated image item
+            ImageRecord: Updated image
+
+        Raises:
+            ImageNotFoundError: The image doesn't exist
         """
         update_expression = []
         expression_values = {}
         expression_names = {}
+        changes = {}
 
         if s3_path is not None:
             update_expression.append("#s = :s")
             expression_values[":s"] = s3_path
             expression_names["#s"] = "s3_path"
+            changes["s3_path"] = s3_path
 
         if description is not None:
             update_expression.append("#d = :d")
             expression_values[":d"] = description
             expression_names["#d"] = "description"
+            changes["description"] = description
 
         if tags is not None:
             update_expression.append("#t = :t")
             expression_values[":t"] = tags
             expression_names["#t"] = "tags"
+            changes["tags"] = tags
 
         if not update_expression:
             logger.warning(f"No fields to update for image {image_id}")
             return ImageItem.get_image(image_id)
 
+        old_item: dict = {}
+        new_item: dict = {}
+
+        def build(version: int) -> list[dict]:
+            nonlocal old_item, new_item
+            current = _read_for_write(image_id)
+            if current is None:
+                # Deleted since the route checked: never recreate a partial item
+                raise ImageNotFoundError(image_id)
+            condition, names, values = _unchanged_since(current)
+            old_item = current
+            updated_at = _now()
+            new_item = {**old_item, **changes, "version": version, "updated_at": updated_at}
+
+            actions = [
+                {
+                    "Update": {
+                        "TableName": TABLE_NAME,
+                        "Key": {"uuid": image_id},
+                        "UpdateExpression": "SET " + ", ".join([*update_expression, "#ver = :ver", "#at = :at"]),
+                        "ConditionExpression": condition,
+                        "ExpressionAttributeNames": {**expression_names, **names, "#ver": "version", "#at": "updated_at"},
+                        "ExpressionAttributeValues": {**expression_values, **values, ":ver": version, ":at": updated_at}
+                    }
+                },
+                ChangeLog.put_action(new_item),
+                *TagIndex.update_actions(old_item, new_item)
+            ]
+            if "version" in old_item:
+                actions.append(ChangeLog.delete_action(int(old_item["version"])))
+            return actions
+
         try:
-            response = table.update_item(
-                Key={"uuid": image_id},
-                UpdateExpression="SET " + ", ".join(update_expression),
-                ExpressionAttributeValues=expression_values,
-                ExpressionAttributeNames=expression_names,
-                ReturnValues="ALL_NEW"
-            )
-            logger.info(f"Updated image record: {image_id}")
-            return response["Attributes"]
+            # Read, update, log and index in one transaction, retried if the image changed in between
+            version = _transact_versioned(build)
+            logger.info(f"Updated image record: {image_id} (version {version})")
+            _all_images_cache.invalidate()
+            return ImageRecord.from_item(new_item)
         except ClientError as e:
             logger.error(f"Error updating image: {e.response['Error']['Message']}")
             raise
 
     @staticmethod
-    def delete_image(image_id: str) -> bool:
+    def delete_image(image_id: str) -> ImageRecord:
         """
-        Delete an image record.
+        Delete an image record, leaving a tombstone in the change log and
+        dropping its reference to its files in the same transaction.
 
         Args:
             image_id: Image UUID
 
         Returns:
-            bool: True if deleted successfully
+            ImageRecord: The deleted image, whose files the caller cleans up
+
+        Raises:
+            ImageNotFoundError: The image doesn't exist
         """
+        old_item: dict = {}
+
+        def build(version: int) -> list[dict]:
+            nonlocal old_item
+            old_item = _read_for_write(image_id)
+            if old_item is None:
+                raise ImageNotFoundError(image_id)
+            return [*_delete_actions(old_item, version, _now()), *_release_actions([old_item["s3_path"]])]
+
         try:
-            table.delete_item(Key={"uuid": image_id})
-            logger.info(f"Deleted image record: {image_id}")
-            return True
+            version = _transact_versioned(build)
+            logger.info(f"Deleted image record: {image_id} (version {version})")
+            _all_images_cache.invalidate()
+            return ImageRecord.from_item(old_item)
         except ClientError as e:
             logger.error(f"Error deleting image: {e.response['Error']['Message']}")
             raise
+
+    @staticmethod
+    def delete_images(records: list[ImageRecord]) -> list[str]:
+        """
+        Delete many image records, as many per transaction as its action limit
+        allows, leaving a tombstone in the change log for each and dropping
+        their references to their files in the same transaction.
+        Each transaction re-reads its records and only deletes those still at
+        the version they were read with; the rest fail.
+
+        Args:
+            records: Image records to delete, read with their s3_path, version and tags
+                     (their tag index entries are deleted in the same transaction)
+
+        Returns:
+            list[str]: UUIDs of the records that could not be deleted (including
+            those changed or deleted by someone else since they were read)
+        """
+        deleted: list[ImageRecord] = []
+        failed_ids: list[str] = []
+
+        # Image, tombstone, previous change log entry, one tag index entry per tag
+        # and (at most) one reference to its files
+        def action_count(record: ImageRecord) -> int:
+            return 3 + (1 if record.version else 0) + len(set(record.tags))
+
+        for chunk in _transaction_chunks(records, action_count):
+            changed: set[str] = set()
+
+            def build(
+                first_version: int,
+                chunk: list[ImageRecord] = chunk,
+                changed: set[str] = changed
+            ) -> list[dict]:
+                # Records that moved on since they were read have other tags and change
+                # log entries than the ones counted for this chunk, leave them be
+                current = _read_many_for_write([record.uuid for record in chunk])
+                changed.clear()
+                changed.update(
+                    record.uuid for record in chunk
+                    if record.uuid not in current or int(current[record.uuid].get("version", 0)) != record.version
+                )
+                unchanged = [current[record.uuid] for record in chunk if record.uuid not in changed]
+                if not unchanged:
+                    raise ImageNotFoundError(", ".join(changed))
+
+                updated_at = _now()
+                actions = []
+                for offset, item in enumerate(unchanged):
+                    actions.extend(_delete_actions(item, first_version + offset, updated_at))
+                actions.extend(_release_actions([item["s3_path"] for item in unchanged]))
+                return actions
+
+            try:
+                _transact_versioned(build, len(chunk))
+            except ImageNotFoundError:
+                # Every record of the chunk changed, nothing was written
+                pass
+            except ClientError as e:
+                logger.error(f"Error deleting images: {e.response['Error']['Message']}")
+                failed_ids.extend(record.uuid for record in chunk)
+                continue
+
+            if changed:
+                logger.warning(f"Not deleting {len(changed)} images changed since they were read")
+            failed_ids.extend(record.uuid for record in chunk if record.uuid in changed)
+            deleted.extend(record for record in chunk if record.uuid not in changed)
+
+        logger.info(f"Deleted {len(deleted)} image records, {len(failed_ids)} failed")
+
+        if deleted:
+            _all_images_cache.invalidate()
+        return failed_ids
+
+
+class AsyncImageItem:
+    """Async variant of ImageItem, each call runs on the AWS I/O executor"""
+
+    @staticmethod
+    async def create_image(
+        s3_path: str,
+        description: str,
+        tags: list[str],
+        image_id: Optional[str] = None,
+        variants: Optional[list[dict]] = None
+    ) -> ImageRecord:
+        return await run_blocking(
+            ImageItem.create_image, s3_path, description, tags, image_id, variants
+        )
+
+    @staticmethod
+    async def create_images(records: list[ImageRecord]) -> list[ImageRecord]:
+        return await run_blocking(ImageItem.create_images, records)
+
+    @staticmethod
+    async def get_image(image_id: str, fields: tuple[str, ...] = IMAGE_FIELDS) -> Optional[ImageRecord]:
+        return await run_blocking(ImageItem.get_image, image_id, fields)
+
+    @staticmethod
+    async def get_images(image_ids: list[str], fields: tuple[str, ...] = IMAGE_FIELDS) -> list[ImageRecord]:
+        return await run_blocking(ImageItem.get_images, image_ids, fields)
+
+    @staticmethod
+    async def get_all_images() -> list[ImageRecord]:
+        return await run_blocking(ImageItem.get_all_images)
+
+    @staticmethod
+    async def scan_all_images(
+        consistent_read: bool = False,
+        segments: Optional[int] = None,
+        fields: tuple[str, ...] = IMAGE_FIELDS
+    ) -> list[ImageRecord]:
+        return await run_blocking(ImageItem.scan_all_images, consistent_read, segments, fields)
+
+    @staticmethod
+    async def get_images_page(
+        limit: int,
+        start_key: Optional[dict] = None
+    ) -> tuple[list[ImageRecord], Optional[dict]]:
+        return await run_blocking(ImageItem.get_images_page, limit, start_key)
+
+    @staticmethod
+    async def get_images_by_tag(tag: str) -> list[ImageRecord]:
+        return await run_blocking(ImageItem.get_images_by_tag, tag)
+
+    @staticmethod
+    async def update_image(
+        image_id: str,
+        s3_path: Optional[str] = None,
+        description: Optional[str] = None,
+        tags: Optional[list[str]] = None
+    ) -> ImageRecord:
+        return await run_blocking(ImageItem.update_image, image_id, s3_path, description, tags)
+
+    @staticmethod
+    async def delete_image(image_id: str) -> ImageRecord:
+        return await run_blocking(ImageItem.delete_image, image_id)
+
+    @staticmethod
+    async def delete_images(records: list[ImageRecord]) -> list[str]:
+        return await run_blocking(ImageItem.delete_images, records)
+
+
+_all_images_cache: TTLCache[list[ImageRecord]] = TTLCache(
+    "all_images",
+    loader=ImageItem.scan_all_images,
+    ttl=IMAGE_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+
+# Attributes of an image record, in the order they are projected
+IMAGE_FIELDS = ("uuid", "s3_path", "description", "tags", "variants")
+
+# Image fields plus the catalog version and time of the image's last write
+VERSIONED_FIELDS = (*IMAGE_FIELDS, "version", "updated_at")
+
+
+def projection(fields: tuple[str, ...] = IMAGE_FIELDS) -> dict:
+    """
+    Build the ProjectionExpression arguments that read only some attributes.
+
+    Args:
+        fields: Attribute names to read (default: every image field)
+
+    Returns:
+        dict: ProjectionExpression and ExpressionAttributeNames, ready to splat into a read
+    """
+    # Placeholders keep attribute names clear of DynamoDB's reserved words
+    names = {f"#f{index}": name for index, name in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names
+    }
+
+
+def _tags(attribute: dict) -> list[str]:
+    # Written as a list (L), but accept a string set (SS) too
+    if "L" in attribute:
+        return [tag["S"] for tag in attribute["L"]]
+    return list(attribute.get("SS", []))
+
+
+def _variant(attributes: dict) -> dict:
+    # One variant map, sizes as int rather than Decimal
+    return {
+        "width": int(attributes["width"]["N"]),
+        "height": int(attributes["height"]["N"]),
+        "format": attributes["format"]["S"],
+        "s3_path": attributes["s3_path"]["S"]
+    }
+
+
+def plain_variant(variant: dict) -> dict:
+    # Variants read through the resource layer carry Decimal sizes
+    return {**variant, "width": int(variant["width"]), "height": int(variant["height"])}
+
+
+@dataclass(slots=True)
+class ImageRecord:
+    """
+    One image as read from the images table (or the tag index).
+    Holds only the projected attributes, already converted to plain Python
+    types. Records may be shared through the caches, so don't mutate them.
+    """
+
+    uuid: str
+    s3_path: str = ""
+    description: str = ""
+    tags: list[str] = field(default_factory=list)
+    variants: list[dict] = field(default_factory=list)
+    # Catalog version of the last write (0 when not read, or written before versioning)
+    version: int = 0
+    updated_at: str = ""
+
+    @classmethod
+    def from_attributes(cls, attributes: dict) -> "ImageRecord":
+        """
+        Build a record from a low-level client item ({"S": ...} attribute values).
+
+        Args:
+            attributes: Item as returned by the DynamoDB client
+
+        Returns:
+            ImageRecord
+        """
+        tags = attributes.get("tags")
+        variants = attributes.get("variants")
+        version = attributes.get("version")
+        return cls(
+            uuid=attributes["uuid"]["S"],
+            s3_path=attributes.get("s3_path", {}).get("S", ""),
+            description=attributes.get("description", {}).get("S", ""),
+            tags=_tags(tags) if tags else [],
+            variants=[_variant(variant["M"]) for variant in variants["L"]] if variants else [],
+            version=int(version["N"]) if version else 0,
+            updated_at=attributes.get("updated_at", {}).get("S", "")
+        )
+
+    @classmethod
+    def from_item(cls, item: dict) -> "ImageRecord":
+        """
+        Build a record from a Python item (as written, or read through boto3's resource layer).
+
+        Args:
+            item: Image item
+
+        Returns:
+            ImageRecord
+        """
+        return cls(
+            uuid=item["uuid"],
+            s3_path=item.get("s3_path", ""),
+            description=item.get("description", ""),
+            tags=list(item.get("tags", [])),
+            variants=[plain_variant(variant) for variant in item.get("variants", [])],
+            version=int(item.get("version", 0)),
+            updated_at=item.get("updated_at", "")
+        )
+
+    def to_item(self) -> dict:
+        """
+        Convert the record to the item written to DynamoDB.
+
+        Returns:
+            dict: Image item (variants and version only when there are any)
+        """
+        item = {
+            "uuid": self.uuid,
+            "s3_path": self.s3_path,
+            "description": self.description,
+            "tags": self.tags
+        }
+        if self.variants:
+            item["variants"] = self.variants
+        if self.version:
+            item["version"] = self.version
+            item["updated_at"] = self.updated_at
+        return item
+
+    def s3_paths(self) -> list[str]:
+        """
+        S3 keys of the original and every variant.
+
+        Returns:
+            list[str]: Object keys
+        """
+        return [self.s3_path, *[variant["s3_path"] for variant in self.variants]]
+
@@ -0,0 +1,140 @@
+import os
+import time
+import hashlib
+import logging
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from shared import aws
+from shared.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB table holding contact submission de-duplication records
+CONTACT_TABLE_NAME = os.getenv("CONTACT_TABLE_NAME", "opgd-contact-submissions")
+
+# How long a submission is remembered; repeats inside the window are answered from the record
+CONTACT_DEDUPE_WINDOW_SECONDS = int(os.getenv("CONTACT_DEDUPE_WINDOW_SECONDS", "86400"))
+
+# Form fields that make two submissions the same when no Idempotency-Key is sent
+SUBMISSION_FIELDS = ("full_name", "email", "phone", "service", "message")
+
+
+def submission_key(contact: dict, idempotency_key: Optional[str] = None) -> str:
+    """
+    Derive the de-duplication key of a contact submission.
+    A client-sent Idempotency-Key is scoped to the sender's email. Without
+    one, the form content itself is the key, so a double-clicked or
+    replayed form is caught either way.
+
+    Args:
+        contact: ContactRequest fields
+        idempotency_key: Idempotency-Key header (optional)
+
+    Returns:
+        str: Hex SHA-256 key (the record never holds the form content)
+    """
+    email = str(contact.get("email") or "").strip().lower()
+    if idempotency_key:
+        material = ["key", email, idempotency_key.strip()]
+    else:
+        material = ["form", email, *(str(contact.get(name) or "").strip() for name in SUBMISSION_FIELDS)]
+    return hashlib.sha256("\n".join(material).encode()).hexdigest()
+
+
+class ContactSubmission:
+    """
+    DynamoDB interface for contact submission de-duplication records.
+    A submission is claimed with a conditional put before it is queued, so
+    only the first of several identical requests reaches SES. Records
+    expire through the table's TTL on expires_at.
+    """
+
+    @staticmethod
+    def claim(key: str) -> Optional[dict]:
+        """
+        Claim a submission key unless an unexpired record already holds it.
+
+        Args:
+            key: Key from submission_key
+
+        Returns:
+            Optional[dict]: None if claimed, otherwise the existing record
+            (with the original message_id once it was queued)
+        """
+        now = int(time.time())
+        table = aws.table(CONTACT_TABLE_NAME)
+
+        try:
+            table.put_item(
+                Item={
+                    "submission_key": key,
+                    "created_at": now,
+                    "expires_at": now + CONTACT_DEDUPE_WINDOW_SECONDS
+                },
+                # TTL deletes lag behind expiry, so an expired record counts as absent
+                ConditionExpression="attribute_not_exists(#k) OR #e < :now",
+                ExpressionAttributeNames={"#k": "submission_key", "#e": "expires_at"},
+                ExpressionAttributeValues={":now": now}
+            )
+            return None
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                logger.error(f"Error claiming contact submission: {e.response['Error']['Message']}")
+                raise
+
+        logger.info(f"Duplicate contact submission {key[:12]}")
+        try:
+            response = table.get_item(Key={"submission_key": key}, ConsistentRead=True)
+            return response.get("Item", {"submission_key": key})
+        except ClientError as e:
+            logger.error(f"Error reading contact submission: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def record_message(key: str, message_id: str) -> None:
+        """
+        Store the message ID of a queued submission, so duplicates can return it.
+
+        Args:
+            key: Claimed submission key
+            message_id: Outbox (or SES) message ID
+        """
+        try:
+            aws.table(CONTACT_TABLE_NAME).update_item(
+                Key={"submission_key": key},
+                UpdateExpression="SET #m = :m",
+                ExpressionAttributeNames={"#m": "message_id"},
+                ExpressionAttributeValues={":m": message_id}
+            )
+        except ClientError as e:
+            logger.error(f"Error recording contact submission: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def release(key: str) -> None:
+        """
+        Drop a claim whose submission could not be queued or sent,
+        so the visitor's retry isn't taken for a duplicate.
+
+        Args:
+            key: Claimed submission key
+        """
+        try:
+            aws.table(CONTACT_TABLE_NAME).delete_item(Key={"submission_key": key})
+        except ClientError as e:
+            logger.error(f"Error releasing contact submission: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    async def claim_async(key: str) -> Optional[dict]:
+        return await run_blocking(ContactSubmission.claim, key)
+
+    @staticmethod
+    async def record_message_async(key: str, message_id: str) -> None:
+        await run_blocking(ContactSubmission.record_message, key, message_id)
+
+    @staticmethod
+    async def release_async(key: str) -> None:
+        await run_blocking(ContactSubmission.release, key)
@@ -0,0 +1,201 @@
+import io
+import os
+import asyncio
+import logging
+import posixpath
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Optional, Union
+
+from shared.executor import run_blocking
+from shared.s3.models import AsyncS3Storage
+
+logger = logging.getLogger(__name__)
+
+# Widths (px) generated for every uploaded image, never upscaled
+VARIANT_WIDTHS = sorted(
+    int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1024,1600").split(",")
+)
+
+# Output formats in order of preference (webp, jpeg, avif)
+VARIANT_FORMATS = [
+    fmt.strip().lower() for fmt in os.getenv("IMAGE_VARIANT_FORMATS", "webp,jpeg").split(",")
+]
+
+# Encoder quality for lossy formats
+VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+
+# Worker processes for resizing (Lambda has no /dev/shm, so this falls back to threads)
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "avif": "image/avif"
+}
+
+EXTENSIONS = {
+    "webp": "webp",
+    "jpeg": "jpg",
+    "avif": "avif"
+}
+
+_executor: Optional[Executor] = None
+
+
+def variant_key(s3_path: str, width: int, fmt: str) -> str:
+    """
+    Build the S3 key of a variant: images/variants/<original name>/<width>w.<ext>
+
+    Args:
+        s3_path: S3 key of the original image
+        width: Variant width in pixels
+        fmt: Variant format (webp, jpeg, avif)
+
+    Returns:
+        str: S3 object key
+    """
+    stem = posixpath.splitext(posixpath.basename(s3_path))[0]
+    return f"images/variants/{stem}/{width}w.{EXTENSIONS[fmt]}"
+
+
+def render_variants(source: Union[bytes, BinaryIO]) -> list[tuple[dict, bytes]]:
+    """
+    Decode an image and encode it at every configured width and format.
+    CPU-bound; runs in a worker process.
+
+    Args:
+        source: Original image bytes, or a seekable file Pillow reads it from
+
+    Returns:
+        list[tuple[dict, bytes]]: ({"width", "height", "format"}, encoded bytes) per variant
+    """
+    # pylint: disable=import-outside-toplevel
+    from PIL import Image, ImageOps, features
+
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert("RGB")
+
+    widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+    formats = [fmt for fmt in VARIANT_FORMATS if fmt in CONTENT_TYPES]
+    if "avif" in formats and not features.check("avif"):
+        formats.remove("avif")
+
+    variants = []
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize(
+            (width, height), Image.Resampling.LANCZOS
+        )
+
+        for fmt in formats:
+            buffer = io.BytesIO()
+            if fmt == "jpeg":
+                resized.save(buffer, "JPEG", quality=VARIANT_QUALITY, optimize=True, progressive=True)
+            else:
+                resized.save(buffer, fmt.upper(), quality=VARIANT_QUALITY)
+            variants.append(({"width": width, "height": height, "format": fmt}, buffer.getvalue()))
+
+    return variants
+
+
+def _use_threads(error: BaseException) -> Executor:
+    global _executor  # pylint: disable=global-statement
+    # No working multiprocessing here (e.g. Lambda), resize on threads instead
+    logger.warning(f"Process pool unavailable ({str(error)}), resizing on threads")
+    _executor = ThreadPoolExecutor(
+        max_workers=IMAGE_PROCESS_WORKERS,
+        thread_name_prefix="image-resize"
+    )
+    return _executor
+
+
+def _get_executor() -> Executor:
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        try:
+            _executor = ProcessPoolExecutor(max_workers=IMAGE_PROCESS_WORKERS)
+        except (OSError, NotImplementedError) as e:
+            # Lambda has no /dev/shm, so the pool's SemLock can't even be created
+            return _use_threads(e)
+    return _executor
+
+
+def _read_all(source: BinaryIO) -> bytes:
+    source.seek(0)
+    return source.read()
+
+
+async def _render(source: BinaryIO) -> list[tuple[dict, bytes]]:
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+
+    if not isinstance(executor, ThreadPoolExecutor):
+        try:
+            # Worker processes can't share the file, they get a copy of its content
+            content = await run_blocking(_read_all, source)
+            return await loop.run_in_executor(executor, render_variants, content)
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            executor = _use_threads(e)
+
+    # Threads decode straight from the (spooled) file, without a copy in memory
+    source.seek(0)
+    return await loop.run_in_executor(executor, render_variants, source)
+
+
+class VariantUploadError(Exception):
+    """Some variants of an image failed to upload; `variants` lists the ones that were stored"""
+
+    def __init__(self, message: str, variants: list[dict]):
+        super().__init__(message)
+        self.variants = variants
+
+
+async def create_variants(source: BinaryIO, s3_path: str) -> list[dict]:
+    """
+    Generate resized variants of an uploaded image and store them in S3.
+    Resizing runs off the event loop; variants upload concurrently.
+    Images Pillow can't decode get no variants rather than failing the upload.
+
+    Args:
+        source: Seekable file with the original image (e.g. a spooled upload)
+        s3_path: S3 key of the original image
+
+    Returns:
+        list[dict]: {"width", "height", "format", "s3_path"} per stored variant
+
+    Raises:
+        VariantUploadError: A variant failed to upload, after the others finished
+    """
+    try:
+        rendered = await _render(source)
+    except Exception as e:
+        logger.warning(f"Skipping variants for {s3_path}: {str(e)}")
+        return []
+
+    variants = [
+        {**meta, "s3_path": variant_key(s3_path, meta["width"], meta["format"])}
+        for meta, _ in rendered
+    ]
+
+    # Let every upload finish, so the caller knows which objects to clean up
+    results = await asyncio.gather(*[
+        AsyncS3Storage.upload_object(
+            s3_path=variant["s3_path"],
+            content=data,
+            content_type=CONTENT_TYPES[variant["format"]]
+        )
+        for variant, (_, data) in zip(variants, rendered)
+    ], return_exceptions=True)
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        stored = [variant for variant, result in zip(variants, results) if not isinstance(result, BaseException)]
+        raise VariantUploadError(
+            f"{len(errors)} of {len(variants)} variants of {s3_path} failed to upload: {str(errors[0])}",
+            stored
+        ) from errors[0]
+
+    logger.info(f"Created {len(variants)} variants for {s3_path}")
+    return variants
@@ -0,0 +1,35 @@
+import os
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Threads available for blocking AWS calls made from async handlers
+AWS_IO_WORKERS = int(os.getenv("AWS_IO_WORKERS", "16"))
+
+# Dedicated pool so AWS calls can't starve FastAPI's own threadpool (and vice versa)
+_executor = ThreadPoolExecutor(max_workers=AWS_IO_WORKERS, thread_name_prefix="aws-io")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call on the AWS I/O executor without blocking the event loop.
+    Context variables are carried over to the worker thread.
+
+    Args:
+        func: Blocking function to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        T: Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _executor,
+        functools.partial(context.run, func, *args, **kwargs)
+    )
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+from typing import Optional
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+
+from shared import aws
+from shared.executor import run_blocking
+from shared.ses import send_contact_email
+
+logger = logging.getLogger(__name__)
+
+# SQS queue holding contact submissions (unset: in-process stand-in for local runs)
+CONTACT_QUEUE_URL = os.getenv("CONTACT_QUEUE_URL")
+
+# Dead-letter queue for submissions that can never be delivered
+CONTACT_DLQ_URL = os.getenv("CONTACT_DLQ_URL")
+
+# Backoff before a failed submission is retried, doubled per attempt
+OUTBOX_BASE_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BASE_BACKOFF_SECONDS", "5"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "900"))
+
+# Delivery attempts before the local stand-in dead-letters a submission
+# (on AWS the queue's redrive policy decides this)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+
+# SES sending quota in emails per second (the SES sandbox allows 1)
+SES_MAX_SEND_RATE = float(os.getenv("SES_MAX_SEND_RATE", "1"))
+
+# SES error codes that mean "slow down" rather than "this message is broken"
+THROTTLE_ERRORS = {"Throttling", "ThrottlingException", "MaxSendRateExceeded"}
+
+# SES error codes that will fail again no matter how often the message is retried
+PERMANENT_ERRORS = {"MessageRejected", "InvalidParameterValue"}
+
+
+class PermanentDeliveryError(Exception):
+    """The submission can't ever be delivered and belongs in the dead-letter queue"""
+
+
+class _SendRateLimiter:
+    """Spaces SES calls so a burst of submissions stays under the sending quota"""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate > 0 else 0
+        self._next_send = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_send - now
+            self._next_send = max(now, self._next_send) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiter = _SendRateLimiter(SES_MAX_SEND_RATE)
+
+
+def backoff_seconds(attempt: int) -> int:
+    """
+    Exponential backoff with full jitter for a delivery attempt.
+
+    Args:
+        attempt: 1-based number of the attempt that just failed
+
+    Returns:
+        int: Seconds to wait before the next attempt
+    """
+    ceiling = min(OUTBOX_MAX_BACKOFF_SECONDS, OUTBOX_BASE_BACKOFF_SECONDS * 2 ** (attempt - 1))
+    return max(1, round(random.uniform(ceiling / 2, ceiling)))
+
+
+def deliver(contact: dict) -> str:
+    """
+    Send one contact submission through SES, respecting the sending rate.
+
+    Args:
+        contact: ContactRequest fields
+
+    Returns:
+        str: SES message ID
+
+    Raises:
+        PermanentDeliveryError: The submission is malformed or SES rejected it
+        ClientError: Transient SES failure (throttling, service errors), worth retrying
+    """
+    _rate_limiter.wait()
+
+    try:
+        response = send_contact_email(
+            full_name=contact["full_name"],
+            email=contact["email"],
+            phone=contact.get("phone"),
+            service=contact["service"],
+            message=contact.get("message"),
+        )
+        return response["MessageId"]
+    except KeyError as e:
+        raise PermanentDeliveryError(f"Missing field {str(e)}") from e
+    except ClientError as e:
+        if e.response["Error"]["Code"] in PERMANENT_ERRORS:
+            raise PermanentDeliveryError(e.response["Error"]["Message"]) from e
+        raise
+
+
+def is_throttle(error: Exception) -> bool:
+    """
+    Check whether an SES error means the sending quota was exceeded.
+
+    Args:
+        error: Exception raised by deliver
+
+    Returns:
+        bool: True for throttling errors
+    """
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response["Error"]["Code"]
+    return code in THROTTLE_ERRORS or "rate exceeded" in error.response["Error"].get("Message", "").lower()
+
+
+class _LocalOutbox:
+    """
+    In-process stand-in for the SQS queue, used when CONTACT_QUEUE_URL is unset
+    (uvicorn, tests). A daemon thread drains it with the same backoff and
+    dead-lettering rules as the queue worker; dead letters are kept in memory.
+    """
+
+    def __init__(self):
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self.dead_letters: list[dict] = []
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def put(self, contact: dict) -> str:
+        message_id = str(uuid4())
+        self._queue.put((time.monotonic(), message_id, contact, 1))
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="contact-outbox", daemon=True)
+                self._worker.start()
+        return message_id
+
+    def join(self) -> None:
+        """Block until every queued submission is delivered or dead-lettered"""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        while True:
+            due, message_id, contact, attempt = self._queue.get()
+            try:
+                delay = due - time.monotonic()
+                if delay > 0:
+                    # Not due yet, put it back so newer submissions aren't held up
+                    self._queue.put((due, message_id, contact, attempt))
+                    time.sleep(min(delay, 0.5))
+                    continue
+                self._attempt(message_id, contact, attempt)
+            finally:
+                self._queue.task_done()
+
+    def _attempt(self, message_id: str, contact: dict, attempt: int) -> None:
+        try:
+            deliver(contact)
+            logger.info(f"Delivered contact submission {message_id}")
+        except PermanentDeliveryError as e:
+            logger.error(f"Dead-lettering contact submission {message_id}: {str(e)}")
+            self.dead_letters.append(contact)
+        except Exception as e:
+            if attempt >= OUTBOX_MAX_ATTEMPTS:
+                logger.error(f"Dead-lettering contact submission {message_id} after {attempt} attempts: {str(e)}")
+                self.dead_letters.append(contact)
+                return
+
+            delay = backoff_seconds(attempt)
+            logger.warning(f"Retrying contact submission {message_id} in {delay}s: {str(e)}")
+            self._queue.put((time.monotonic() + delay, message_id, contact, attempt + 1))
+
+
+local_outbox = _LocalOutbox()
+
+
+class ContactOutbox:
+    """Durable hand-off of contact submissions to the delivery worker"""
+
+    @staticmethod
+    def enqueue(contact: dict) -> str:
+        """
+        Persist a contact submission for background delivery.
+
+        Args:
+            contact: ContactRequest fields
+
+        Returns:
+            str: Outbox message ID
+        """
+        if not CONTACT_QUEUE_URL:
+            return local_outbox.put(contact)
+
+        try:
+            response = aws.client("sqs").send_message(
+                QueueUrl=CONTACT_QUEUE_URL,
+                MessageBody=json.dumps(contact)
+            )
+            logger.info(f"Queued contact submission: {response['MessageId']}")
+            return response["MessageId"]
+        except ClientError as e:
+            logger.error(f"Error queueing contact submission: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    async def enqueue_async(contact: dict) -> str:
+        return await run_blocking(ContactOutbox.enqueue, contact)
+
+
+def _dead_letter(record: dict, reason: str) -> None:
+    logger.error(f"Dead-lettering contact submission {record['messageId']}: {reason}")
+    if not CONTACT_DLQ_URL:
+        # Left to the queue's redrive policy
+        raise RuntimeError(reason)
+
+    aws.client("sqs").send_message(
+        QueueUrl=CONTACT_DLQ_URL,
+        MessageBody=record["body"],
+        MessageAttributes={
+            "reason": {"DataType": "String", "StringValue": reason[:256]}
+        }
+    )
+
+
+def _retry_later(record: dict, attempt: int) -> None:
+    # SQS redelivers once the visibility timeout runs out, so stretch it to the backoff
+    try:
+        aws.client("sqs").change_message_visibility(
+            QueueUrl=CONTACT_QUEUE_URL,
+            ReceiptHandle=record["receiptHandle"],
+            VisibilityTimeout=backoff_seconds(attempt)
+        )
+    except ClientError as e:
+        logger.error(f"Error delaying contact submission: {e.response['Error']['Message']}")
+
+
+def process_sqs_event(event: dict) -> dict:
+    """
+    Deliver a batch of contact submissions received from SQS.
+    Failed submissions are reported back as batch item failures so only
+    they are redelivered, after an exponential backoff. Once SES throttles,
+    the rest of the batch is put back untouched. Malformed or rejected
+    submissions go straight to the dead-letter queue.
+
+    Args:
+        event: SQS event from the Lambda event source mapping
+
+    Returns:
+        dict: {"batchItemFailures": [{"itemIdentifier": message ID}, ...]}
+    """
+    failures = []
+    throttled = False
+
+    for record in event.get("Records", []):
+        attempt = int(record.get("attributes", {}).get("ApproximateReceiveCount", "1"))
+
+        if throttled:
+            failures.append({"itemIdentifier": record["messageId"]})
+            _retry_later(record, attempt)
+            continue
+
+        try:
+            message_id = deliver(json.loads(record["body"]))
+            logger.info(f"Delivered contact submission {record['messageId']} as {message_id}")
+        except (PermanentDeliveryError, ValueError) as e:
+            try:
+                _dead_letter(record, str(e))
+            except Exception:
+                failures.append({"itemIdentifier": record["messageId"]})
+        except Exception as e:
+            logger.warning(f"Delivery of contact submission {record['messageId']} failed: {str(e)}")
+            throttled = is_throttle(e)
+            failures.append({"itemIdentifier": record["messageId"]})
+            _retry_later(record, attempt)
+
+    return {"batchItemFailures": failures}
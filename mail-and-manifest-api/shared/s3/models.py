@@ -1,11 +1,15 @@
 import os
+import hashlib
 import logging
-from typing import BinaryIO
+import functools
+from typing import BinaryIO, Optional
 from uuid import uuid4
 
-import boto3
 from botocore.exceptions import ClientError
 
+from shared import aws, telemetry
+from shared.executor import run_blocking
+
 logger = logging.getLogger(__name__)
 
 # S3 Bucket Name from environment
@@ -14,13 +18,83 @@ BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "opgd-images-content-prod")
 # CloudFront domain from environment
 CLOUDFRONT_DOMAIN = os.getenv("CLOUDFRONT_DOMAIN", None)
 
-# Initialize S3 client
-s3_client = boto3.client("s3")
+# Largest image accepted through a presigned upload (default: 25 MB)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
+# Multipart part size for streamed uploads (S3 minimum is 5 MB)
+UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE_MB", "8")) * 1024 * 1024
+
+# Parts uploaded in parallel per streamed upload
+UPLOAD_MAX_CONCURRENCY = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "4"))
+
+# Bytes read at a time when streaming an object down from S3
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Cache-Control stored on image objects: every key is written once and never changed
+IMAGE_CACHE_CONTROL = os.getenv("IMAGE_CACHE_CONTROL", "public, max-age=31536000, immutable")
+
+# DeleteObjects accepts at most 1000 keys per call
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
+
+@functools.cache
+def _public_url_base() -> str:
+    # Resolved once per worker, manifests build thousands of URLs
+    if CLOUDFRONT_DOMAIN:
+        return f"https://{CLOUDFRONT_DOMAIN}"
+
+    region = aws.client("s3").meta.region_name
+    return f"https://{BUCKET_NAME}.s3.{region}.amazonaws.com"
 
 
 class S3Storage:
     """S3 interface for image storage"""
 
+    @staticmethod
+    def build_image_key(filename: str, object_id: Optional[str] = None) -> str:
+        """
+        Build the S3 key for a new image.
+
+        Args:
+            filename: Original filename (used for the extension)
+            object_id: Identifier for the object name (default: random UUID)
+
+        Returns:
+            str: S3 object key
+        """
+        file_extension = filename.split(".")[-1] if "." in filename else "jpg"
+        return f"images/{object_id or uuid4()}.{file_extension}"
+
+    @staticmethod
+    def content_key(digest: str, filename: str) -> str:
+        """
+        Build the content-addressed S3 key of an image, so identical files share one object.
+
+        Args:
+            digest: Hex SHA-256 of the file content
+            filename: Original filename (used for the extension)
+
+        Returns:
+            str: S3 object key (images/<sha256>.<ext>)
+        """
+        return S3Storage.build_image_key(filename, digest)
+
+    @staticmethod
+    def content_digest(s3_path: str) -> Optional[str]:
+        """
+        Get the content hash a key was built from.
+
+        Args:
+            s3_path: S3 key of an original image
+
+        Returns:
+            Optional[str]: Hex SHA-256, or None for keys that aren't content-addressed
+        """
+        stem = s3_path.rsplit("/", 1)[-1].split(".", 1)[0]
+        if len(stem) == 64 and all(char in "0123456789abcdef" for char in stem):
+            return stem
+        return None
+
     @staticmethod
     def upload_image(
         file_content: bytes,
@@ -28,7 +102,7 @@ class S3Storage:
         content_type: str = "image/jpeg"
     ) -> str:
         """
-        Upload an image to S3.
+        Upload an image to S3 under its content-addressed key.
 
         Args:
             file_content: Binary file content
@@ -38,17 +112,15 @@ class S3Storage:
         Returns:
             str: S3 object path
         """
-        # Generate unique filename
-        file_extension = filename.split(".")[-1] if "." in filename else "jpg"
-        unique_filename = f"{uuid4()}.{file_extension}"
-        s3_key = f"images/{unique_filename}"
+        s3_key = S3Storage.content_key(hashlib.sha256(file_content).hexdigest(), filename)
 
         try:
-            s3_client.put_object(
+            aws.client("s3").put_object(
                 Bucket=BUCKET_NAME,
                 Key=s3_key,
                 Body=file_content,
                 ContentType=content_type,
+                CacheControl=IMAGE_CACHE_CONTROL,
                 ServerSideEncryption="AES256"
             )
             logger.info(f"Uploaded image to S3: {s3_key}")
@@ -57,6 +129,150 @@ class S3Storage:
             logger.error(f"Error uploading to S3: {e.response['Error']['Message']}")
             raise
 
+    @staticmethod
+    def upload_image_stream(
+        fileobj: BinaryIO,
+        filename: str,
+        content_type: str = "image/jpeg",
+        part_size: int = UPLOAD_PART_SIZE,
+        max_concurrency: int = UPLOAD_MAX_CONCURRENCY,
+        s3_key: Optional[str] = None
+    ) -> str:
+        """
+        Stream an image to S3 from a file object.
+        Files larger than part_size go up as a multipart upload, read one part
+        at a time, so memory use is bounded by the part size and concurrency
+        rather than the file size. A failed multipart upload is aborted.
+
+        Args:
+            fileobj: Readable binary file object (e.g. UploadFile.file)
+            filename: Original filename
+            content_type: MIME type of the file
+            part_size: Multipart part size in bytes (default: UPLOAD_PART_SIZE)
+            max_concurrency: Parts uploaded in parallel (default: UPLOAD_MAX_CONCURRENCY)
+            s3_key: Key to write (default: a new random key, see content_key)
+
+        Returns:
+            str: S3 object path
+        """
+        # pylint: disable=import-outside-toplevel
+        from boto3.s3.transfer import TransferConfig
+
+        s3_key = s3_key or S3Storage.build_image_key(filename)
+
+        config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=max_concurrency,
+            use_threads=max_concurrency > 1
+        )
+
+        try:
+            # s3transfer aborts the multipart upload itself if any part fails.
+            # Its part uploads run on its own threads, outside the request's
+            # context, so the transfer is timed as a whole instead.
+            with telemetry.span("s3-upload"):
+                aws.client("s3").upload_fileobj(
+                    fileobj,
+                    BUCKET_NAME,
+                    s3_key,
+                    ExtraArgs={
+                        "ContentType": content_type,
+                        "CacheControl": IMAGE_CACHE_CONTROL,
+                        "ServerSideEncryption": "AES256"
+                    },
+                    Config=config
+                )
+            logger.info(f"Streamed image to S3: {s3_key}")
+            return s3_key
+        except ClientError as e:
+            logger.error(f"Error uploading to S3: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def upload_object(s3_path: str, content: bytes, content_type: str) -> str:
+        """
+        Upload bytes to a fixed S3 key (e.g. an image variant).
+
+        Args:
+            s3_path: S3 object key
+            content: Binary content
+            content_type: MIME type of the content
+
+        Returns:
+            str: S3 object path
+        """
+        try:
+            aws.client("s3").put_object(
+                Bucket=BUCKET_NAME,
+                Key=s3_path,
+                Body=content,
+                ContentType=content_type,
+                CacheControl=IMAGE_CACHE_CONTROL,
+                ServerSideEncryption="AES256"
+            )
+            logger.info(f"Uploaded object to S3: {s3_path}")
+            return s3_path
+        except ClientError as e:
+            logger.error(f"Error uploading to S3: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def copy_object(source_path: str, s3_path: str, content_type: str) -> str:
+        """
+        Copy an object to a new key inside the bucket (e.g. a direct upload to its content key).
+
+        Args:
+            source_path: S3 key to copy from
+            s3_path: S3 key to copy to
+            content_type: MIME type of the content
+
+        Returns:
+            str: S3 object path
+        """
+        try:
+            aws.client("s3").copy_object(
+                Bucket=BUCKET_NAME,
+                Key=s3_path,
+                CopySource={"Bucket": BUCKET_NAME, "Key": source_path},
+                MetadataDirective="REPLACE",
+                ContentType=content_type,
+                CacheControl=IMAGE_CACHE_CONTROL,
+                ServerSideEncryption="AES256"
+            )
+            logger.info(f"Copied {source_path} to {s3_path}")
+            return s3_path
+        except ClientError as e:
+            logger.error(f"Error copying in S3: {e.response['Error']['Message']}")
+            raise
+
+    @staticmethod
+    def download_to_file(s3_path: str, fileobj: BinaryIO) -> tuple[str, str]:
+        """
+        Stream an image from S3 into a file, hashing it on the way.
+        The body is read DOWNLOAD_CHUNK_SIZE at a time, so memory use doesn't
+        follow the object size when the file is on disk.
+
+        Args:
+            s3_path: S3 object key
+            fileobj: Writable, seekable binary file (e.g. a SpooledTemporaryFile),
+                     left at the start
+
+        Returns:
+            tuple[str, str]: Hex SHA-256 of the content and the object's stored Content-Type
+        """
+        digest = hashlib.sha256()
+        try:
+            response = aws.client("s3").get_object(Bucket=BUCKET_NAME, Key=s3_path)
+            for chunk in response["Body"].iter_chunks(DOWNLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                fileobj.write(chunk)
+            fileobj.seek(0)
+            return digest.hexdigest(), response.get("ContentType", "")
+        except ClientError as e:
+            logger.error(f"Error downloading from S3: {e.response['Error']['Message']}")
+            raise
+
     @staticmethod
     def get_image_url(s3_path: str, expiration: int = 3600) -> str:
         """
@@ -70,7 +286,7 @@ class S3Storage:
             str: Presigned URL
         """
         try:
-            url = s3_client.generate_presigned_url(
+            url = aws.client("s3").generate_presigned_url(
                 "get_object",
                 Params={"Bucket": BUCKET_NAME, "Key": s3_path},
                 ExpiresIn=expiration
@@ -81,6 +297,47 @@ class S3Storage:
             logger.error(f"Error generating presigned URL: {e.response['Error']['Message']}")
             raise
 
+    @staticmethod
+    def get_upload_url(
+        s3_path: str,
+        content_type: str,
+        max_size: int = MAX_UPLOAD_BYTES,
+        expiration: int = 900
+    ) -> dict:
+        """
+        Generate a presigned POST so a client can upload an image straight to S3.
+        S3 rejects the upload unless it matches the content type and size limit.
+
+        Args:
+            s3_path: S3 object key the upload must be written to
+            content_type: MIME type the upload must declare
+            max_size: Maximum object size in bytes (default: MAX_UPLOAD_BYTES)
+            expiration: URL expiration time in seconds (default: 15 minutes)
+
+        Returns:
+            dict: {"url": str, "fields": dict} to send as a multipart form POST
+        """
+        try:
+            upload = aws.client("s3").generate_presigned_post(
+                Bucket=BUCKET_NAME,
+                Key=s3_path,
+                Fields={
+                    "Content-Type": content_type,
+                    "x-amz-server-side-encryption": "AES256"
+                },
+                Conditions=[
+                    {"Content-Type": content_type},
+                    {"x-amz-server-side-encryption": "AES256"},
+                    ["content-length-range", 1, max_size]
+                ],
+                ExpiresIn=expiration
+            )
+            logger.info(f"Generated presigned upload for: {s3_path}")
+            return upload
+        except ClientError as e:
+            logger.error(f"Error generating presigned upload: {e.response['Error']['Message']}")
+            raise
+
     @staticmethod
     def delete_image(s3_path: str) -> bool:
         """
@@ -93,13 +350,47 @@ class S3Storage:
             bool: True if deleted successfully
         """
         try:
-            s3_client.delete_object(Bucket=BUCKET_NAME, Key=s3_path)
+            aws.client("s3").delete_object(Bucket=BUCKET_NAME, Key=s3_path)
             logger.info(f"Deleted image from S3: {s3_path}")
             return True
         except ClientError as e:
             logger.error(f"Error deleting from S3: {e.response['Error']['Message']}")
             raise
 
+    @staticmethod
+    def delete_images(s3_paths: list[str]) -> list[str]:
+        """
+        Delete many objects from S3 with DeleteObjects (1000 keys per call).
+
+        Args:
+            s3_paths: S3 object keys
+
+        Returns:
+            list[str]: Keys that could not be deleted
+        """
+        failed = []
+
+        try:
+            for start in range(0, len(s3_paths), DELETE_OBJECTS_BATCH_SIZE):
+                keys = s3_paths[start:start + DELETE_OBJECTS_BATCH_SIZE]
+                response = aws.client("s3").delete_objects(
+                    Bucket=BUCKET_NAME,
+                    Delete={
+                        "Objects": [{"Key": key} for key in keys],
+                        "Quiet": True
+                    }
+                )
+
+                for error in response.get("Errors", []):
+                    logger.error(f"Error deleting {error['Key']} from S3: {error.get('Message')}")
+                    failed.append(error["Key"])
+
+            logger.info(f"Deleted {len(s3_paths) - len(failed)} objects from S3")
+            return failed
+        except ClientError as e:
+            logger.error(f"Error deleting from S3: {e.response['Error']['Message']}")
+            raise
+
     @staticmethod
     def get_public_url(s3_path: str) -> str:
         """
@@ -112,11 +403,29 @@ class S3Storage:
         Returns:
             str: Public URL (CloudFront or S3)
         """
-        if CLOUDFRONT_DOMAIN:
-            return f"https://{CLOUDFRONT_DOMAIN}/{s3_path}"
+        return f"{_public_url_base()}/{s3_path}"
 
-        region = s3_client.meta.region_name
-        return f"https://{BUCKET_NAME}.s3.{region}.amazonaws.com/{s3_path}"
+    @staticmethod
+    def add_public_urls(item: dict) -> dict:
+        """
+        Copy an image record with public URLs for the image and its variants.
+
+        Args:
+            item: Image record
+
+        Returns:
+            dict: Image record with "url" set on it and on every variant
+        """
+        image_data = {
+            **item,
+            "url": S3Storage.get_public_url(item["s3_path"])
+        }
+        if item.get("variants"):
+            image_data["variants"] = [
+                {**variant, "url": S3Storage.get_public_url(variant["s3_path"])}
+                for variant in item["variants"]
+            ]
+        return image_data
 
     @staticmethod
     def image_exists(s3_path: str) -> bool:
@@ -130,10 +439,75 @@ class S3Storage:
             bool: True if image exists
         """
         try:
-            s3_client.head_object(Bucket=BUCKET_NAME, Key=s3_path)
+            aws.client("s3").head_object(Bucket=BUCKET_NAME, Key=s3_path)
             return True
         except ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 return False
             logger.error(f"Error checking S3 object: {e.response['Error']['Message']}")
             raise
+
+
+class AsyncS3Storage:
+    """Async variant of S3Storage, each call runs on the AWS I/O executor"""
+
+    @staticmethod
+    async def upload_image(
+        file_content: bytes,
+        filename: str,
+        content_type: str = "image/jpeg"
+    ) -> str:
+        return await run_blocking(S3Storage.upload_image, file_content, filename, content_type)
+
+    @staticmethod
+    async def upload_image_stream(
+        fileobj: BinaryIO,
+        filename: str,
+        content_type: str = "image/jpeg",
+        part_size: int = UPLOAD_PART_SIZE,
+        max_concurrency: int = UPLOAD_MAX_CONCURRENCY,
+        s3_key: Optional[str] = None
+    ) -> str:
+        return await run_blocking(
+            S3Storage.upload_image_stream,
+            fileobj, filename, content_type, part_size, max_concurrency, s3_key
+        )
+
+    @staticmethod
+    async def upload_object(s3_path: str, content: bytes, content_type: str) -> str:
+        return await run_blocking(S3Storage.upload_object, s3_path, content, content_type)
+
+    @staticmethod
+    async def copy_object(source_path: str, s3_path: str, content_type: str) -> str:
+        return await run_blocking(S3Storage.copy_object, source_path, s3_path, content_type)
+
+    @staticmethod
+    async def download_to_file(s3_path: str, fileobj: BinaryIO) -> tuple[str, str]:
+        return await run_blocking(S3Storage.download_to_file, s3_path, fileobj)
+
+    @staticmethod
+    async def get_image_url(s3_path: str, expiration: int = 3600) -> str:
+        return await run_blocking(S3Storage.get_image_url, s3_path, expiration)
+
+    @staticmethod
+    async def get_upload_url(
+        s3_path: str,
+        content_type: str,
+        max_size: int = MAX_UPLOAD_BYTES,
+        expiration: int = 900
+    ) -> dict:
+        return await run_blocking(
+            S3Storage.get_upload_url, s3_path, content_type, max_size, expiration
+        )
+
+    @staticmethod
+    async def delete_image(s3_path: str) -> bool:
+        return await run_blocking(S3Storage.delete_image, s3_path)
+
+    @staticmethod
+    async def delete_images(s3_paths: list[str]) -> list[str]:
+        return await run_blocking(S3Storage.delete_images, s3_paths)
+
+    @staticmethod
+    async def image_exists(s3_path: str) -> bool:
+        return await run_blocking(S3Storage.image_exists, s3_path)
@@ -3,18 +3,17 @@ import logging
 from typing import Optional
 from textwrap import dedent
 
-import boto3
 from botocore.exceptions import ClientError
 
+from shared import aws
+from shared.executor import run_blocking
+
 logger = logging.getLogger(__name__)
 
 # SES Configuration from environment
 SENDER_EMAIL = os.getenv("SES_SENDER_EMAIL", "noreply@onpointgaragedoors.com")
 RECIPIENT_EMAIL = os.getenv("SES_RECIPIENT_EMAIL", "info@onpointgaragedoors.com")
 
-# Initialize SES client
-ses_client = boto3.client("ses")
-
 
 def send_contact_email(
     full_name: str,
@@ -63,7 +62,7 @@ def send_contact_email(
     )
 
     try:
-        response = ses_client.send_email(
+        response = aws.client("ses").send_email(
             Source=SENDER_EMAIL,
             Destination={
                 "ToAddresses": [RECIPIENT_EMAIL],
@@ -91,4 +90,24 @@ def send_contact_email(
 
     except ClientError as e:
         logger.error(f"Error sending email: {e.response['Error']['Message']}")
-        raise
\ No newline at end of file
+        raise
+
+
+async def send_contact_email_async(
+    full_name: str,
+    email: str,
+    phone: Optional[str],
+    service: str,
+    message: Optional[str],
+) -> dict:
+    """
+    Async variant of send_contact_email, runs on the AWS I/O executor.
+    """
+    return await run_blocking(
+        send_contact_email,
+        full_name=full_name,
+        email=email,
+        phone=phone,
+        service=service,
+        message=message,
+    )
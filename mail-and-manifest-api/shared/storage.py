@@ -0,0 +1,170 @@
+import os
+import asyncio
+import hashlib
+import logging
+import weakref
+from typing import Any, Awaitable, BinaryIO, Callable, Optional
+
+from shared.db.catalog import BlobIndex
+from shared.db.records import ImageRecord
+from shared.derivatives import VariantUploadError, create_variants
+from shared.executor import run_blocking
+from shared.s3.models import AsyncS3Storage, S3Storage
+
+logger = logging.getLogger(__name__)
+
+# Attempts at storing content while an earlier delete of the same content finishes
+BLOB_CLAIM_MAX_ATTEMPTS = int(os.getenv("BLOB_CLAIM_MAX_ATTEMPTS", "8"))
+
+# Bytes read at a time when hashing an image file
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Stores of the same content in one worker (e.g. a batch of duplicates) take turns,
+# so only the first uploads and the rest find it ready
+_content_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _sha256(source: BinaryIO) -> str:
+    # Hash a seekable file a chunk at a time, leaving it at the start
+    digest = hashlib.sha256()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+async def store_image(
+    source: BinaryIO,
+    filename: str,
+    upload: Callable[[str], Awaitable[Any]],
+    digest: Optional[str] = None
+) -> tuple[str, list[dict]]:
+    """
+    Store an image under its content hash, once.
+    New content is uploaded and resized; content that is already stored
+    only gains a reference, without touching S3 or resizing anything.
+    The file is hashed and resized from where it is (memory or a spooled
+    temp file), a chunk at a time, without another copy of its content.
+
+    Args:
+        source: Seekable image file (e.g. UploadFile.file)
+        filename: Original filename (for the extension)
+        upload: Writes the original to the S3 key it is given, from source;
+                called last, so it may close the file
+        digest: Hex SHA-256 of the content, if it was hashed on the way in
+                (hashed from source otherwise)
+
+    Returns:
+        tuple[str, list[dict]]: S3 key of the original and its variants
+    """
+    if digest is None:
+        digest = await run_blocking(_sha256, source)
+    lock = _content_locks.setdefault(digest, asyncio.Lock())
+    async with lock:
+        return await _store(digest, source, filename, upload)
+
+
+async def _store(
+    digest: str,
+    source: BinaryIO,
+    filename: str,
+    upload: Callable[[str], Awaitable[Any]]
+) -> tuple[str, list[dict]]:
+    s3_path = S3Storage.content_key(digest, filename)
+    claimed = False
+
+    for attempt in range(BLOB_CLAIM_MAX_ATTEMPTS):
+        blob = await run_blocking(BlobIndex.acquire, digest)
+        if blob is not None and blob["ready"]:
+            return blob["s3_path"], blob["variants"]
+        if blob is not None:
+            # Another request is still uploading the same content: write the
+            # same objects too, so this image never points at missing files
+            s3_path = blob["s3_path"]
+            break
+        if await run_blocking(BlobIndex.claim, digest, s3_path):
+            claimed = True
+            break
+        # The same content is being deleted, let the delete finish
+        await asyncio.sleep(0.05 * 2 ** attempt)
+    else:
+        raise RuntimeError(f"Content {digest[:12]} is still being deleted")
+
+    variants: list[dict] = []
+    try:
+        variants = await create_variants(source, s3_path)
+        # The original goes last: the S3 transfer closes the file when it's done
+        source.seek(0)
+        await upload(s3_path)
+    except Exception as e:
+        if isinstance(e, VariantUploadError):
+            # Only some variants made it to S3, those have to go too
+            variants = e.variants
+        # Give the reference back, removing whatever was uploaded if it was the last one
+        await discard_stored_image(s3_path, variants)
+        raise
+
+    if claimed:
+        await run_blocking(BlobIndex.mark_ready, digest, variants)
+    logger.info(f"Stored new content {digest[:12]} as {s3_path}")
+    return s3_path, variants
+
+
+async def discard_stored_image(s3_path: str, variants: list[dict]) -> None:
+    """
+    Give back the reference store_image took for an image whose record
+    was never written. Its files are deleted if nothing else uses them.
+
+    Args:
+        s3_path: S3 key of the original, as returned by store_image
+        variants: Its variants, as returned by store_image
+    """
+    digest = S3Storage.content_digest(s3_path)
+    if digest and not await run_blocking(BlobIndex.release, digest):
+        return
+
+    keys = ImageRecord(uuid=digest or s3_path, s3_path=s3_path, variants=variants).s3_paths()
+    failed_keys = await AsyncS3Storage.delete_images(keys)
+    if failed_keys:
+        # Still marked as being deleted: the next upload of this content rewrites them
+        logger.error(f"Failed to delete {len(failed_keys)} files of discarded content {s3_path}")
+        return
+    if digest:
+        await run_blocking(BlobIndex.forget, digest)
+
+
+async def delete_released_files(records: list[ImageRecord]) -> set[str]:
+    """
+    Delete the files of deleted images that no image uses anymore.
+    Their references were dropped in the transaction that deleted their
+    records, so this runs once that transaction has committed. Files are only
+    removed (with DeleteObjects) by whoever marks the content for deletion
+    first, and only if nothing references it again in the meantime.
+
+    Args:
+        records: Deleted images (s3_path and variants)
+
+    Returns:
+        set[str]: UUIDs of the images whose files could not all be deleted
+        (their content stays marked as being deleted, so the next upload of it
+        rewrites them)
+    """
+    digests = {record.uuid: S3Storage.content_digest(record.s3_path) for record in records}
+    released = list({digest for digest in digests.values() if digest})
+    owned = {
+        digest for digest, won in zip(
+            released,
+            await asyncio.gather(*[run_blocking(BlobIndex.begin_delete, digest) for digest in released])
+        ) if won
+    }
+
+    # Files stored before content addressing (no digest) are never shared
+    deletable = [record for record in records if digests[record.uuid] in owned or not digests[record.uuid]]
+    keys = list(dict.fromkeys(key for record in deletable for key in record.s3_paths()))
+    failed_keys = set(await AsyncS3Storage.delete_images(keys)) if keys else set()
+
+    failed_ids = {record.uuid for record in deletable if failed_keys.intersection(record.s3_paths())}
+    kept = {digests[image_id] for image_id in failed_ids}
+    await asyncio.gather(*[run_blocking(BlobIndex.forget, digest) for digest in owned - kept])
+    return failed_ids
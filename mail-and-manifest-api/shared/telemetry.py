@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from starlette.datastructures import Headers
+
+from security.api_key import is_admin_key
+
+# Add a Server-Timing header (handler, serialization and per-service AWS time) to responses
+# for requests that carry the admin API key; public callers never see backend timings
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+# Print one CloudWatch Embedded Metric Format line per request to stdout
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# CloudWatch namespace for the embedded metrics
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "OPGD/MailManifestApi")
+
+# DynamoDB operations that can report the capacity they consumed
+CAPACITY_OPERATIONS = {
+    "GetItem", "PutItem", "UpdateItem", "DeleteItem", "Query", "Scan",
+    "BatchGetItem", "BatchWriteItem", "TransactGetItems", "TransactWriteItems"
+}
+
+# Metric name prefix per service
+SERVICE_LABELS = {
+    "dynamodb": "DynamoDB",
+    "s3": "S3",
+    "ses": "SES",
+    "sqs": "SQS"
+}
+
+_current: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class RequestTimings:
+    """
+    AWS calls and named spans recorded while one request is handled.
+    Shared by every thread working on the request (run_blocking copies the context).
+    """
+
+    def __init__(self):
+        self.services: dict[str, dict] = {}
+        self.operations: dict[str, int] = {}
+        self.spans: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, service: str, operation: str, duration_ms: float, capacity: float) -> None:
+        with self._lock:
+            totals = self.services.setdefault(service, {"calls": 0, "ms": 0.0, "capacity": 0.0})
+            totals["calls"] += 1
+            totals["ms"] += duration_ms
+            totals["capacity"] += capacity
+            key = f"{service}.{operation}"
+            self.operations[key] = self.operations.get(key, 0) + 1
+
+    def add_span(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + duration_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "services": {service: dict(totals) for service, totals in self.services.items()},
+                "operations": dict(self.operations),
+                "spans": dict(self.spans)
+            }
+
+    def server_timing(self, handler_ms: float) -> str:
+        """
+        Format the timings as a Server-Timing header value.
+
+        Args:
+            handler_ms: Time spent in the app so far
+
+        Returns:
+            str: e.g. handler;dur=12.1, dynamodb;desc="3 calls, 1.5 CU";dur=8.0
+        """
+        with self._lock:
+            entries = [f"handler;dur={handler_ms:.1f}"]
+            for service, totals in self.services.items():
+                desc = f"{totals['calls']} call{'s' if totals['calls'] != 1 else ''}"
+                if totals["capacity"]:
+                    desc += f", {totals['capacity']:g} CU"
+                entries.append(f'{service};desc="{desc}";dur={totals["ms"]:.1f}')
+            entries.extend(f"{name};dur={duration:.1f}" for name, duration in self.spans.items())
+        return ", ".join(entries)
+
+
+def current() -> Optional[RequestTimings]:
+    """
+    Get the timings of the request being handled.
+
+    Returns:
+        Optional[RequestTimings]: None outside a request (e.g. the outbox worker)
+    """
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block of work as a named Server-Timing entry of the current request.
+    Repeated spans with the same name add up.
+
+    Args:
+        name: Entry name (e.g. "serialize")
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_span(name, (time.perf_counter() - start) * 1000)
+
+
+def _request_capacity(params: dict, model: Any, **_kwargs: Any) -> None:
+    # Only ask for consumed capacity while a request is being measured
+    if _current.get() is not None and model.name in CAPACITY_OPERATIONS:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _before_call(context: dict, **_kwargs: Any) -> None:
+    timings = _current.get()
+    if timings is not None:
+        context["request_timings"] = (timings, time.perf_counter())
+
+
+def _consumed_capacity(parsed: dict) -> float:
+    consumed = parsed.get("ConsumedCapacity")
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(entry.get("CapacityUnits", 0) for entry in consumed or []))
+
+
+def _after_call(service: str, context: dict, model: Any = None, parsed: Optional[dict] = None,
+                event_name: str = "", **_kwargs: Any) -> None:
+    started = context.pop("request_timings", None)
+    if started is None:
+        return
+
+    timings, start = started
+    # after-call-error (a failed connection) carries no operation model, only the event name
+    operation = model.name if model is not None else event_name.rsplit(".", 1)[-1]
+    capacity = _consumed_capacity(parsed) if isinstance(parsed, dict) else 0.0
+    timings.record_call(service, operation, (time.perf_counter() - start) * 1000, capacity)
+
+
+def instrument(client: Any) -> None:
+    """
+    Record every call a botocore client makes against the current request.
+
+    Args:
+        client: botocore client (or a resource's meta.client)
+    """
+    service = client.meta.service_model.service_name
+    events = client.meta.events
+
+    def after_call(**kwargs: Any) -> None:
+        _after_call(service, **kwargs)
+
+    events.register("before-call", _before_call)
+    events.register("after-call", after_call)
+    events.register("after-call-error", after_call)
+    if service == "dynamodb":
+        events.register("provide-client-params", _request_capacity)
+
+
+def emit_metrics(route: str, method: str, status_code: int, handler_ms: float,
+                 timings: RequestTimings, request_id: Optional[str] = None) -> None:
+    """
+    Print the request's timings as a CloudWatch Embedded Metric Format log line.
+    On Lambda, CloudWatch turns the line into metrics dimensioned by route and method.
+
+    Args:
+        route: Route path template (e.g. /image/{image_id})
+        method: HTTP method
+        status_code: Response status
+        handler_ms: Time spent in the app
+        timings: Timings recorded for the request
+        request_id: Lambda request ID, kept as a searchable property
+    """
+    metrics = [{"Name": "Latency", "Unit": "Milliseconds"}]
+    record: dict[str, Any] = {
+        "Route": route,
+        "Method": method,
+        "StatusCode": status_code,
+        "Latency": round(handler_ms, 2)
+    }
+
+    recorded = timings.snapshot()
+    for service, totals in recorded["services"].items():
+        label = SERVICE_LABELS.get(service, service.upper())
+        record[f"{label}Calls"] = totals["calls"]
+        record[f"{label}Time"] = round(totals["ms"], 2)
+        metrics.append({"Name": f"{label}Calls", "Unit": "Count"})
+        metrics.append({"Name": f"{label}Time", "Unit": "Milliseconds"})
+        if service == "dynamodb":
+            record[f"{label}ConsumedCapacity"] = totals["capacity"]
+            metrics.append({"Name": f"{label}ConsumedCapacity", "Unit": "Count"})
+
+    for name, duration in recorded["spans"].items():
+        metric = "".join(part.title() for part in name.split("-")) + "Time"
+        record[metric] = round(duration, 2)
+        metrics.append({"Name": metric, "Unit": "Milliseconds"})
+
+    record["Operations"] = recorded["operations"]
+
+    if request_id:
+        record["RequestId"] = request_id
+
+    record["_aws"] = {
+        "Timestamp": int(time.time() * 1000),
+        "CloudWatchMetrics": [{
+            "Namespace": METRICS_NAMESPACE,
+            "Dimensions": [["Route", "Method"]],
+            "Metrics": metrics
+        }]
+    }
+    print(json.dumps(record, separators=(",", ":")), flush=True)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that measures each HTTP request: AWS calls made through
+    the instrumented clients, named spans and total handler time. Adds them
+    as a Server-Timing header (admin requests only, when SERVER_TIMING_ENABLED)
+    and prints them as an EMF metrics line.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+        add_header = SERVER_TIMING_ENABLED and is_admin_key(Headers(scope=scope).get("x-api-key"))
+
+        async def send_with_timing(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if add_header:
+                    header = timings.server_timing((time.perf_counter() - start) * 1000)
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", header.encode())]
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if METRICS_ENABLED:
+                # Matched route template, so IDs in the path don't become dimensions
+                route = getattr(scope.get("route"), "path", "unmatched")
+                lambda_context = scope.get("aws.context")
+                emit_metrics(
+                    route=route,
+                    method=scope["method"],
+                    status_code=status_code,
+                    handler_ms=(time.perf_counter() - start) * 1000,
+                    timings=timings,
+                    request_id=getattr(lambda_context, "aws_request_id", None)
+                )
@@ -0,0 +1,94 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from botocore.exceptions import ClientError
+
+from shared import aws
+from shared.outbox import CONTACT_QUEUE_URL
+from shared.s3.models import BUCKET_NAME
+
+logger = logging.getLogger(__name__)
+
+# Object the S3 connection is opened with (it doesn't have to exist)
+WARMUP_S3_KEY = "warmup"
+
+
+def is_warmup_event(event: Any) -> bool:
+    """
+    Check whether a Lambda event is a warm-up ping rather than an API request:
+    an EventBridge scheduled event, or {"warmup": true} sent by hand.
+
+    Args:
+        event: Lambda event
+
+    Returns:
+        bool: True for warm-up pings
+    """
+    if not isinstance(event, dict):
+        return False
+    return event.get("warmup") is True or (
+        event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
+    )
+
+
+def _open_s3() -> None:
+    try:
+        aws.client("s3").head_object(Bucket=BUCKET_NAME, Key=WARMUP_S3_KEY)
+    except ClientError:
+        # 404/403 still leave a pooled TLS connection behind
+        pass
+
+
+def _open_ses() -> None:
+    aws.client("ses").get_send_quota()
+
+
+def _open_sqs() -> None:
+    if CONTACT_QUEUE_URL:
+        aws.client("sqs").get_queue_attributes(
+            QueueUrl=CONTACT_QUEUE_URL,
+            AttributeNames=["ApproximateNumberOfMessages"]
+        )
+
+
+def _timed(name: str, step: Callable[[], None]) -> tuple[str, float, bool]:
+    start = time.perf_counter()
+    try:
+        step()
+        ok = True
+    except Exception as e:
+        logger.error(f"Warm-up step {name} failed: {str(e)}")
+        ok = False
+    return name, (time.perf_counter() - start) * 1000, ok
+
+
+def warm_up(load_caches: Callable[[], None]) -> dict:
+    """
+    Prime this worker before real traffic reaches it: create the AWS clients,
+    resolve credentials, open the S3, SES and SQS connections and load the
+    catalog caches (which opens the DynamoDB ones). The steps run in parallel
+    and a failed step doesn't stop the others.
+
+    Args:
+        load_caches: Loads the catalog and manifest caches (routes.warm_caches)
+
+    Returns:
+        dict: Status, milliseconds per step and the steps that failed
+    """
+    steps = {"s3": _open_s3, "ses": _open_ses, "sqs": _open_sqs, "caches": load_caches}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="warmup") as pool:
+        results = list(pool.map(lambda step: _timed(*step), steps.items()))
+
+    total_ms = (time.perf_counter() - start) * 1000
+    failed = [name for name, _, ok in results if not ok]
+    logger.info(f"Warmed up in {total_ms:.0f} ms" + (f", failed: {', '.join(failed)}" if failed else ""))
+    return {
+        "status": "warm" if not failed else "partial",
+        "duration_ms": round(total_ms, 1),
+        "steps": {name: round(duration, 1) for name, duration, _ in results},
+        "failed": failed
+    }
@@ -0,0 +1,61 @@
+"""
+Variant rendering where multiprocessing can't start, as on Lambda,
+and variant uploads that partly fail.
+
+    python -m pytest tests
+"""
+import io
+import asyncio
+import multiprocessing.synchronize
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from shared import derivatives
+from shared.s3.models import AsyncS3Storage
+
+
+@pytest.fixture
+def no_semlock(monkeypatch):
+    # Lambda has no /dev/shm: creating the process pool's SemLock fails with ENOSYS
+    def unavailable(*args, **kwargs):
+        raise OSError(38, "Function not implemented")
+
+    monkeypatch.setattr(multiprocessing.synchronize.SemLock, "__init__", unavailable)
+    monkeypatch.setattr(derivatives, "_executor", None)
+
+
+def _jpeg(width: int, height: int) -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, "JPEG")
+    buffer.seek(0)
+    return buffer
+
+
+def test_render_falls_back_to_threads_without_semlock(no_semlock):
+    rendered = asyncio.run(derivatives._render(_jpeg(800, 600)))  # pylint: disable=protected-access
+
+    assert isinstance(derivatives._executor, ThreadPoolExecutor)  # pylint: disable=protected-access
+    widths = {meta["width"] for meta, _ in rendered}
+    assert widths == {width for width in derivatives.VARIANT_WIDTHS if width < 800}
+    assert all(data for _, data in rendered)
+
+
+def test_failed_variant_upload_reports_the_stored_ones(no_semlock, monkeypatch):
+    uploaded = []
+
+    async def upload_object(s3_path, content, content_type):
+        if s3_path.endswith("/320w.webp"):
+            raise OSError("connection reset")
+        uploaded.append(s3_path)
+
+    monkeypatch.setattr(AsyncS3Storage, "upload_object", staticmethod(upload_object))
+
+    with pytest.raises(derivatives.VariantUploadError) as error:
+        asyncio.run(derivatives.create_variants(_jpeg(800, 600), "images/abc.jpg"))
+
+    stored = [variant["s3_path"] for variant in error.value.variants]
+    assert sorted(stored) == sorted(uploaded)
+    assert "images/variants/abc/320w.webp" not in stored
+    assert len(stored) == len(derivatives.VARIANT_FORMATS) * 2 - 1
@@ -34,7 +34,7 @@ resource "aws_cloudfront_distribution" "main" {
 
     forwarded_values {
       query_string = true
-      headers      = ["Authorization", "Accept", "Content-Type"]
+      headers      = ["Authorization", "Accept", "Accept-Encoding", "Content-Type", "Idempotency-Key"]
 
       cookies {
         forward = "all"
@@ -46,6 +46,34 @@ resource "aws_cloudfront_distribution" "main" {
     max_ttl     = 0
   }
 
+  # Admin endpoints under /images/ go to the API, not the S3 behavior below
+  # (behaviors match in order, so these must come first)
+  dynamic "ordered_cache_behavior" {
+    for_each = ["/images/batch", "/images/delete"]
+
+    content {
+      path_pattern           = ordered_cache_behavior.value
+      target_origin_id       = "APIGateway"
+      viewer_protocol_policy = "redirect-to-https"
+      allowed_methods        = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+      cached_methods         = ["GET", "HEAD"]
+      compress               = true
+
+      forwarded_values {
+        query_string = true
+        headers      = ["Authorization", "Accept", "Accept-Encoding", "Content-Type", "X-API-KEY"]
+
+        cookies {
+          forward = "none"
+        }
+      }
+
+      min_ttl     = 0
+      default_ttl = 0
+      max_ttl     = 0
+    }
+  }
+
   # Cache behavior for S3 images
   ordered_cache_behavior {
     path_pattern           = "/images/*"
@@ -68,6 +96,36 @@ resource "aws_cloudfront_distribution" "main" {
     max_ttl     = 31536000
   }
 
+  # Catalog API responses carry ETag + Cache-Control, so let CloudFront
+  # cache and revalidate them instead of forwarding every request.
+  # Accept-Encoding is forwarded (and part of the cache key) so the API can
+  # send its pre-compressed brotli/gzip bodies
+  dynamic "ordered_cache_behavior" {
+    for_each = ["/manifest", "/manifest/*", "/images", "/image/*"]
+
+    content {
+      path_pattern           = ordered_cache_behavior.value
+      target_origin_id       = "APIGateway"
+      viewer_protocol_policy = "redirect-to-https"
+      allowed_methods        = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+      cached_methods         = ["GET", "HEAD"]
+      compress               = true
+
+      forwarded_values {
+        query_string = true
+        headers      = ["Authorization", "Accept", "Accept-Encoding", "Content-Type", "X-API-KEY"]
+
+        cookies {
+          forward = "none"
+        }
+      }
+
+      min_ttl     = 0
+      default_ttl = 0
+      max_ttl     = 3600
+    }
+  }
+
   restrictions {
     geo_restriction {
       restriction_type = "none"
@@ -14,3 +14,51 @@ resource "aws_dynamodb_table" "images_content" {
     Project     = "On Point Garage Doors"
   }
 }
+
+# Catalog state derived from the images table (manifest snapshot, version counter,
+# image file reference counts)
+resource "aws_dynamodb_table" "images_catalog" {
+  name         = "opgd-images-catalog"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+  range_key    = "sk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "sk"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "OPGD Images Catalog"
+    Environment = var.environment
+    Project     = "On Point Garage Doors"
+  }
+}
+
+# Contact form de-duplication records, expired by TTL
+resource "aws_dynamodb_table" "contact_submissions" {
+  name         = "opgd-contact-submissions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "submission_key"
+
+  attribute {
+    name = "submission_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "OPGD Contact Submissions"
+    Environment = var.environment
+    Project     = "On Point Garage Doors"
+  }
+}
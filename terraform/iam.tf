@@ -43,9 +43,16 @@ resource "aws_iam_role_policy" "dynamodb_policy" {
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:Query",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem"
+        ]
+        Resource = [
+          aws_dynamodb_table.images_content.arn,
+          aws_dynamodb_table.images_catalog.arn,
+          aws_dynamodb_table.contact_submissions.arn
         ]
-        Resource = aws_dynamodb_table.images_content.arn
       }
     ]
   })
@@ -85,10 +92,37 @@ resource "aws_iam_role_policy" "ses_policy" {
         Effect = "Allow"
         Action = [
           "ses:SendEmail",
-          "ses:SendRawEmail"
+          "ses:SendRawEmail",
+          "ses:GetSendQuota"
         ]
         Resource = "*"
       }
     ]
   })
 }
+
+# SQS Policy (contact outbox)
+resource "aws_iam_role_policy" "sqs_policy" {
+  name = "opgd-lambda-sqs-policy"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:SendMessage",
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:ChangeMessageVisibility",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          aws_sqs_queue.contact_outbox.arn,
+          aws_sqs_queue.contact_outbox_dlq.arn
+        ]
+      }
+    ]
+  })
+}
@@ -6,6 +6,9 @@ resource "aws_lambda_function" "api" {
   timeout       = 30
   memory_size   = 512
 
+  # Versions are published so the live alias (and its provisioned concurrency) can point at one
+  publish = true
+
   # Dummy zip for initial creation - deploy code using deploy.sh script
   filename         = "${path.module}/lambda_placeholder.zip"
   source_code_hash = filebase64sha256("${path.module}/lambda_placeholder.zip")
@@ -13,7 +16,11 @@ resource "aws_lambda_function" "api" {
   environment {
     variables = {
       DYNAMODB_TABLE_NAME = aws_dynamodb_table.images_content.name
+      CATALOG_TABLE_NAME  = aws_dynamodb_table.images_catalog.name
+      CONTACT_TABLE_NAME  = aws_dynamodb_table.contact_submissions.name
       S3_BUCKET_NAME      = aws_s3_bucket.images_content.bucket
+      MAX_UPLOAD_BYTES    = var.max_upload_bytes
+      CONTACT_QUEUE_URL   = aws_sqs_queue.contact_outbox.url
       SES_SENDER_EMAIL    = var.ses_sender_email
       SES_RECIPIENT_EMAIL = var.ses_recipient_email
       ADMIN_PASSWORD      = var.admin_password
@@ -25,6 +32,102 @@ resource "aws_lambda_function" "api" {
   }
 }
 
+# API Gateway and the warm-up schedule invoke this alias; deploy.sh publishes
+# a version and moves it, so terraform only sets the initial version
+resource "aws_lambda_alias" "api_live" {
+  name             = "live"
+  function_name    = aws_lambda_function.api.function_name
+  function_version = aws_lambda_function.api.version
+
+  lifecycle {
+    ignore_changes = [function_version]
+  }
+}
+
+# Instances initialized ahead of traffic, warmed up during init (see entrypoint.py)
+resource "aws_lambda_provisioned_concurrency_config" "api" {
+  count = var.api_provisioned_concurrency > 0 ? 1 : 0
+
+  function_name                     = aws_lambda_function.api.function_name
+  qualifier                         = aws_lambda_alias.api_live.name
+  provisioned_concurrent_executions = var.api_provisioned_concurrency
+}
+
+# Scheduled warm-up ping: keeps an instance alive with its AWS connections
+# open and the catalog caches loaded, without going through FastAPI
+resource "aws_cloudwatch_event_rule" "api_warmup" {
+  count = var.api_warmup_schedule != "" ? 1 : 0
+
+  name                = "opgd-mail-manifest-api-warmup-${var.environment}"
+  description         = "Warm-up ping for the API lambda"
+  schedule_expression = var.api_warmup_schedule
+}
+
+resource "aws_cloudwatch_event_target" "api_warmup" {
+  count = var.api_warmup_schedule != "" ? 1 : 0
+
+  rule = aws_cloudwatch_event_rule.api_warmup[0].name
+  arn  = aws_lambda_alias.api_live.arn
+}
+
+resource "aws_lambda_permission" "api_warmup" {
+  count = var.api_warmup_schedule != "" ? 1 : 0
+
+  statement_id  = "AllowEventBridgeWarmup"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api.function_name
+  qualifier     = aws_lambda_alias.api_live.name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.api_warmup[0].arn
+}
+
+locals {
+  # Outbox worker instances the SQS pollers may run at once (2 is the lowest SQS allows)
+  outbox_max_concurrency = 2
+}
+
+# Contact outbox worker - same package as the API, drains the contact queue
+resource "aws_lambda_function" "outbox_worker" {
+  function_name = "opgd-contact-outbox-${var.environment}"
+  role          = aws_iam_role.lambda_role.arn
+  handler       = "entrypoint.outbox_worker"
+  runtime       = "python3.11"
+  timeout       = 30
+  memory_size   = 256
+
+  # Dummy zip for initial creation - deploy code using deploy.sh script
+  filename         = "${path.module}/lambda_placeholder.zip"
+  source_code_hash = filebase64sha256("${path.module}/lambda_placeholder.zip")
+
+  # Each instance paces its own sends, so they split the account's sending rate
+  environment {
+    variables = {
+      CONTACT_QUEUE_URL   = aws_sqs_queue.contact_outbox.url
+      CONTACT_DLQ_URL     = aws_sqs_queue.contact_outbox_dlq.url
+      SES_SENDER_EMAIL    = var.ses_sender_email
+      SES_RECIPIENT_EMAIL = var.ses_recipient_email
+      SES_MAX_SEND_RATE   = var.ses_max_send_rate / local.outbox_max_concurrency
+    }
+  }
+
+  tags = {
+    env = var.environment
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "contact_outbox" {
+  event_source_arn        = aws_sqs_queue.contact_outbox.arn
+  function_name           = aws_lambda_function.outbox_worker.arn
+  batch_size              = 10
+  function_response_types = ["ReportBatchItemFailures"]
+
+  # Caps the pollers themselves: a reserved concurrency limit would throttle
+  # invocations instead, and every throttled receive counts towards the DLQ
+  scaling_config {
+    maximum_concurrency = local.outbox_max_concurrency
+  }
+}
+
 # CloudWatch Log Group
 resource "aws_cloudwatch_log_group" "lambda_logs" {
   name              = "/aws/lambda/${aws_lambda_function.api.function_name}"
@@ -36,3 +139,14 @@ resource "aws_cloudwatch_log_group" "lambda_logs" {
     Project     = "On Point Garage Doors"
   }
 }
+
+resource "aws_cloudwatch_log_group" "outbox_worker_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.outbox_worker.function_name}"
+  retention_in_days = 7
+
+  tags = {
+    Name        = "OPGD Contact Outbox Logs"
+    Environment = var.environment
+    Project     = "On Point Garage Doors"
+  }
+}
@@ -23,7 +23,22 @@ output "dynamodb_table_name" {
   value       = aws_dynamodb_table.images_content.name
 }
 
+output "catalog_table_name" {
+  description = "DynamoDB catalog table name"
+  value       = aws_dynamodb_table.images_catalog.name
+}
+
 output "lambda_function_name" {
   description = "Lambda function name"
   value       = aws_lambda_function.api.function_name
 }
+
+output "outbox_worker_function_name" {
+  description = "Contact outbox worker Lambda function name"
+  value       = aws_lambda_function.outbox_worker.function_name
+}
+
+output "contact_dlq_url" {
+  description = "Dead-letter queue for undeliverable contact submissions"
+  value       = aws_sqs_queue.contact_outbox_dlq.url
+}
@@ -58,3 +58,15 @@ resource "aws_s3_bucket_policy" "images_content" {
     ]
   })
 }
+
+# CORS for direct-to-S3 admin uploads (presigned POST from /image/upload-url)
+resource "aws_s3_bucket_cors_configuration" "images_content" {
+  bucket = aws_s3_bucket.images_content.id
+
+  cors_rule {
+    allowed_methods = ["POST"]
+    allowed_origins = var.upload_allowed_origins
+    allowed_headers = ["*"]
+    max_age_seconds = 3600
+  }
+}
@@ -0,0 +1,29 @@
+# Contact form submissions waiting to be emailed
+resource "aws_sqs_queue" "contact_outbox" {
+  name                       = "opgd-contact-outbox-${var.environment}"
+  visibility_timeout_seconds = 180 # >= 6x worker timeout, as Lambda recommends for SQS sources
+  message_retention_seconds  = 1209600
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.contact_outbox_dlq.arn
+    maxReceiveCount     = var.contact_max_delivery_attempts
+  })
+
+  tags = {
+    Name        = "OPGD Contact Outbox"
+    Environment = var.environment
+    Project     = "On Point Garage Doors"
+  }
+}
+
+# Submissions that could not be delivered, kept for inspection and redrive
+resource "aws_sqs_queue" "contact_outbox_dlq" {
+  name                      = "opgd-contact-outbox-dlq-${var.environment}"
+  message_retention_seconds = 1209600
+
+  tags = {
+    Name        = "OPGD Contact Outbox DLQ"
+    Environment = var.environment
+    Project     = "On Point Garage Doors"
+  }
+}
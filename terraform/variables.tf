@@ -27,3 +27,43 @@ variable "ses_recipient_email" {
   type        = string
   default     = "info@onpointgaragedoors.com"
 }
+
+variable "upload_allowed_origins" {
+  description = "Origins allowed to upload images straight to S3 with a presigned POST"
+  type        = list(string)
+  default = [
+    "https://onpointgaragedoors.com",
+    "https://www.onpointgaragedoors.com",
+    "http://localhost:5173",
+  ]
+}
+
+variable "max_upload_bytes" {
+  description = "Largest image accepted through a presigned upload, in bytes"
+  type        = number
+  default     = 26214400
+}
+
+variable "ses_max_send_rate" {
+  description = "SES sending quota in emails per second (1 in the SES sandbox)"
+  type        = number
+  default     = 1
+}
+
+variable "contact_max_delivery_attempts" {
+  description = "Delivery attempts for a contact submission before it moves to the dead-letter queue"
+  type        = number
+  default     = 5
+}
+
+variable "api_warmup_schedule" {
+  description = "EventBridge schedule of the API warm-up ping (empty to disable)"
+  type        = string
+  default     = "rate(5 minutes)"
+}
+
+variable "api_provisioned_concurrency" {
+  description = "Provisioned concurrent executions of the API lambda (0 to disable)"
+  type        = number
+  default     = 0
+}